@@ -225,16 +225,10 @@ async def find_job_matches(
             )
         
         # Create criteria from user settings
-        criteria = AutoApplicationCriteria(
+        criteria = AutoApplicationCriteria.from_profile(
+            profile,
             min_match_score=request.min_match_score,
-            max_daily_applications=request.limit,
-            preferred_locations=profile.preferred_locations or [],
-            required_skills=profile.required_skills or [],
-            excluded_companies=profile.excluded_companies or [],
-            salary_min=profile.salary_expectations_min,
-            salary_max=profile.salary_expectations_max,
-            remote_only=profile.auto_apply_only_remote,
-            experience_level_match=True
+            max_daily_applications=request.limit
         )
         
         # Find matches
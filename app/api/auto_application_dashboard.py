@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, desc, func, text
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.database import get_readonly_db
 from app.core.dependencies import get_current_user
 from app.database.user_models import User, Profile
 from app.database.auto_application_models import (
@@ -27,7 +27,7 @@ router = APIRouter(prefix="/api/v1/dashboard/auto-apply", tags=["Auto Applicatio
 @router.get("/overview")
 async def get_dashboard_overview(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get comprehensive dashboard overview for auto-applications."""
     try:
@@ -187,7 +187,7 @@ async def get_dashboard_overview(
 async def get_auto_application_analytics(
     period_days: int = Query(30, ge=7, le=365),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get detailed analytics for auto-applications."""
     try:
@@ -351,7 +351,7 @@ async def get_activity_feed(
     limit: int = Query(20, ge=1, le=100),
     activity_type: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get user's auto-application activity feed."""
     try:
@@ -432,7 +432,7 @@ async def get_activity_feed(
 @router.get("/performance-metrics")
 async def get_performance_metrics(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get detailed performance metrics for auto-applications."""
     try:
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, desc, func
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.core.database import get_readonly_db
 from app.core.dependencies import get_current_user
 from app.database.user_models import User
 from app.database.project_models import ProjectSimulation
@@ -28,7 +28,7 @@ router = APIRouter(prefix="/api/v1/dashboard", tags=["Dashboard"])
 @router.get("/overview", response_model=DashboardStatsResponse)
 async def get_dashboard_overview(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get comprehensive dashboard overview for the user."""
     
@@ -175,7 +175,7 @@ async def get_dashboard_overview(
 async def get_user_activity(
     limit: int = 20,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get user's recent activity feed."""
     
@@ -267,7 +267,7 @@ async def get_user_activity(
 @router.get("/quick-stats", response_model=dict)
 async def get_quick_stats(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get quick stats for dashboard cards."""
     
@@ -328,7 +328,7 @@ async def get_quick_stats(
 @router.get("/goals", response_model=dict)
 async def get_user_goals(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get user's learning and career goals."""
     
@@ -396,7 +396,7 @@ async def get_user_goals(
 @router.get("/metrics", response_model=dict)
 async def get_performance_metrics(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_readonly_db)
 ):
     """Get detailed performance metrics and analytics."""
     
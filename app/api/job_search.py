@@ -16,6 +16,7 @@ from app.schemas.job_schemas import (
     JobApplicationResponse
 )
 from app.services.job_search_service import job_search_service
+from app.services.job_feed_service import job_feed_service
 from app.core.rate_limiter import limiter, user_limiter, RateLimitTiers
 
 
@@ -34,11 +35,8 @@ async def get_external_job_listings(
 ):
     """Get real job listings from external job boards."""
     try:
-        # Fetch real job data from multiple sources
-        raw_jobs = await job_search_service.fetch_all_pm_jobs()
-        
-        # Normalize the data
-        normalized_jobs = job_search_service.normalize_job_data(raw_jobs)
+        # Normalized job data from multiple sources
+        normalized_jobs = await job_search_service.fetch_normalized_pm_jobs()
         
         # Apply filters
         filtered_jobs = []
@@ -134,6 +132,7 @@ async def get_job_sources():
         "total_sources": 6,
         "free_sources": 3,
         "premium_sources": 3,
+        "feed_status": job_feed_service.snapshot_info(),
         "last_updated": datetime.utcnow().isoformat()
     }
 
@@ -143,8 +142,7 @@ async def get_trending_jobs():
     """Get trending job market data and insights."""
     try:
         # Fetch recent job data
-        raw_jobs = await job_search_service.fetch_all_pm_jobs()
-        normalized_jobs = job_search_service.normalize_job_data(raw_jobs)
+        normalized_jobs = await job_search_service.fetch_normalized_pm_jobs()
         
         # Analyze trends
         companies = {}
@@ -222,8 +220,7 @@ async def get_job_recommendations(
         # In production, this would analyze user's skills, experience, etc.
         
         # Fetch all available jobs
-        raw_jobs = await job_search_service.fetch_all_pm_jobs()
-        normalized_jobs = job_search_service.normalize_job_data(raw_jobs)
+        normalized_jobs = await job_search_service.fetch_normalized_pm_jobs()
         
         # Simple scoring algorithm (in production, this would be more sophisticated)
         scored_jobs = []
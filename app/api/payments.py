@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.database import AsyncSessionLocal
+from app.core.database import get_db
 from app.core.config import settings
 from app.services.paystack_service import PaystackService
 from app.database.payments_models import Transaction
@@ -14,12 +14,6 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 paystack = PaystackService()
 
 
-# Dependency to get db session
-async def get_db():
-    async with AsyncSessionLocal() as db:
-        yield db
-
-
 @router.post("/paystack/initialize")
 async def paystack_init(email: str, amount: float, plan_id: str | None = None, db: AsyncSession = Depends(get_db)):
     """
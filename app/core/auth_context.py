@@ -0,0 +1,112 @@
+"""
+Authentication context middleware.
+
+Decodes the bearer token once per request (no database access) and stores
+the claims on ``request.state`` so the rate limiter key function and the
+auth dependencies can reuse them instead of decoding the token again.
+"""
+import logging
+from typing import Optional, Dict, Any
+
+from jose import JWTError, jwt
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Token types accepted as request identity (legacy tokens carry no type)
+ACCESS_TOKEN_TYPES = (None, "access")
+
+
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode and validate a JWT access token without touching the database.
+
+    Args:
+        token: Raw JWT string
+
+    Returns:
+        Token claims if the token is a valid access token, None otherwise
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.secret_key,
+            algorithms=[settings.algorithm]
+        )
+    except JWTError:
+        return None
+
+    if payload.get("type") not in ACCESS_TOKEN_TYPES or not payload.get("sub"):
+        return None
+    return payload
+
+
+def _extract_bearer_token(scope: Scope) -> Optional[str]:
+    """Return the bearer token from the Authorization header, if any."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, credentials = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and credentials:
+                return credentials.strip()
+            return None
+    return None
+
+
+def get_auth_claims(request: Request) -> Optional[Dict[str, Any]]:
+    """
+    Get the token claims resolved by AuthContextMiddleware.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Decoded claims, or None for anonymous requests
+    """
+    return getattr(request.state, "auth_claims", None)
+
+
+def get_auth_token(request: Request) -> Optional[str]:
+    """Get the raw bearer token the claims were decoded from."""
+    return getattr(request.state, "auth_token", None)
+
+
+class AuthContextMiddleware:
+    """
+    Pure ASGI middleware that resolves the authenticated identity once.
+
+    Sets on ``request.state``:
+        auth_token: Raw bearer token (or None)
+        auth_claims: Decoded claims (or None if missing/invalid)
+        user_id: Integer user ID from the ``sub`` claim (or None)
+
+    Invalid tokens are not rejected here; the auth dependencies remain
+    responsible for returning 401 responses.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        token = _extract_bearer_token(scope)
+        claims = decode_access_token(token) if token else None
+
+        user_id = None
+        if claims:
+            try:
+                user_id = int(claims["sub"])
+            except (TypeError, ValueError):
+                claims = None
+
+        state["auth_token"] = token
+        state["auth_claims"] = claims
+        state["user_id"] = user_id
+
+        await self.app(scope, receive, send)
@@ -29,6 +29,8 @@ class Settings(BaseSettings):
     # ======================================================
     database_url: str = Field(alias="DATABASE_URL")
     database_url_sync: str = Field(alias="DATABASE_URL_SYNC")
+    database_replica_url: Optional[str] = Field(default=None, alias="DATABASE_REPLICA_URL")
+    db_transaction_per_request: bool = Field(default=True, alias="DB_TRANSACTION_PER_REQUEST")
 
     # ======================================================
     # SECURITY
@@ -43,6 +45,9 @@ class Settings(BaseSettings):
     gemini_api_key: Optional[str] = Field(default=None, alias="GEMINI_API_KEY")
     groq_api_key: Optional[str] = Field(default=None, alias="GROQ_API_KEY")
     openai_api_key: Optional[str] = Field(default=None, alias="OPENAI_API_KEY")
+    job_embedding_cache_dir: Optional[str] = Field(default=None, alias="JOB_EMBEDDING_CACHE_DIR")
+    embedding_worker_url: Optional[str] = Field(default=None, alias="EMBEDDING_WORKER_URL")
+    company_scan_cache_dir: Optional[str] = Field(default=None, alias="COMPANY_SCAN_CACHE_DIR")
 
     # ======================================================
     # EMAIL — MAILERSEND ONLY
@@ -143,6 +148,16 @@ class Settings(BaseSettings):
     social_facebook: str = Field(alias="SOCIAL_FACEBOOK")
     social_instagram: str = Field(alias="SOCIAL_INSTAGRAM")
 
+    # ======================================================
+    # OBSERVABILITY
+    # ======================================================
+    request_log_sample_rate: float = Field(default=0.05, alias="REQUEST_LOG_SAMPLE_RATE")
+    slow_request_threshold_ms: float = Field(default=1000.0, alias="SLOW_REQUEST_THRESHOLD_MS")
+    request_metrics_enabled: bool = Field(default=True, alias="REQUEST_METRICS_ENABLED")
+    metrics_token: Optional[str] = Field(default=None, alias="METRICS_TOKEN")  # /metrics is off unless set
+    query_profiler_enabled: bool = Field(default=False, alias="QUERY_PROFILER_ENABLED")
+    query_profiler_n_plus_one_threshold: int = Field(default=5, alias="QUERY_PROFILER_N_PLUS_ONE_THRESHOLD")
+
     # ======================================================
     # ENV HELPERS
     # ======================================================
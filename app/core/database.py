@@ -2,12 +2,18 @@
 Database configuration and session management using SQLAlchemy 2.0+.
 """
 import logging
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional, Dict, Any
 from sqlalchemy import create_engine, MetaData, event
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from sqlalchemy.engine import Engine
-from time import time
+from sqlalchemy.pool import QueuePool
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from time import time, monotonic
 
 from app.core.config import settings
 
@@ -32,6 +38,31 @@ class Base(DeclarativeBase):
     )
 
 
+def _async_engine_options(url: str, application_name: str) -> Dict[str, Any]:
+    """
+    Engine options for an async database URL.
+    
+    Pool sizing and asyncpg connect args only apply to Postgres; SQLite URLs
+    (e.g. ``sqlite+aiosqlite:///primary.db``) get SQLAlchemy's defaults so a
+    primary/replica setup can be exercised locally with two files.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_recycle": 300,  # Recycle connections after 5 minutes
+        "pool_size": 10,      # Number of connections to maintain
+        "max_overflow": 20,   # Additional connections allowed
+        "pool_timeout": 30,   # Timeout for getting connection from pool
+        "connect_args": {
+            "timeout": 10,  # asyncpg uses 'timeout' not 'connect_timeout'
+            "command_timeout": 30,
+            "server_settings": {
+                "application_name": application_name
+            }
+        },
+    }
+
+
 # Async engine for main application with enhanced connection pooling
 async_engine = create_async_engine(
     settings.database_url,
@@ -39,19 +70,44 @@ async_engine = create_async_engine(
     echo_pool=settings.debug,  # Show connection pool operations
     future=True,
     pool_pre_ping=True,
-    pool_recycle=300,  # Recycle connections after 5 minutes
-    pool_size=10,      # Number of connections to maintain
-    max_overflow=20,   # Additional connections allowed
-    pool_timeout=30,   # Timeout for getting connection from pool
-    connect_args={
-        "timeout": 10,  # asyncpg uses 'timeout' not 'connect_timeout'
-        "command_timeout": 30,
-        "server_settings": {
-            "application_name": "turn_backend"
-        }
-    }
+    **_async_engine_options(settings.database_url, "turn_backend"),
 )
 
+# Optional read replica engine (read-only sessions route here)
+replica_engine = create_async_engine(
+    settings.database_replica_url,
+    echo=settings.debug,
+    future=True,
+    pool_pre_ping=True,
+    **_async_engine_options(settings.database_replica_url, "turn_backend_replica"),
+) if settings.database_replica_url else None
+
+# Seconds to keep routing reads to the primary after a replica failure
+REPLICA_RETRY_AFTER_SECONDS = 30
+_replica_down_until = 0.0
+
+
+def replica_available() -> bool:
+    """Whether a replica is configured and not in its failure cool-down."""
+    return replica_engine is not None and monotonic() >= _replica_down_until
+
+
+def mark_replica_unavailable() -> None:
+    """Route reads to the primary for ``REPLICA_RETRY_AFTER_SECONDS``."""
+    global _replica_down_until
+    _replica_down_until = monotonic() + REPLICA_RETRY_AFTER_SECONDS
+    db_logger.warning(
+        f"Read replica unavailable; routing reads to primary for {REPLICA_RETRY_AFTER_SECONDS}s"
+    )
+
+
+def pool_capacity(engine: AsyncEngine = async_engine) -> Optional[int]:
+    """Maximum connections the engine's pool hands out (None when unbounded)."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return pool.size() + max(pool._max_overflow, 0)
+
 # Sync engine for Alembic migrations with connection pooling
 sync_engine = create_engine(
     settings.database_url_sync,
@@ -59,10 +115,12 @@ sync_engine = create_engine(
     echo_pool=settings.debug,  # Show connection pool operations
     future=True,
     pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=5,       # Smaller pool for sync operations
-    max_overflow=10,
-    pool_timeout=30,
+    **({} if settings.database_url_sync.startswith("sqlite") else {
+        "pool_recycle": 300,
+        "pool_size": 5,       # Smaller pool for sync operations
+        "max_overflow": 10,
+        "pool_timeout": 30,
+    }),
 )
 
 
@@ -88,10 +146,63 @@ def after_cursor_execute(conn, cursor, statement, parameters, context, executema
         db_logger.info(f"Rows affected/returned: {cursor.rowcount}")
         db_logger.info("=" * 80)
 
+class RoutingSession(Session):
+    """
+    Sync session that picks the engine per operation.
+    
+    Sessions flagged with ``info["readonly"]`` read from the replica while it
+    is available; writes (flushes) and everything else use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("readonly") and not self._flushing and replica_available():
+            return replica_engine.sync_engine
+        return async_engine.sync_engine
+
+
+class UnitOfWorkSession(AsyncSession):
+    """
+    AsyncSession that supports transaction-per-request mode.
+
+    While ``info["unit_of_work"]`` is set (see ``unit_of_work``), ``commit()``
+    only flushes and starts a SAVEPOINT, and ``rollback()`` returns to the
+    last such savepoint. Services can keep their ``commit()`` / ``rollback()``
+    calls with the same effect on their own writes, while the enclosing unit
+    of work issues a single real COMMIT at the end.
+    """
+
+    async def commit(self) -> None:
+        if self.info.get("unit_of_work"):
+            await self.flush()
+            checkpoint = self.info.get("checkpoint")
+            if checkpoint is not None and checkpoint.is_active:
+                await checkpoint.commit()
+            self.info["checkpoint"] = await self.begin_nested()
+            return
+        self.info.pop("checkpoint", None)
+        await super().commit()
+
+    async def rollback(self) -> None:
+        checkpoint = self.info.get("checkpoint")
+        if (
+            self.info.get("unit_of_work")
+            and checkpoint is not None
+            and self.sync_session.get_nested_transaction() is checkpoint.sync_transaction
+        ):
+            # Only discard writes made since the last service-level commit,
+            # including when a failed flush has already deactivated the savepoint
+            await checkpoint.rollback()
+            self.info["checkpoint"] = await self.begin_nested()
+            return
+        self.info.pop("checkpoint", None)
+        await super().rollback()
+
+
 # Async session factory
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
-    class_=AsyncSession,
+    class_=UnitOfWorkSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
@@ -105,13 +216,84 @@ SessionLocal = sessionmaker(
 )
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[AsyncSession]:
+    """
+    Open a session that commits exactly once, when the block exits cleanly.
+    
+    Intermediate ``commit()`` calls made by services only flush; any
+    exception rolls back the whole unit.
+    
+    Yields:
+        AsyncSession: Database session bound to the primary
+    """
+    async with AsyncSessionLocal() as session:
+        session.info["unit_of_work"] = True
+        try:
+            yield session
+        except Exception:
+            session.info["unit_of_work"] = False
+            await session.rollback()
+            raise
+        await complete_unit_of_work(session)
+
+
+async def complete_unit_of_work(session: AsyncSession) -> None:
+    """
+    Issue a unit of work's real COMMIT now.
+    
+    Does nothing if the unit already finished, so it is safe to call both
+    before the response is sent and again when the dependency is torn down.
+    On failure the unit is rolled back and the error re-raised.
+    """
+    if not session.info.get("unit_of_work"):
+        return
+    session.info["unit_of_work"] = False
+    try:
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+
+@asynccontextmanager
+async def savepoint(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Run a sub-operation inside a SAVEPOINT.
+    
+    On error only the sub-operation's writes are rolled back and the
+    exception is re-raised; the outer transaction stays usable.
+    
+    Args:
+        session: Session with (or about to begin) an outer transaction
+    """
+    async with session.begin_nested():
+        yield session
+
+
+# Request state key for the request's unit of work (see UnitOfWorkMiddleware)
+UNIT_OF_WORK_STATE_KEY = "db_unit_of_work"
+
+
+async def get_async_session(connection: HTTPConnection) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency that provides async database sessions.
     
+    In transaction-per-request mode (``DB_TRANSACTION_PER_REQUEST``, default)
+    the whole request is one unit of work with a single commit on success.
+    The commit is issued by ``UnitOfWorkMiddleware`` before the response
+    starts; FastAPI < 0.106 only tears this dependency down after the
+    response has been sent.
+    
     Yields:
         AsyncSession: Database session for async operations
     """
+    if settings.db_transaction_per_request:
+        async with unit_of_work() as session:
+            connection.scope.setdefault("state", {})[UNIT_OF_WORK_STATE_KEY] = session
+            yield session
+        return
+    
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -123,8 +305,96 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """
+    Open a read-only session routed to the replica when one is available.
+    
+    The replica connection is checked up front; if it fails the replica is
+    put in cool-down and the session falls back to the primary. The
+    session never commits.
+    
+    Yields:
+        AsyncSession: Database session for read-only queries
+    """
+    async with AsyncSessionLocal() as session:
+        if replica_available():
+            session.info["readonly"] = True
+            try:
+                await session.connection()
+            except (OperationalError, DBAPIError, OSError) as e:
+                db_logger.warning(f"Read replica connection failed: {e}")
+                mark_replica_unavailable()
+                await session.rollback()
+                session.info["readonly"] = False
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+async def get_readonly_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency that provides a read-only session.
+    
+    Routed to the replica when ``DATABASE_REPLICA_URL`` is set, with
+    fallback to the primary on connection failure.
+    
+    Yields:
+        AsyncSession: Database session for read-only queries
+    """
+    async with read_session() as session:
+        yield session
+
+
+class UnitOfWorkMiddleware:
+    """
+    Pure ASGI middleware that commits the request's unit of work before the
+    response starts.
+    
+    Clients therefore only see a success status once the data is saved, and
+    a failing COMMIT turns into a 500 response. Requests whose unit of work
+    was already rolled back (an exception reached the dependency) are left
+    alone.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        commit_failed = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal commit_failed
+            if commit_failed:
+                return
+            if message["type"] == "http.response.start":
+                session = state.get(UNIT_OF_WORK_STATE_KEY)
+                if session is not None:
+                    try:
+                        await complete_unit_of_work(session)
+                    except Exception as e:
+                        commit_failed = True
+                        db_logger.error(f"Commit failed for {scope.get('path')}: {e}")
+                        response = JSONResponse(
+                            status_code=500,
+                            content={"detail": "Internal server error"}
+                        )
+                        await response(scope, receive, send)
+                        return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
 # Alias for backwards compatibility
 get_db = get_async_session
+get_readonly_db = get_readonly_session
 
 
 def get_sync_session():
@@ -1,12 +1,13 @@
 """
 FastAPI dependencies for authentication, database access, and common utilities.
 """
-from typing import Optional, List, AsyncGenerator, Annotated
-from fastapi import Depends, HTTPException, status, Header
+from typing import Optional, List, Annotated, Dict, Any
+from fastapi import Depends, HTTPException, status, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import AsyncSessionLocal
+from app.core.database import get_async_session, get_readonly_session
+from app.core.auth_context import get_auth_claims, get_auth_token
 from app.services.auth_service import auth_service
 from app.database.user_models import User, UserRole
 
@@ -14,21 +15,52 @@ from app.database.user_models import User, UserRole
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+# Single database dependency shared with app.core.database, so routers importing
+# either module get the same unit-of-work session (and the same override key).
+get_db = get_async_session
+get_readonly_db = get_readonly_session
+
+
+async def _load_user(request: Request, db: AsyncSession, token: str) -> Optional[User]:
     """
-    Database dependency that provides async session.
+    Load the user for a token, reusing claims decoded by AuthContextMiddleware.
     
-    Yields:
-        AsyncSession: Database session
+    Falls back to decoding the token when the middleware is not installed
+    (e.g. in tests mounting routers directly).
+    """
+    claims = get_auth_claims(request)
+    if claims is not None and get_auth_token(request) == token:
+        return await auth_service.get_user_from_claims(db, claims)
+    return await auth_service.get_current_user(db, token)
+
+
+async def get_token_claims(request: Request) -> Dict[str, Any]:
+    """
+    Get decoded JWT claims for the current request without a database hit.
+    
+    Useful for endpoints that only need the user ID or role.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Dict: Token claims (``sub``, ``email``, ``role``, ...)
+        
+    Raises:
+        HTTPException: If the request carries no valid access token
     """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+    claims = get_auth_claims(request)
+    if not claims:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return claims
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> User:
@@ -36,6 +68,7 @@ async def get_current_user(
     Get current authenticated user from JWT token.
     
     Args:
+        request: Incoming request (carries pre-decoded token claims)
         token: JWT token from OAuth2 password bearer
         db: Database session
         
@@ -53,7 +86,7 @@ async def get_current_user(
         )
     
     try:
-        user = await auth_service.get_current_user(db, token)
+        user = await _load_user(request, db, token)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -96,6 +129,7 @@ async def get_current_active_user(
 
 
 async def get_optional_user(
+    request: Request,
     token: Optional[str] = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
@@ -104,6 +138,7 @@ async def get_optional_user(
     Useful for endpoints that work with or without authentication.
     
     Args:
+        request: Incoming request (carries pre-decoded token claims)
         token: Optional JWT token from OAuth2 password bearer
         db: Database session
         
@@ -114,7 +149,7 @@ async def get_optional_user(
         return None
     
     try:
-        user = await auth_service.get_current_user(db, token)
+        user = await _load_user(request, db, token)
         return user if user and user.is_active else None
     except:
         return None
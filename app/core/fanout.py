@@ -0,0 +1,182 @@
+"""
+Concurrent fan-out to external sources with deadlines and circuit breakers.
+
+``fan_out`` starts every source call at once and waits until all have
+finished or the deadline passes, whichever comes first. Calls still running
+at the deadline are cancelled and reported as timed out, so aggregators get
+partial results bounded by the slowest healthy source. A per-source circuit
+breaker skips sources that keep failing or timing out until a cool-down has
+passed.
+"""
+import asyncio
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Default overall deadline for one fan-out, in seconds
+DEFAULT_FANOUT_DEADLINE = 10.0
+
+# Result statuses
+SOURCE_OK = "ok"
+SOURCE_ERROR = "error"
+SOURCE_TIMEOUT = "timeout"
+SOURCE_SKIPPED = "circuit_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` consecutive failures. After
+    ``reset_timeout`` seconds a single trial call is let through (half-open);
+    its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"Circuit opened for {self.name} after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """Process-wide circuit breakers keyed by source name."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name)
+        return breaker
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"state": breaker.state, "failures": breaker.failures}
+            for name, breaker in self._breakers.items()
+        }
+
+
+# Global registry instance
+circuit_breakers = CircuitBreakerRegistry()
+
+
+@dataclass
+class SourceResult(Generic[T]):
+    """Outcome of one source call within a fan-out."""
+    source: str
+    status: str
+    value: Optional[T] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == SOURCE_OK
+
+
+async def fan_out(
+    calls: Dict[str, Callable[[], Awaitable[T]]],
+    deadline: float = DEFAULT_FANOUT_DEADLINE,
+    breaker_prefix: Optional[str] = None,
+    registry: CircuitBreakerRegistry = circuit_breakers,
+) -> Dict[str, SourceResult[T]]:
+    """
+    Call every source concurrently and collect whatever finishes in time.
+
+    Args:
+        calls: Source name -> zero-argument coroutine function
+        deadline: Seconds to wait for the slowest source
+        breaker_prefix: Namespace for circuit breakers (e.g. ``"jobs"``);
+            breakers are not used when omitted
+        registry: Circuit breaker registry
+
+    Returns:
+        Dict mapping every source name to its SourceResult, in call order
+    """
+    results: Dict[str, SourceResult[T]] = {}
+    tasks: Dict[asyncio.Task, str] = {}
+    breakers: Dict[str, CircuitBreaker] = {}
+    finished_at: Dict[asyncio.Task, float] = {}
+    start = time.perf_counter()
+
+    for source, call in calls.items():
+        if breaker_prefix is not None:
+            breaker = registry.get(f"{breaker_prefix}:{source}")
+            if not breaker.allow():
+                results[source] = SourceResult(source, SOURCE_SKIPPED, error="circuit open")
+                continue
+            breakers[source] = breaker
+        task = asyncio.ensure_future(call())
+        task.add_done_callback(lambda t: finished_at.setdefault(t, time.perf_counter()))
+        tasks[task] = source
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        deadline_at = time.perf_counter()
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task, source in tasks.items():
+            breaker = breakers.get(source)
+            elapsed_ms = ((deadline_at if task in pending else finished_at[task]) - start) * 1000
+            if task in pending:
+                results[source] = SourceResult(
+                    source, SOURCE_TIMEOUT, error=f"deadline {deadline}s exceeded", elapsed_ms=elapsed_ms
+                )
+                logger.warning(f"Source {source} exceeded the {deadline}s fan-out deadline")
+            elif task.exception() is not None:
+                results[source] = SourceResult(source, SOURCE_ERROR, error=str(task.exception()), elapsed_ms=elapsed_ms)
+                logger.error(f"Source {source} failed: {task.exception()}")
+            else:
+                results[source] = SourceResult(source, SOURCE_OK, value=task.result(), elapsed_ms=elapsed_ms)
+
+            if breaker is not None:
+                if results[source].ok:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+
+    return {source: results[source] for source in calls}
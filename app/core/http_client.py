@@ -0,0 +1,156 @@
+"""
+Pooled HTTP clients for external providers (job boards, course catalogs).
+
+One ``aiohttp.ClientSession`` per named client is created lazily and reused
+for the life of the process, so provider fetches hit warm keep-alive
+connections and a cached DNS entry instead of doing a fresh DNS lookup and
+TLS handshake every time. Requests retry transient failures with jittered
+exponential backoff.
+"""
+import asyncio
+import random
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying (rate limited / transient upstream errors)
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """Connection and retry policy for a named client."""
+    limit: int = 100               # Total connections across all hosts
+    limit_per_host: int = 10       # Connections per upstream host
+    keepalive_timeout: float = 30  # Seconds an idle connection is kept
+    dns_cache_ttl: int = 300       # Seconds DNS results are cached
+    total_timeout: float = 20
+    connect_timeout: float = 5
+    retries: int = 2
+    backoff_base: float = 0.5      # Seconds; doubled per attempt, with full jitter
+    backoff_max: float = 8
+
+
+CLIENT_CONFIGS: Dict[str, ClientConfig] = {
+    "default": ClientConfig(),
+    "jobs": ClientConfig(limit_per_host=8),
+    "education": ClientConfig(limit_per_host=6),
+    "embeddings": ClientConfig(limit_per_host=16, total_timeout=30, retries=1),
+    # Company website scans: modest global cap, a few connections per site
+    "scanner": ClientConfig(limit=32, limit_per_host=4, total_timeout=15, retries=1),
+}
+
+
+def backoff_delay(attempt: int, config: ClientConfig) -> float:
+    """Full-jitter exponential backoff for the given (0-based) attempt."""
+    return random.uniform(0, min(config.backoff_max, config.backoff_base * (2 ** attempt)))
+
+
+class _RetryingRequest:
+    """Async context manager that performs a request with retries."""
+
+    def __init__(self, client: "PooledClient", method: str, url: str, kwargs: dict):
+        self._client = client
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+        self._response: Optional[aiohttp.ClientResponse] = None
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        config = self._client.config
+        for attempt in range(config.retries + 1):
+            last_attempt = attempt == config.retries
+            try:
+                response = await self._client.session.request(self._method, self._url, **self._kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                logger.debug(f"Retrying {self._method} {self._url} after {type(e).__name__}")
+            else:
+                if response.status not in RETRY_STATUSES or last_attempt:
+                    self._response = response
+                    return response
+                response.release()
+                logger.debug(f"Retrying {self._method} {self._url} after HTTP {response.status}")
+            await asyncio.sleep(backoff_delay(attempt, config))
+        raise RuntimeError("unreachable")
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._response is not None:
+            self._response.release()
+
+
+class PooledClient:
+    """
+    Thin wrapper over a shared ``ClientSession`` adding retries.
+
+    Mirrors the ``session.get/post/request`` call style, so provider code can
+    keep using ``async with session.get(...) as response``.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, config: ClientConfig):
+        self.session = session
+        self.config = config
+
+    def request(self, method: str, url: str, **kwargs) -> _RetryingRequest:
+        return _RetryingRequest(self, method, url, kwargs)
+
+    def get(self, url: str, **kwargs) -> _RetryingRequest:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _RetryingRequest:
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> _RetryingRequest:
+        return self.request("HEAD", url, **kwargs)
+
+
+class HTTPClientRegistry:
+    """Process-wide registry of pooled clients, closed at app shutdown."""
+
+    def __init__(self, configs: Optional[Dict[str, ClientConfig]] = None):
+        self._configs = configs or CLIENT_CONFIGS
+        self._clients: Dict[str, PooledClient] = {}
+
+    def get(self, name: str = "default") -> PooledClient:
+        """Get (creating on first use) the pooled client called ``name``."""
+        client = self._clients.get(name)
+        if client is None or client.session.closed:
+            config = self._configs.get(name, self._configs["default"])
+            connector = aiohttp.TCPConnector(
+                limit=config.limit,
+                limit_per_host=config.limit_per_host,
+                keepalive_timeout=config.keepalive_timeout,
+                ttl_dns_cache=config.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            timeout = aiohttp.ClientTimeout(total=config.total_timeout, connect=config.connect_timeout)
+            client = PooledClient(aiohttp.ClientSession(connector=connector, timeout=timeout), config)
+            self._clients[name] = client
+        return client
+
+    @asynccontextmanager
+    async def session(self, name: str = "default") -> AsyncIterator[PooledClient]:
+        """
+        Borrow a pooled client in ``async with`` form.
+
+        Unlike ``async with aiohttp.ClientSession()``, leaving the block does
+        not close the session; it stays warm for the next caller.
+        """
+        yield self.get(name)
+
+    async def close_all(self) -> None:
+        """Close every session (app lifespan shutdown)."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            if not client.session.closed:
+                await client.session.close()
+
+
+# Global registry instance
+http_clients = HTTPClientRegistry()
@@ -1,132 +1,246 @@
 """
 Logging middleware for request/response and database query tracking.
+
+Both middlewares are pure ASGI (no BaseHTTPMiddleware), so they add no extra
+task or body-stream wrapping per request and pass streaming responses through
+untouched.
 """
+import bisect
+import random
 import time
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
+from app.core.logger import get_logger, log_api_response
 
 logger = logging.getLogger(__name__)
 
+# Paths excluded from logging and metrics to reduce noise
+EXCLUDED_PATHS = frozenset(["/health", "/docs", "/redoc", "/openapi.json", "/metrics"])
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def resolve_route_template(scope: Scope) -> str:
     """
-    Middleware to log all HTTP requests and responses with timing.
+    Resolve the route template (e.g. ``/api/v1/jobs/{job_id}``) for a request.
+
+    Uses the matched route when the router exposes it, otherwise rebuilds the
+    template from the path parameters so metrics don't explode in cardinality.
+
+    Args:
+        scope: ASGI scope after routing
+
+    Returns:
+        str: Route template, or ``<unmatched>`` when no route matched
     """
-    
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.logger = logging.getLogger("request_logger")
-        self.logger.setLevel(logging.INFO if settings.debug else logging.WARNING)
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+
+    if "endpoint" not in scope:
+        return UNMATCHED_ROUTE
+
+    path = scope.get("path", "")
+    for name, value in (scope.get("path_params") or {}).items():
+        path = path.replace(str(value), "{" + name + "}", 1)
+    return path
+
+
+class RouteLatencyHistogram:
+    """
+    In-process latency histogram per (method, route template).
+
+    Cumulative bucket counts follow the Prometheus histogram layout so the
+    snapshot can be scraped directly by dashboards.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        # key -> [bucket counts..., +Inf count], total sum, total count
+        self._counts: Dict[Tuple[str, str], List[int]] = {}
+        self._sums: Dict[Tuple[str, str], float] = {}
+
+    def observe(self, method: str, route: str, duration_ms: float) -> None:
+        """Record one request duration."""
+        key = (method, route)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, duration_ms)] += 1
+        self._sums[key] += duration_ms
+
+    def reset(self) -> None:
+        """Drop all recorded observations."""
+        self._counts.clear()
+        self._sums.clear()
+
+    def snapshot(self) -> List[Dict]:
         """
-        Process request and log details.
+        Get a JSON-serialisable view of all histograms.
+
+        Returns:
+            List of dicts with method, route, count, sum_ms, avg_ms and
+            cumulative bucket counts keyed by upper bound.
         """
-        # Skip health check and docs endpoints to reduce noise
-        if request.url.path in ["/health", "/docs", "/redoc", "/openapi.json"]:
-            return await call_next(request)
-        
-        # Start timing
-        start_time = time.time()
-        
-        # Log request
-        if settings.debug:
-            self.logger.info("=" * 100)
-            self.logger.info(f" INCOMING REQUEST")
-            self.logger.info(f"   Method: {request.method}")
-            self.logger.info(f"   Path: {request.url.path}")
-            self.logger.info(f"   Query Params: {dict(request.query_params)}")
-            self.logger.info(f"   Client: {request.client.host if request.client else 'Unknown'}")
-            
-            # Log headers (exclude sensitive ones)
-            safe_headers = {
-                k: v for k, v in request.headers.items() 
-                if k.lower() not in ['authorization', 'cookie', 'x-api-key']
-            }
-            if safe_headers:
-                self.logger.info(f"   Headers: {safe_headers}")
-        
-        # Process request
+        result = []
+        for (method, route), counts in sorted(self._counts.items()):
+            total = sum(counts)
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets, counts):
+                running += count
+                cumulative[str(bound)] = running
+            cumulative["+Inf"] = total
+            result.append({
+                "method": method,
+                "route": route,
+                "count": total,
+                "sum_ms": round(self._sums[(method, route)], 3),
+                "avg_ms": round(self._sums[(method, route)] / total, 3) if total else 0.0,
+                "buckets": cumulative,
+            })
+        return result
+
+    def render_prometheus(self, metric: str = "http_request_duration_ms") -> str:
+        """Render histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {metric} HTTP request latency in milliseconds by route.",
+            f"# TYPE {metric} histogram",
+        ]
+        for entry in self.snapshot():
+            labels = f'method="{entry["method"]}",route="{entry["route"]}"'
+            for bound, count in entry["buckets"].items():
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {entry['sum_ms']}")
+            lines.append(f"{metric}_count{{{labels}}} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# Global histogram instance (one per worker process)
+route_latency_histogram = RouteLatencyHistogram()
+
+
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware that times every HTTP request.
+
+    Records method, route template, status, latency and response size,
+    feeds the per-route latency histogram, adds an ``X-Process-Time``
+    header and emits sampled structured logs. Errors and slow requests are
+    always logged; everything else is logged at ``request_log_sample_rate``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: Optional[float] = None,
+        slow_threshold_ms: Optional[float] = None,
+        histogram: Optional[RouteLatencyHistogram] = None,
+    ):
+        self.app = app
+        self.sample_rate = 1.0 if settings.debug else (
+            settings.request_log_sample_rate if sample_rate is None else sample_rate
+        )
+        self.slow_threshold_ms = (
+            settings.slow_request_threshold_ms if slow_threshold_ms is None else slow_threshold_ms
+        )
+        self.histogram = histogram if histogram is not None else route_latency_histogram
+        self.metrics_enabled = settings.request_metrics_enabled
+        self.logger = get_logger("request_logger")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = f"{(time.perf_counter() - start_time) * 1000:.2f}"
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = time.time() - start_time
-            duration_ms = duration * 1000
-            
-            # Log response
-            if settings.debug:
-                status_emoji = "OK" if response.status_code < 400 else "WARN" if response.status_code < 500 else "ERROR"
-                self.logger.info(f"\n{status_emoji} RESPONSE")
-                self.logger.info(f"   Status: {response.status_code}")
-                self.logger.info(f"   Duration: {duration_ms:.2f}ms")
-                
-                # Add performance warning for slow requests
-                if duration_ms > 1000:
-                    self.logger.warning(f"    SLOW REQUEST! Took {duration_ms:.2f}ms (> 1 second)")
-                elif duration_ms > 500:
-                    self.logger.warning(f"    Moderately slow request: {duration_ms:.2f}ms")
-                
-                self.logger.info("=" * 100 + "\n")
-            
-            # Add custom headers
-            response.headers["X-Process-Time"] = str(duration_ms)
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            duration = time.time() - start_time
-            duration_ms = duration * 1000
-            
-            self.logger.error("=" * 100)
-            self.logger.error(f" REQUEST FAILED")
-            self.logger.error(f"   Method: {request.method}")
-            self.logger.error(f"   Path: {request.url.path}")
-            self.logger.error(f"   Duration: {duration_ms:.2f}ms")
-            self.logger.error(f"   Error: {str(e)}")
-            self.logger.error("=" * 100 + "\n")
-            
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self._record(scope, 500, duration_ms, response_size, error=str(e))
             raise
 
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        self._record(scope, status_code, duration_ms, response_size)
+
+    def _record(
+        self,
+        scope: Scope,
+        status_code: int,
+        duration_ms: float,
+        response_size: int,
+        error: Optional[str] = None,
+    ) -> None:
+        """Update metrics and emit the (possibly sampled) log line."""
+        method = scope["method"]
+        route = resolve_route_template(scope)
 
-class DatabaseQueryLoggingMiddleware(BaseHTTPMiddleware):
+        if self.metrics_enabled:
+            self.histogram.observe(method, route, duration_ms)
+
+        is_slow = duration_ms >= self.slow_threshold_ms
+        if not (error or is_slow or status_code >= 500 or random.random() < self.sample_rate):
+            return
+
+        state = scope.get("state") or {}
+        log_api_response(
+            self.logger,
+            method=method,
+            path=route,
+            status_code=status_code,
+            response_time_ms=round(duration_ms, 2),
+            user_id=state.get("user_id"),
+            response_bytes=response_size,
+            slow=is_slow,
+            error=error,
+        )
+
+
+class DatabaseQueryLoggingMiddleware:
     """
-    Middleware to track database queries per request.
+    Middleware to mark database query boundaries per request (debug only).
     """
-    
+
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         self.logger = logging.getLogger("db_query_logger")
         self.logger.setLevel(logging.INFO if settings.debug else logging.WARNING)
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Track database queries during request.
-        """
-        # Skip non-debug mode
-        if not settings.debug:
-            return await call_next(request)
-        
-        # Skip health check and docs
-        if request.url.path in ["/health", "/docs", "/redoc", "/openapi.json"]:
-            return await call_next(request)
-        
-        # Mark start of request queries
-        self.logger.info(f"\n{'' * 40}")
-        self.logger.info(f" DATABASE QUERIES FOR: {request.method} {request.url.path}")
-        self.logger.info(f"{'' * 40}")
-        
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not settings.debug
+            or scope["type"] != "http"
+            or scope["path"] in EXCLUDED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self.logger.info(f" DATABASE QUERIES FOR: {scope['method']} {scope['path']}")
+
         # Process request (SQL queries will be logged by SQLAlchemy)
-        response = await call_next(request)
-        
-        # Mark end of request queries
-        self.logger.info(f"{'' * 40}")
-        self.logger.info(f" END OF QUERIES FOR: {request.method} {request.url.path}")
-        self.logger.info(f"{'' * 40}\n")
-        
-        return response
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.logger.info(f" END OF QUERIES FOR: {scope['method']} {scope['path']}")
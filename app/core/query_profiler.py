@@ -0,0 +1,192 @@
+"""
+Request-scoped SQL query profiler.
+
+Attaches cursor listeners to the async engine's underlying sync engine and
+accumulates query count and DB time per request through a contextvar, so
+production queries made via ``AsyncSession`` are visible too. Opt-in via
+``QUERY_PROFILER_ENABLED``.
+"""
+import re
+import time
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging_middleware import EXCLUDED_PATHS, resolve_route_template
+
+logger = logging.getLogger("query_profiler")
+
+# Collapse literal values so parameterised and inlined repeats group together
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Normalise a SQL statement for repeat detection."""
+    statement = _STRING_RE.sub("?", statement)
+    statement = _NUMBER_RE.sub("?", statement)
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+class QueryProfile:
+    """Query statistics collected for a single request (or unit of work)."""
+
+    __slots__ = ("query_count", "total_ms", "statements")
+
+    def __init__(self):
+        self.query_count = 0
+        self.total_ms = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.query_count += 1
+        self.total_ms += duration_ms
+        self.statements[normalize_statement(statement)] += 1
+
+    def repeated_statements(self, threshold: int) -> List[Dict]:
+        """Statements executed more than ``threshold`` times (likely N+1)."""
+        return [
+            {"statement": statement[:300], "count": count}
+            for statement, count in self.statements.most_common()
+            if count > threshold
+        ]
+
+    def server_timing(self) -> str:
+        """Render the profile as a ``Server-Timing`` header value."""
+        return f'db;dur={self.total_ms:.2f};desc="{self.query_count} queries"'
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def get_current_profile() -> Optional[QueryProfile]:
+    """Get the query profile for the running request, if profiling is active."""
+    return _current_profile.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profiler_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("profiler_start_time")
+    if not starts:
+        return
+    profile.record(statement, (time.perf_counter() - starts.pop(-1)) * 1000)
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """
+    Attach the profiler listeners to a sync engine.
+
+    For async engines pass ``async_engine.sync_engine``. Safe to call more
+    than once.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RouteQuerySummary:
+    """Aggregated per-route query statistics for the running worker."""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict] = {}
+
+    def observe(self, route: str, profile: QueryProfile, n_plus_one: bool) -> None:
+        entry = self._routes.get(route)
+        if entry is None:
+            entry = self._routes[route] = {
+                "requests": 0,
+                "queries": 0,
+                "db_ms": 0.0,
+                "max_queries": 0,
+                "n_plus_one_requests": 0,
+            }
+        entry["requests"] += 1
+        entry["queries"] += profile.query_count
+        entry["db_ms"] += profile.total_ms
+        entry["max_queries"] = max(entry["max_queries"], profile.query_count)
+        if n_plus_one:
+            entry["n_plus_one_requests"] += 1
+
+    def reset(self) -> None:
+        self._routes.clear()
+
+    def snapshot(self) -> List[Dict]:
+        """Per-route summary sorted by total DB time."""
+        result = []
+        for route, entry in self._routes.items():
+            requests = entry["requests"] or 1
+            result.append({
+                "route": route,
+                **entry,
+                "db_ms": round(entry["db_ms"], 3),
+                "avg_queries": round(entry["queries"] / requests, 2),
+                "avg_db_ms": round(entry["db_ms"] / requests, 3),
+            })
+        return sorted(result, key=lambda item: item["db_ms"], reverse=True)
+
+
+# Global summary instance (one per worker process)
+route_query_summary = RouteQuerySummary()
+
+
+class QueryProfilerMiddleware:
+    """
+    Pure ASGI middleware that opens a query profile for each HTTP request.
+
+    Adds a ``Server-Timing: db;dur=...`` header, updates the per-route
+    summary and logs a warning when a statement repeats more than
+    ``n_plus_one_threshold`` times within one request.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: Optional[int] = None):
+        self.app = app
+        self.n_plus_one_threshold = (
+            settings.query_profiler_n_plus_one_threshold
+            if n_plus_one_threshold is None else n_plus_one_threshold
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            self._summarise(scope, profile)
+
+    def _summarise(self, scope: Scope, profile: QueryProfile) -> None:
+        route = resolve_route_template(scope)
+        repeated = profile.repeated_statements(self.n_plus_one_threshold)
+        route_query_summary.observe(route, profile, bool(repeated))
+
+        if repeated:
+            logger.warning(
+                f"Possible N+1 on {scope['method']} {route}: "
+                f"{profile.query_count} queries in {profile.total_ms:.2f}ms; "
+                f"repeated: {repeated}"
+            )
@@ -143,7 +143,12 @@ def get_user_identifier(request: Request) -> str:
     Uses user ID if authenticated, otherwise falls back to IP address.
     """
     try:
-        # Try to get user from request state (set by auth middleware)
+        # User ID resolved from the bearer token by AuthContextMiddleware
+        user_id = getattr(request.state, 'user_id', None)
+        if user_id is not None:
+            return f"user:{user_id}"
+        
+        # Legacy: full user object placed on request state
         if hasattr(request.state, 'user') and request.state.user:
             return f"user:{request.state.user.id}"
     except Exception:
@@ -0,0 +1,68 @@
+"""
+Pacing and concurrency primitives for outbound work.
+
+``TokenBucket`` spaces out operations to a steady rate (with an optional
+burst); ``KeyedSemaphore`` bounds concurrency per key, e.g. per remote
+host, creating semaphores on first use and dropping them once idle.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Tokens refill at ``rate`` per second up to ``capacity``; ``acquire``
+    waits until enough tokens are available. Waiters are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available and take them."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class KeyedSemaphore:
+    """At most ``limit`` concurrent holders per key."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots: Dict[str, Tuple[asyncio.Semaphore, int]] = {}
+
+    @asynccontextmanager
+    async def slot(self, key: str) -> AsyncIterator[None]:
+        """Hold one of ``key``'s slots for the duration of the block."""
+        semaphore, users = self._slots.get(key, (None, 0))
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+        self._slots[key] = (semaphore, users + 1)
+        try:
+            async with semaphore:
+                yield
+        finally:
+            semaphore, users = self._slots[key]
+            if users == 1:
+                del self._slots[key]
+            else:
+                self._slots[key] = (semaphore, users - 1)
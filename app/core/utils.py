@@ -227,4 +227,20 @@ def format_skill_level(level_int: int) -> str:
         4: "expert"
     }
     
-    return level_mapping.get(level_int, "beginner")
\ No newline at end of file
+    return level_mapping.get(level_int, "beginner")
+
+
+def normalize_skill_name(skill: str) -> str:
+    """
+    Normalize a skill name into its lookup key.
+    
+    Lowercases, trims and collapses whitespace so "Product  Management " and
+    "product management" resolve to the same indexed key.
+    
+    Args:
+        skill: Raw skill name
+        
+    Returns:
+        str: Normalized skill key
+    """
+    return " ".join((skill or "").lower().split())
@@ -12,4 +12,5 @@ from app.database.job_models import *  # noqa
 from app.database.portfolio_models import *  # noqa
 from app.database.community_models import *  # noqa
 from app.database.industry_models import *  # noqa
-from app.database.gamification_models import *  # noqa
\ No newline at end of file
+from app.database.gamification_models import *  # noqa
+from app.database.task_models import QueuedTask, TaskStatus  # noqa
\ No newline at end of file
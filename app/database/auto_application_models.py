@@ -290,4 +290,16 @@ class JobApplicationTemplate(Base):
         Index('idx_template_user_active', 'user_id', 'is_active'),
         Index('idx_template_success_rate', 'success_rate', 'usage_count'),
         Index('idx_template_last_used', 'last_used_at', 'user_id'),
-    )
\ No newline at end of file
+    )
+
+
+class GeneratedCoverLetter(Base):
+    """AI cover letter cached per (profile hash, job content hash)."""
+    
+    __tablename__ = "generated_cover_letters"
+    
+    cache_key: Mapped[str] = mapped_column(String(81), primary_key=True)  # "<profile sha1>:<job sha1>"
+    cover_letter: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False, index=True)
\ No newline at end of file
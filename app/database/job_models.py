@@ -4,11 +4,11 @@ Job search and application database models.
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
 from sqlalchemy import String, Boolean, DateTime, Text, Integer, ForeignKey, JSON, Float, Enum as SQLEnum, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 import enum
 
 from app.core.database import Base
-from app.core.utils import utc_now
+from app.core.utils import utc_now, normalize_skill_name
 
 if TYPE_CHECKING:
     from app.database.user_models import User
@@ -295,6 +295,7 @@ class JobSkillRequirement(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     job_listing_id: Mapped[int] = mapped_column(ForeignKey("job_listings.id", ondelete="CASCADE"), nullable=False)
     skill_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    skill_key: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)  # Normalized skill_name for exact lookups
     skill_level: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # beginner, intermediate, advanced, expert
     is_required: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -304,6 +305,11 @@ class JobSkillRequirement(Base):
     
     # Relationships
     job_listing: Mapped["JobListing"] = relationship("JobListing", back_populates="skill_requirements")
+    
+    @validates("skill_name")
+    def _set_skill_key(self, key: str, value: str) -> str:
+        self.skill_key = normalize_skill_name(value)
+        return value
 
 
 class JobAlert(Base):
@@ -382,6 +388,36 @@ class SavedJob(Base):
     )
 
 
+class JobFeedSnapshot(Base):
+    """Latest raw job payload ingested from an external job source (one row per source)."""
+    
+    __tablename__ = "job_feed_snapshots"
+    
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)  # remoteok, remotive, github, ...
+    jobs: Mapped[Optional[str]] = mapped_column(JSON, nullable=True)  # JSON array of raw source jobs
+    job_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Ingestion metadata
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, nullable=False)
+
+
+class IngestedJob(Base):
+    """A normalized job from an external feed, stored once per (source, external id)."""
+    
+    __tablename__ = "ingested_jobs"
+    
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)  # remoteok, remotive, ...
+    external_id: Mapped[str] = mapped_column(String(200), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(40), nullable=False, index=True)  # Cross-source dedup key
+    data: Mapped[Optional[str]] = mapped_column(JSON, nullable=True)  # Normalized job payload
+    
+    # Timestamps
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
+
+
 # Aliases for compatibility
 Job = JobListing
 JobRecommendation = JobListing  # Placeholder alias
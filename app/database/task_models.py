@@ -0,0 +1,55 @@
+"""
+Durable background task queue models.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, DateTime, Text, Integer, JSON, Enum as SQLEnum, Index
+from sqlalchemy.orm import Mapped, mapped_column
+import enum
+
+from app.core.database import Base
+from app.core.utils import utc_now
+
+
+class TaskStatus(str, enum.Enum):
+    """Queued task status enumeration."""
+    QUEUED = "queued"        # Waiting for run_at
+    RUNNING = "running"      # Leased by a worker until lease_expires_at
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"            # Out of attempts
+
+
+class QueuedTask(Base):
+    """A unit of background work claimed and executed by task workers."""
+
+    __tablename__ = "task_queue"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    task_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # scan_user, generate_application, ...
+    payload: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    # Enqueuing the same key twice is a no-op (kept after completion)
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String(255), unique=True, nullable=True)
+
+    # Scheduling and leasing
+    status: Mapped[TaskStatus] = mapped_column(SQLEnum(TaskStatus), default=TaskStatus.QUEUED, nullable=False, index=True)
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Retries
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, onupdate=utc_now, nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Composite indexes
+    __table_args__ = (
+        Index('idx_task_queue_claim', 'status', 'run_at'),
+        Index('idx_task_queue_lease', 'status', 'lease_expires_at'),
+        Index('idx_task_queue_type_status', 'task_type', 'status'),
+    )
@@ -2,19 +2,30 @@
 TURN - Project Manager Career Platform
 FastAPI main application with PostgreSQL backend.
 """
+import secrets
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.openapi.utils import get_openapi
 from contextlib import asynccontextmanager
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
 from app.routes import routers
-from app.core.logging_middleware import RequestLoggingMiddleware, DatabaseQueryLoggingMiddleware
+from app.core.logging_middleware import (
+    RequestLoggingMiddleware,
+    DatabaseQueryLoggingMiddleware,
+    route_latency_histogram,
+)
+from app.core.query_profiler import QueryProfilerMiddleware, install_query_profiler, route_query_summary
+from app.core.database import UnitOfWorkMiddleware, async_engine, replica_engine
+from app.core.auth_context import AuthContextMiddleware, get_auth_token
+from app.core.http_client import http_clients
+from app.services.job_feed_service import job_feed_service
+from app.services.job_matching_service import job_matching_service
 
 EXPORT_ROOT = Path(__file__).resolve().parent.parent / "exports"
 EXPORT_ROOT.mkdir(parents=True, exist_ok=True)
@@ -32,9 +43,19 @@ async def lifespan(app: FastAPI):
     print(f" Debug mode: {settings.debug}")
     print("=" * 80)
     
+    # Load the embedding model in the background (matching uses TF-IDF until ready)
+    job_matching_service.start_model_loading()
+    
+    # Background ingestion of external job feeds
+    if settings.job_scraping_enabled:
+        await job_feed_service.start()
+    
     yield
     
     # Shutdown
+    await job_feed_service.stop()
+    await job_matching_service.batcher.stop()
+    await http_clients.close_all()
     print("=" * 80)
     print(f" Shutting down {settings.app_name}")
     print("=" * 80)
@@ -150,10 +171,23 @@ app = FastAPI(
 app.openapi = custom_openapi
 
 # Add logging middleware (add FIRST for most accurate timing)
+app.add_middleware(RequestLoggingMiddleware)
 if settings.debug:
-    app.add_middleware(RequestLoggingMiddleware)
     app.add_middleware(DatabaseQueryLoggingMiddleware)
 
+# Request-scoped SQL profiler (opt-in, attaches to the async engine's sync engine)
+if settings.query_profiler_enabled:
+    install_query_profiler(async_engine.sync_engine)
+    if replica_engine is not None:
+        install_query_profiler(replica_engine.sync_engine)
+    app.add_middleware(QueryProfilerMiddleware)
+
+# Auth context middleware (decodes bearer token once for limiter and dependencies)
+app.add_middleware(AuthContextMiddleware)
+
+# Commit each request's unit of work before its response is sent
+app.add_middleware(UnitOfWorkMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -190,6 +224,28 @@ async def health_check():
     }
 
 
+# Route latency metrics endpoint
+@app.get("/metrics", tags=["Health Check"], include_in_schema=False)
+async def metrics(request: Request, format: str = "prometheus"):
+    """
+    Per-route latency histograms for this worker (Prometheus text or JSON).
+    
+    Only served to requests sending ``Authorization: Bearer <METRICS_TOKEN>``;
+    without a configured token the endpoint does not exist.
+    """
+    if not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = get_auth_token(request) or ""
+    if not secrets.compare_digest(token.encode(), settings.metrics_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    if format == "json":
+        return {
+            "routes": route_latency_histogram.snapshot(),
+            "queries": route_query_summary.snapshot() if settings.query_profiler_enabled else [],
+        }
+    return PlainTextResponse(route_latency_histogram.render_prometheus())
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
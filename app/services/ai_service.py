@@ -57,6 +57,20 @@ class AIProvider(Enum):
     HUGGINGFACE = "huggingface"
     
 
+# Requests in flight per provider, shared by every caller in the process.
+# Gemini's free tier allows ~15 requests/minute; the Hugging Face pipeline
+# is a single local model instance.
+PROVIDER_CONCURRENCY = {
+    AIProvider.GEMINI: 4,
+    AIProvider.GROQ: 4,
+    AIProvider.HUGGINGFACE: 1,
+}
+
+# Returned by _generate_response instead of raising
+AI_UNAVAILABLE_RESPONSE = "AI service temporarily unavailable. Please try again later."
+AI_FAILED_RESPONSE = "I'm having trouble processing your request right now. Please try again later."
+
+
 class AIService:
     """
     AI-powered coaching and learning service using FREE AI providers.
@@ -67,6 +81,9 @@ class AIService:
         """Initialize AI service with specified free provider."""
         self.provider = provider
         self.logger = logging.getLogger(__name__)
+        self.provider_slots = {
+            provider: asyncio.Semaphore(limit) for provider, limit in PROVIDER_CONCURRENCY.items()
+        }
         
         # Initialize providers
         self._init_providers()
@@ -159,39 +176,53 @@ class AIService:
         """Generate AI response using available provider."""
         attempt_order = self._provider_attempt_order()
         if not attempt_order:
-            return "AI service temporarily unavailable. Please try again later."
+            return AI_UNAVAILABLE_RESPONSE
             
         full_prompt = f"{system_prompt or self.pm_teacher_system_prompt}\n\nUser: {prompt}\n\nAI:"
         
         for provider in attempt_order:
             try:
-                if provider == AIProvider.GEMINI:
-                    model = self.providers[AIProvider.GEMINI]
-                    response = model.generate_content(full_prompt)
-                    return response.text
-
-                if provider == AIProvider.GROQ:
-                    client = self.providers[AIProvider.GROQ]
-                    chat_completion = client.chat.completions.create(
-                        messages=[
-                            {"role": "system", "content": system_prompt or self.pm_teacher_system_prompt},
-                            {"role": "user", "content": prompt}
-                        ],
-                        model="llama-3.1-8b-instant",
-                        max_tokens=1000,
-                        temperature=0.7
+                # Provider clients are blocking: run them off the event loop,
+                # within the provider's concurrency limit
+                async with self.provider_slots[provider]:
+                    return await asyncio.to_thread(
+                        self._call_provider, provider, prompt, full_prompt, system_prompt
                     )
-                    return chat_completion.choices[0].message.content
-
-                if provider == AIProvider.HUGGINGFACE:
-                    model = self.providers[AIProvider.HUGGINGFACE]
-                    response = model(full_prompt, max_length=500, num_return_sequences=1)
-                    return response[0]['generated_text'][len(full_prompt):].strip()
             except Exception as e:
                 self.logger.error(f"Error generating AI response with {provider}: {e}")
                 continue
 
-        return "I'm having trouble processing your request right now. Please try again later."
+        return AI_FAILED_RESPONSE
+
+    def _call_provider(
+        self,
+        provider: AIProvider,
+        prompt: str,
+        full_prompt: str,
+        system_prompt: Optional[str]
+    ) -> str:
+        """Blocking request to one provider."""
+        if provider == AIProvider.GEMINI:
+            model = self.providers[AIProvider.GEMINI]
+            response = model.generate_content(full_prompt)
+            return response.text
+
+        if provider == AIProvider.GROQ:
+            client = self.providers[AIProvider.GROQ]
+            chat_completion = client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": system_prompt or self.pm_teacher_system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                model="llama-3.1-8b-instant",
+                max_tokens=1000,
+                temperature=0.7
+            )
+            return chat_completion.choices[0].message.content
+
+        model = self.providers[AIProvider.HUGGINGFACE]
+        response = model(full_prompt, max_length=500, num_return_sequences=1)
+        return response[0]['generated_text'][len(full_prompt):].strip()
 
     async def generate_response(self, prompt: str, system_prompt: str | None = None) -> str:
         """Public wrapper for backward compatibility with existing callers."""
@@ -257,7 +257,24 @@ class AuthenticationService:
         if not payload:
             return None
         
-        user_id = payload.get("sub")
+        return await self.get_user_from_claims(db, payload)
+    
+    async def get_user_from_claims(
+        self, 
+        db: AsyncSession, 
+        claims: Dict[str, Any]
+    ) -> Optional[User]:
+        """
+        Get user from already-decoded JWT claims.
+        
+        Args:
+            db: Database session
+            claims: Decoded token payload
+            
+        Returns:
+            User referenced by the ``sub`` claim, if any
+        """
+        user_id = claims.get("sub")
         if not user_id:
             return None
         
@@ -5,20 +5,29 @@ Periodically scans for new jobs and matches them with user profiles.
 import asyncio
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, update
+from sqlalchemy import select, and_, or_, func, update, insert
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, pool_capacity, savepoint
 from app.core.logger import logger
+from app.core.utils import utc_now
 from app.database.user_models import User, Profile
 from app.database.auto_application_models import (
     PendingAutoApplication, AutoApplicationLog, JobMatchNotification,
-    AutoApplicationStatus, JobMatchNotificationType
+    AutoApplicationSettings, AutoApplicationStatus, JobMatchNotificationType
+)
+from app.services.auto_application_service import (
+    auto_application_service, AutoApplicationCriteria, JobCandidateSnapshot
 )
-from app.services.auto_application_service import auto_application_service, AutoApplicationCriteria
 from app.services.email_service import email_service
+from app.services.task_queue import TaskQueue, task_queue
+
+# Durable task types (see register_tasks)
+SCAN_USER_TASK = "scan_user"
+GENERATE_APPLICATION_TASK = "generate_application"
+SEND_NOTIFICATION_TASK = "send_notification"
 
 
 class AutoApplicationScheduler:
@@ -30,10 +39,23 @@ class AutoApplicationScheduler:
         self.logger = logger
         self.is_running = False
         self.scan_interval_minutes = 60  # Scan every hour
-        self.max_concurrent_users = 10   # Process max 10 users concurrently
+        self.max_concurrent_users = 10   # Upper bound on users processed concurrently
+        self.eligible_page_size = 500    # Users fetched per eligibility query
+        self.min_scan_interval = timedelta(hours=12)  # Don't scan more than twice per day
+        self.user_slots = asyncio.Semaphore(self._user_concurrency())
+        self.max_queued_scans = 5000     # Skip enqueueing a cycle while this many scans are pending
+        self.summary_email_delay = timedelta(minutes=15)  # Lets a scan's applications finish first
+        self.task_queue: TaskQueue = task_queue          # Queue the task handlers enqueue follow-ups on
+        self._snapshot: Optional[JobCandidateSnapshot] = None
+        self._snapshot_lock = asyncio.Lock()
         
     async def start_scheduler(self):
-        """Start the background job matching scheduler."""
+        """
+        Start the in-process job matching scheduler.
+        
+        Runs in every process that calls it; multi-process deployments should
+        run ``scripts/task_worker.py`` (durable task queue) instead.
+        """
         self.is_running = True
         self.logger.info("Auto-application scheduler started")
         
@@ -50,114 +72,218 @@ class AutoApplicationScheduler:
         self.is_running = False
         self.logger.info("Auto-application scheduler stopped")
     
+    def _user_concurrency(self) -> int:
+        """Users processed at once, bounded by the DB pool (half is left for requests)."""
+        capacity = pool_capacity()
+        if capacity is None:
+            return self.max_concurrent_users
+        return max(1, min(self.max_concurrent_users, capacity // 2))
+    
     async def run_job_matching_cycle(self):
-        """Run a complete job matching cycle for all eligible users."""
+        """
+        Run a complete job matching cycle for all eligible users.
+        
+        Job candidates are fetched and indexed once into a snapshot shared by
+        every user. Eligible users are streamed onto a work queue drained by
+        a fixed pool of workers, each processing one user at a time in its
+        own session, so a slow user only occupies one worker.
+        """
         self.logger.info("Starting job matching cycle")
         
-        async for db in get_db():
+        try:
+            candidates = await auto_application_service.build_candidate_snapshot()
+        except Exception as e:
+            self.logger.error(f"Error building job candidate snapshot: {str(e)}")
+            return
+        self.logger.info(f"Job candidate snapshot built with {len(candidates.jobs)} jobs")
+        if not candidates.jobs:
+            return
+        
+        concurrency = self._user_concurrency()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.eligible_page_size)
+        workers = [
+            asyncio.create_task(self._user_worker(queue, candidates))
+            for _ in range(concurrency)
+        ]
+        
+        try:
+            eligible_count = 0
             try:
-                # Get users with auto-apply enabled
-                eligible_users = await self._get_eligible_users(db)
-                self.logger.info(f"Found {len(eligible_users)} eligible users for job matching")
-                
-                if not eligible_users:
-                    return
-                
-                # Process users in batches
-                for i in range(0, len(eligible_users), self.max_concurrent_users):
-                    batch = eligible_users[i:i + self.max_concurrent_users]
-                    await self._process_user_batch(db, batch)
-                
-                self.logger.info("Job matching cycle completed")
-                
+                async with AsyncSessionLocal() as db:
+                    async for page in self._iter_eligible_users(db):
+                        await self._match_page(db, page, candidates)
+                        # Release the connection between pages; loaded users stay usable
+                        await db.commit()
+                        eligible_count += len(page)
+                        for user_data in page:
+                            await queue.put(user_data)
             except Exception as e:
                 self.logger.error(f"Error in job matching cycle: {str(e)}")
-            finally:
-                await db.close()
+            
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+            
+            self.logger.info(
+                f"Job matching cycle completed for {eligible_count} eligible users "
+                f"({concurrency} workers)"
+            )
+        finally:
+            for worker in workers:
+                worker.cancel()
     
     async def _get_eligible_users(self, db: AsyncSession) -> List[Dict[str, Any]]:
-        """Get users eligible for auto job matching."""
-        # Get users with auto-apply enabled and complete profiles
-        result = await db.execute(
-            select(User)
+        """Get all users eligible for auto job matching."""
+        eligible_users = []
+        async for page in self._iter_eligible_users(db):
+            eligible_users.extend(page)
+        return eligible_users
+    
+    async def _iter_eligible_users(
+        self,
+        db: AsyncSession,
+        user_id: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of users eligible for auto job matching.
+        
+        Eligibility (active, verified, auto-apply enabled, profile complete,
+        not scanned recently, daily quota not used up) is evaluated in a
+        single query per page: today's application counts come from one
+        grouped subquery and pages are keyset-paginated on the user id.
+        Pass ``user_id`` to check a single user.
+        """
+        current_time = datetime.utcnow()
+        today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        today_counts = (
+            select(
+                PendingAutoApplication.user_id,
+                func.count(PendingAutoApplication.id).label("today_applications")
+            )
+            .where(
+                and_(
+                    PendingAutoApplication.created_at >= today_start,
+                    PendingAutoApplication.status.in_([
+                        AutoApplicationStatus.PENDING_APPROVAL,
+                        AutoApplicationStatus.APPROVED,
+                        AutoApplicationStatus.SUBMITTED
+                    ])
+                )
+            )
+            .group_by(PendingAutoApplication.user_id)
+            .subquery()
+        )
+        today_applications = func.coalesce(today_counts.c.today_applications, 0)
+        
+        query = (
+            select(User, today_applications)
             .options(selectinload(User.profile).selectinload(Profile.skills))
             .join(Profile)
+            .outerjoin(today_counts, today_counts.c.user_id == User.id)
+            .outerjoin(AutoApplicationSettings, AutoApplicationSettings.user_id == User.id)
             .where(
                 and_(
                     User.is_active == True,
                     User.is_verified == True,
                     Profile.auto_apply_enabled == True,
                     Profile.is_complete == True,
-                    Profile.completion_percentage >= 70  # At least 70% complete
+                    Profile.completion_percentage >= 70,  # At least 70% complete
+                    or_(
+                        AutoApplicationSettings.last_job_scan_at.is_(None),
+                        AutoApplicationSettings.last_job_scan_at < current_time - self.min_scan_interval
+                    ),
+                    today_applications < Profile.max_daily_auto_applications
                 )
             )
+            .order_by(User.id)
+            .limit(self.eligible_page_size)
         )
-        users = result.scalars().all()
-        
-        eligible_users = []
-        current_time = datetime.utcnow()
+        if user_id is not None:
+            query = query.where(User.id == user_id)
         
-        for user in users:
-            profile = user.profile
+        last_user_id = 0
+        while True:
+            result = await db.execute(query.where(User.id > last_user_id))
+            rows = result.all()
+            if not rows:
+                return
+            last_user_id = rows[-1][0].id
             
-            # Check if user hasn't been processed recently
-            last_scan_time = getattr(profile, 'last_job_scan_at', None)
-            if last_scan_time:
-                time_since_last_scan = current_time - last_scan_time
-                if time_since_last_scan < timedelta(hours=12):  # Don't scan more than twice per day
+            page = []
+            for user, today_count in rows:
+                profile = user.profile
+                
+                # Check if within user's preferred time window
+                if not self._is_within_application_window(profile, current_time):
                     continue
+                
+                page.append({
+                    "user": user,
+                    "profile": profile,
+                    "today_applications": today_count,
+                    "remaining_quota": profile.max_daily_auto_applications - today_count
+                })
             
-            # Check daily application limit
-            today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-            today_applications = await db.scalar(
-                select(func.count(PendingAutoApplication.id))
-                .where(
-                    and_(
-                        PendingAutoApplication.user_id == user.id,
-                        PendingAutoApplication.created_at >= today_start,
-                        PendingAutoApplication.status.in_([
-                            AutoApplicationStatus.PENDING_APPROVAL,
-                            AutoApplicationStatus.APPROVED,
-                            AutoApplicationStatus.SUBMITTED
-                        ])
-                    )
-                )
+            if page:
+                yield page
+            if len(rows) < self.eligible_page_size:
+                return
+    
+    def _build_criteria(self, user_data: Dict[str, Any]) -> AutoApplicationCriteria:
+        """Search criteria from the user's preferences, capped at today's remaining quota."""
+        return AutoApplicationCriteria.from_profile(
+            user_data["profile"],
+            max_daily_applications=user_data["remaining_quota"]
+        )
+    
+    async def _match_page(
+        self,
+        db: AsyncSession,
+        page: List[Dict[str, Any]],
+        candidates: JobCandidateSnapshot
+    ):
+        """Score a page of users against the candidates in one batch (sets ``recommendations``)."""
+        try:
+            recommendations = await auto_application_service.match_users(
+                db,
+                [(user_data["user"], self._build_criteria(user_data)) for user_data in page],
+                candidates
             )
-            
-            if today_applications >= profile.max_daily_auto_applications:
-                continue
-            
-            # Check if within user's preferred time window
-            if not self._is_within_application_window(profile, current_time):
-                continue
-            
-            eligible_users.append({
-                "user": user,
-                "profile": profile,
-                "today_applications": today_applications,
-                "remaining_quota": profile.max_daily_auto_applications - today_applications
-            })
-        
-        return eligible_users
+        except Exception as e:
+            self.logger.error(f"Batch matching failed, matching users individually: {str(e)}")
+            return
+        if recommendations is None:
+            return
+        for user_data in page:
+            user_data["recommendations"] = recommendations.get(user_data["user"].id, [])
     
-    async def _process_user_batch(self, db: AsyncSession, user_batch: List[Dict[str, Any]]):
-        """Process a batch of users concurrently."""
-        tasks = [
-            self._process_single_user(db, user_data)
-            for user_data in user_batch
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def _user_worker(self, queue: asyncio.Queue, candidates: JobCandidateSnapshot):
+        """Process queued users one at a time until a ``None`` sentinel arrives."""
+        while True:
+            user_data = await queue.get()
+            if user_data is None:
+                return
+            await self._process_user({**user_data, "candidates": candidates})
+    
+    async def _process_user(self, user_data: Dict[str, Any]):
+        """Process one user in a dedicated session, within the concurrency bound."""
+        user_id = user_data["user"].id
         
-        # Log results
-        for i, result in enumerate(results):
-            user_data = user_batch[i]
-            user_id = user_data["user"].id
-            
-            if isinstance(result, Exception):
-                self.logger.error(f"Error processing user {user_id}: {str(result)}")
-            else:
-                self.logger.info(f"Processed user {user_id}: {result}")
+        async with self.user_slots:
+            async with AsyncSessionLocal() as db:
+                try:
+                    # Attach the already-loaded user (and profile/skills) without re-querying
+                    user = await db.merge(user_data["user"], load=False)
+                    # Profile and CV are loaded once for matching and generation
+                    with auto_application_service.user_context():
+                        result = await self._process_single_user(
+                            db, {**user_data, "user": user, "profile": user.profile}
+                        )
+                    self.logger.info(f"Processed user {user_id}: {result}")
+                except Exception as e:
+                    await db.rollback()
+                    self.logger.error(f"Error processing user {user_id}: {str(e)}")
     
     async def _process_single_user(self, db: AsyncSession, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process job matching for a single user."""
@@ -167,83 +293,57 @@ class AutoApplicationScheduler:
         
         try:
             # Create search criteria from user preferences
-            criteria = AutoApplicationCriteria(
-                min_match_score=profile.min_match_score_threshold,
-                max_daily_applications=remaining_quota,
-                preferred_locations=profile.preferred_locations or [],
-                required_skills=profile.required_skills or [],
-                excluded_companies=profile.excluded_companies or [],
-                salary_min=profile.salary_expectations_min,
-                salary_max=profile.salary_expectations_max,
-                remote_only=profile.auto_apply_only_remote,
-                experience_level_match=True
-            )
+            criteria = self._build_criteria(user_data)
             
             # Find job matches
             matches = await auto_application_service.find_job_matches_for_user(
                 db=db,
                 user_id=user.id,
-                criteria=criteria
+                criteria=criteria,
+                candidates=user_data.get("candidates"),
+                recommendations=user_data.get("recommendations")
             )
             
             if not matches:
                 # Update last scan time even if no matches
                 await self._update_last_scan_time(db, user.id)
+                await db.commit()
                 return {"user_id": user.id, "matches_found": 0, "applications_created": 0}
             
-            # Process matches
-            applications_created = 0
-            notifications_sent = 0
+            # Generate application materials for every match first (concurrently)
+            selected = matches[:remaining_quota]
+            try:
+                materials = await auto_application_service.generate_ai_applications(
+                    db=db,
+                    user_id=user.id,
+                    jobs=[match["job"] for match in selected]
+                )
+            except Exception as e:
+                self.logger.error(f"Error generating applications for user {user.id}: {str(e)}")
+                materials = []
             
-            for match in matches[:remaining_quota]:
+            generated = []
+            for match, application_materials in zip(selected, materials):
+                if isinstance(application_materials, Exception):
+                    self.logger.error(f"Error processing match for user {user.id}: {str(application_materials)}")
+                    continue
+                generated.append((match, application_materials))
+            
+            # Then write all applications and notifications in bulk
+            pending_apps = []
+            if generated:
                 try:
-                    # Generate application materials
-                    application_materials = await auto_application_service.generate_ai_application(
-                        db=db,
-                        user_id=user.id,
-                        job_data=match["job"]
-                    )
-                    
-                    # Create pending application
-                    pending_app = await self._create_pending_application(
-                        db=db,
-                        user_id=user.id,
-                        match=match,
-                        application_materials=application_materials
-                    )
-                    
-                    if pending_app:
-                        applications_created += 1
-                        
-                        # Create notification
-                        await self._create_job_match_notification(
-                            db=db,
-                            user_id=user.id,
-                            pending_application_id=pending_app.id,
-                            match=match
-                        )
-                        notifications_sent += 1
-                        
-                        # If manual approval not required, auto-submit
-                        if not profile.require_manual_approval:
-                            await self._auto_submit_application(db, pending_app.id, user.id)
-                    
+                    async with savepoint(db):
+                        pending_apps = await self._create_pending_applications(db, user.id, generated)
                 except Exception as e:
-                    self.logger.error(f"Error processing match for user {user.id}: {str(e)}")
-                    continue
+                    self.logger.error(f"Error creating pending applications for user {user.id}: {str(e)}")
+            
+            applications_created = len(pending_apps)
+            notifications_sent = len(pending_apps)
             
             # Update last scan time
             await self._update_last_scan_time(db, user.id)
             
-            # Send summary email if applications were created
-            if applications_created > 0:
-                await self._send_job_match_summary_email(
-                    db=db,
-                    user=user,
-                    applications_created=applications_created,
-                    matches_found=len(matches)
-                )
-            
             # Log activity
             await self._log_job_matching_activity(
                 db=db,
@@ -252,6 +352,24 @@ class AutoApplicationScheduler:
                 applications_created=applications_created
             )
             
+            # Single commit for the applications, notifications and scan record
+            await db.commit()
+            
+            # If manual approval not required, auto-submit the saved
+            # applications (each submission commits its own status)
+            if not profile.require_manual_approval:
+                for pending_app in pending_apps:
+                    await self._auto_submit_application(db, pending_app.id, user.id)
+            
+            # Send summary email only once the applications are saved
+            if applications_created > 0:
+                await self._send_job_match_summary_email(
+                    db=db,
+                    user=user,
+                    applications_created=applications_created,
+                    matches_found=len(matches)
+                )
+            
             return {
                 "user_id": user.id,
                 "matches_found": len(matches),
@@ -263,92 +381,106 @@ class AutoApplicationScheduler:
             self.logger.error(f"Error processing user {user.id}: {str(e)}")
             raise
     
-    async def _create_pending_application(
+    async def _create_pending_applications(
         self,
         db: AsyncSession,
         user_id: int,
-        match: Dict[str, Any],
-        application_materials: Dict[str, Any]
-    ) -> PendingAutoApplication:
-        """Create a pending auto-application record."""
-        job = match["job"]
-        
-        # Check if similar application already exists
-        existing = await db.execute(
-            select(PendingAutoApplication)
+        generated: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[PendingAutoApplication]:
+        """
+        Create pending auto-applications and their notifications in bulk.
+        
+        Matches the user already has a pending application for (same
+        company and title in the last 30 days) are skipped, checked with one
+        query for the whole batch. Applications and notifications are then
+        written with one INSERT ... RETURNING each; nothing is committed.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            generated: (match, application materials) pairs
+            
+        Returns:
+            The created applications, in match order
+        """
+        now = datetime.utcnow()
+        titles = {match["job"].get("title", "") for match, _ in generated}
+        
+        result = await db.execute(
+            select(PendingAutoApplication.company_name, PendingAutoApplication.job_title)
             .where(
                 and_(
                     PendingAutoApplication.user_id == user_id,
-                    PendingAutoApplication.company_name == job.get("company", ""),
-                    PendingAutoApplication.job_title == job.get("title", ""),
-                    PendingAutoApplication.created_at >= datetime.utcnow() - timedelta(days=30)
+                    PendingAutoApplication.job_title.in_(titles),
+                    PendingAutoApplication.created_at >= now - timedelta(days=30)
                 )
             )
         )
+        seen = set(result.all())
         
-        if existing.scalar_one_or_none():
-            return None  # Skip duplicate
-        
-        pending_app = PendingAutoApplication(
-            user_id=user_id,
-            external_job_id=job.get("id"),
-            job_title=job.get("title", ""),
-            company_name=job.get("company", ""),
-            job_url=job.get("url"),
-            job_description=job.get("description", "")[:2000],  # Truncate
-            salary_range=job.get("salary_range"),
-            location=job.get("location"),
-            employment_type=job.get("employment_type"),
-            match_score=match["similarity_score"],
-            match_reasons=match["match_reasons"],
-            auto_apply_score=match["auto_apply_score"],
-            generated_cover_letter=application_materials["cover_letter"],
-            cv_customizations=application_materials["cv_customizations"],
-            application_summary=application_materials["application_summary"],
-            confidence_score=application_materials["confidence_score"],
-            status=AutoApplicationStatus.PENDING_APPROVAL,
-            expires_at=datetime.utcnow() + timedelta(days=7)  # Expire in 7 days
-        )
-        
-        db.add(pending_app)
-        await db.commit()
-        await db.refresh(pending_app)
+        applications = []
+        new_matches = []
+        for match, application_materials in generated:
+            job = match["job"]
+            key = (job.get("company", ""), job.get("title", ""))
+            if key in seen:
+                continue  # Skip duplicate
+            seen.add(key)
+            
+            new_matches.append(match)
+            applications.append({
+                "user_id": user_id,
+                "external_job_id": job.get("id"),
+                "job_title": job.get("title", ""),
+                "company_name": job.get("company", ""),
+                "job_url": job.get("url"),
+                "job_description": job.get("description", "")[:2000],  # Truncate
+                "salary_range": job.get("salary_range"),
+                "location": job.get("location"),
+                "employment_type": job.get("employment_type"),
+                "match_score": match["similarity_score"],
+                "match_reasons": match["match_reasons"],
+                "auto_apply_score": match["auto_apply_score"],
+                "generated_cover_letter": application_materials["cover_letter"],
+                "cv_customizations": application_materials["cv_customizations"],
+                "application_summary": application_materials["application_summary"],
+                "confidence_score": application_materials["confidence_score"],
+                "status": AutoApplicationStatus.PENDING_APPROVAL,
+                "expires_at": now + timedelta(days=7)  # Expire in 7 days
+            })
         
-        return pending_app
-    
-    async def _create_job_match_notification(
-        self,
-        db: AsyncSession,
-        user_id: int,
-        pending_application_id: int,
-        match: Dict[str, Any]
-    ):
-        """Create job match notification for user."""
-        job = match["job"]
+        if not applications:
+            return []
         
-        notification = JobMatchNotification(
-            user_id=user_id,
-            pending_application_id=pending_application_id,
-            notification_type=JobMatchNotificationType.NEW_MATCH,
-            title=f"New Job Match: {job.get('title', 'Position')} at {job.get('company', 'Company')}",
-            message=f"We found a great job match for you! This position has a {match['similarity_score']:.0%} match with your profile. Review and approve the auto-generated application.",
-            action_url=f"/dashboard/auto-apply/pending/{pending_application_id}",
-            job_title=job.get("title"),
-            company_name=job.get("company"),
-            match_score=match["similarity_score"],
-            expires_at=datetime.utcnow() + timedelta(days=7)
+        result = await db.scalars(
+            insert(PendingAutoApplication).returning(PendingAutoApplication, sort_by_parameter_order=True),
+            applications
         )
+        pending_apps = list(result.all())
         
-        db.add(notification)
-        await db.commit()
+        notifications = []
+        for pending_app, match in zip(pending_apps, new_matches):
+            job = match["job"]
+            notifications.append({
+                "user_id": user_id,
+                "pending_application_id": pending_app.id,
+                "notification_type": JobMatchNotificationType.NEW_MATCH,
+                "title": f"New Job Match: {job.get('title', 'Position')} at {job.get('company', 'Company')}",
+                "message": f"We found a great job match for you! This position has a {match['similarity_score']:.0%} match with your profile. Review and approve the auto-generated application.",
+                "action_url": f"/dashboard/auto-apply/pending/{pending_app.id}",
+                "job_title": job.get("title"),
+                "company_name": job.get("company"),
+                "match_score": match["similarity_score"],
+                "expires_at": now + timedelta(days=7)
+            })
+        await db.execute(insert(JobMatchNotification), notifications)
+        
+        return pending_apps
     
     async def _auto_submit_application(self, db: AsyncSession, pending_app_id: int, user_id: int):
         """Auto-submit application without manual approval."""
-        # Get pending application
-        result = await db.execute(
-            select(PendingAutoApplication).where(PendingAutoApplication.id == pending_app_id)
-        )
-        pending_app = result.scalar_one_or_none()
+        # Get pending application (usually already in the session)
+        pending_app = await db.get(PendingAutoApplication, pending_app_id)
         
         if not pending_app:
             return
@@ -370,7 +502,7 @@ class AutoApplicationScheduler:
                 "confidence_score": pending_app.confidence_score
             }
             
-            result = await auto_application_service.submit_auto_application(
+            await auto_application_service.submit_auto_application(
                 db=db,
                 user_id=user_id,
                 job_data=job_data,
@@ -392,12 +524,14 @@ class AutoApplicationScheduler:
     
     async def _update_last_scan_time(self, db: AsyncSession, user_id: int):
         """Update the last job scan time for user."""
-        await db.execute(
-            update(Profile)
-            .where(Profile.user_id == user_id)
-            .values(last_job_scan_at=datetime.utcnow())
+        scanned_at = datetime.utcnow()
+        result = await db.execute(
+            update(AutoApplicationSettings)
+            .where(AutoApplicationSettings.user_id == user_id)
+            .values(last_job_scan_at=scanned_at)
         )
-        await db.commit()
+        if result.rowcount == 0:
+            db.add(AutoApplicationSettings(user_id=user_id, last_job_scan_at=scanned_at))
     
     async def _send_job_match_summary_email(
         self,
@@ -439,7 +573,6 @@ class AutoApplicationScheduler:
         )
         
         db.add(log_entry)
-        await db.commit()
     
     def _is_within_application_window(self, profile: Profile, current_time: datetime) -> bool:
         """Check if current time is within user's preferred application window."""
@@ -448,11 +581,166 @@ class AutoApplicationScheduler:
         # and auto_apply_days from the extended settings
         return True
     
+    # Durable task queue
+    
+    def register_tasks(self, queue: TaskQueue = task_queue):
+        """Register the auto-application task handlers with a task queue."""
+        self.task_queue = queue
+        queue.register(SCAN_USER_TASK, self._run_scan_user_task)
+        queue.register(GENERATE_APPLICATION_TASK, self._run_generate_application_task)
+        queue.register(SEND_NOTIFICATION_TASK, self._run_send_notification_task)
+    
+    async def enqueue_job_matching_cycle(self, queue: TaskQueue = task_queue) -> int:
+        """
+        Enqueue a scan task for every eligible user.
+        
+        Safe to call from any number of processes: scans are keyed per user
+        and half-day slot, so repeated calls within a slot enqueue nothing.
+        Returns the number of eligible users.
+        """
+        now = utc_now()
+        slot = f"{now:%Y-%m-%d}:{now.hour // 12}"
+        enqueued = 0
+        
+        async with AsyncSessionLocal() as db:
+            backlog = await queue.pending_count(db, SCAN_USER_TASK)
+            if backlog >= self.max_queued_scans:
+                self.logger.warning(f"Skipping job matching cycle: {backlog} scans still pending")
+                return 0
+            
+            async for page in self._iter_eligible_users(db):
+                for user_data in page:
+                    user_id = user_data["user"].id
+                    await queue.enqueue(
+                        db,
+                        SCAN_USER_TASK,
+                        {"user_id": user_id},
+                        idempotency_key=f"{SCAN_USER_TASK}:{user_id}:{slot}"
+                    )
+                    enqueued += 1
+                await db.commit()
+        
+        self.logger.info(f"Enqueued job matching scans for {enqueued} eligible users")
+        return enqueued
+    
+    async def _get_candidate_snapshot(self) -> JobCandidateSnapshot:
+        """Candidate snapshot shared by this process's scans, rebuilt every scan interval."""
+        async with self._snapshot_lock:
+            snapshot = self._snapshot
+            max_age = timedelta(minutes=self.scan_interval_minutes)
+            if snapshot is None or datetime.utcnow() - snapshot.created_at >= max_age:
+                snapshot = await auto_application_service.build_candidate_snapshot()
+                self._snapshot = snapshot
+            return snapshot
+    
+    async def _run_scan_user_task(self, db: AsyncSession, payload: Dict[str, Any]):
+        """Find a user's matches and enqueue one application task per match."""
+        user_id = payload["user_id"]
+        user_data = None
+        async for page in self._iter_eligible_users(db, user_id=user_id):
+            user_data = page[0]
+        if user_data is None:
+            return  # No longer eligible (scanned meanwhile, quota used, disabled)
+        
+        candidates = await self._get_candidate_snapshot()
+        matches = await auto_application_service.find_job_matches_for_user(
+            db=db,
+            user_id=user_id,
+            criteria=self._build_criteria(user_data),
+            candidates=candidates
+        )
+        matches = matches[:user_data["remaining_quota"]]
+        
+        scanned_at = utc_now()
+        for match in matches:
+            job = match["job"]
+            job_key = job.get("id") or f"{job.get('company', '')}:{job.get('title', '')}"
+            # Keyed per day: a retried scan doesn't generate twice, while a job
+            # can match again later (the 30-day duplicate check still applies)
+            await self.task_queue.enqueue(
+                db,
+                GENERATE_APPLICATION_TASK,
+                # Round-trip through JSON so the payload column accepts it
+                {"user_id": user_id, "match": json.loads(json.dumps(match, default=str))},
+                idempotency_key=f"{GENERATE_APPLICATION_TASK}:{user_id}:{scanned_at:%Y-%m-%d}:{job_key}"[:255]
+            )
+        
+        if matches:
+            await self.task_queue.enqueue(
+                db,
+                SEND_NOTIFICATION_TASK,
+                {"user_id": user_id, "since": scanned_at.isoformat(), "matches_found": len(matches)},
+                idempotency_key=f"{SEND_NOTIFICATION_TASK}:{user_id}:{scanned_at:%Y-%m-%dT%H:%M:%S}",
+                run_at=scanned_at + self.summary_email_delay
+            )
+        
+        await self._update_last_scan_time(db, user_id)
+        await self._log_job_matching_activity(
+            db=db,
+            user_id=user_id,
+            matches_found=len(matches),
+            applications_created=0
+        )
+    
+    async def _run_generate_application_task(self, db: AsyncSession, payload: Dict[str, Any]):
+        """Generate materials for one match and create its pending application."""
+        user_id = payload["user_id"]
+        match = payload["match"]
+        
+        result = await db.execute(
+            select(User).options(selectinload(User.profile)).where(User.id == user_id)
+        )
+        user = result.scalar_one_or_none()
+        if not user or not user.profile or not user.profile.auto_apply_enabled:
+            return
+        
+        application_materials = await auto_application_service.generate_ai_application(
+            db=db,
+            user_id=user_id,
+            job_data=match["job"]
+        )
+        
+        pending_apps = await self._create_pending_applications(
+            db, user_id, [(match, application_materials)]
+        )
+        
+        if pending_apps and not user.profile.require_manual_approval:
+            # Commits the pending application; a retry then sees it as a duplicate
+            await self._auto_submit_application(db, pending_apps[0].id, user_id)
+    
+    async def _run_send_notification_task(self, db: AsyncSession, payload: Dict[str, Any]):
+        """Email the user a summary of the applications created by one scan."""
+        user_id = payload["user_id"]
+        since = datetime.fromisoformat(payload["since"])
+        
+        result = await db.execute(
+            select(User).options(selectinload(User.profile)).where(User.id == user_id)
+        )
+        user = result.scalar_one_or_none()
+        if not user or not user.profile:
+            return
+        
+        applications_created = await db.scalar(
+            select(func.count(PendingAutoApplication.id)).where(
+                and_(
+                    PendingAutoApplication.user_id == user_id,
+                    PendingAutoApplication.created_at >= since
+                )
+            )
+        )
+        if applications_created:
+            await self._send_job_match_summary_email(
+                db=db,
+                user=user,
+                applications_created=applications_created,
+                matches_found=payload.get("matches_found", applications_created)
+            )
+    
     # Manual trigger methods
     
     async def trigger_user_job_matching(self, user_id: int) -> Dict[str, Any]:
         """Manually trigger job matching for a specific user."""
-        async for db in get_db():
+        async with AsyncSessionLocal() as db:
             try:
                 # Get user
                 result = await db.execute(
@@ -476,18 +764,18 @@ class AutoApplicationScheduler:
                     "remaining_quota": user.profile.max_daily_auto_applications
                 }
                 
-                result = await self._process_single_user(db, user_data)
+                async with self.user_slots:
+                    with auto_application_service.user_context():
+                        result = await self._process_single_user(db, user_data)
                 return result
                 
             except Exception as e:
                 self.logger.error(f"Error in manual job matching for user {user_id}: {str(e)}")
                 return {"error": str(e)}
-            finally:
-                await db.close()
     
     async def cleanup_expired_applications(self):
         """Clean up expired pending applications."""
-        async for db in get_db():
+        async with AsyncSessionLocal() as db:
             try:
                 # Update expired applications
                 await db.execute(
@@ -506,8 +794,6 @@ class AutoApplicationScheduler:
                 
             except Exception as e:
                 self.logger.error(f"Error cleaning up expired applications: {str(e)}")
-            finally:
-                await db.close()
 
 
 # Global scheduler instance
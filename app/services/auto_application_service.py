@@ -3,28 +3,53 @@ AI-Powered Auto-Application Service for TURN Platform
 Automatically matches user profiles with job opportunities and applies on user's behalf.
 """
 import asyncio
+import hashlib
 import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import cached_property, wraps
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, desc, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
-from app.core.database import get_db
+from app.core.database import get_db, savepoint
 from app.core.logger import logger
 from app.database.user_models import User, Profile
 from app.database.job_models import JobListing, JobApplication, JobMatch
 from app.database.cv_models import CV
 from app.database.auto_application_models import (
     PendingAutoApplication, AutoApplicationStatus, AutoApplicationLog,
-    JobMatchNotification, JobMatchNotificationType
+    JobMatchNotification, JobMatchNotificationType, GeneratedCoverLetter
 )
-from app.services.ai_service import ai_service, AICoachingType
-from app.services.job_matching_service import job_matching_service
+from app.services.ai_service import (
+    ai_service, AICoachingType, AI_UNAVAILABLE_RESPONSE, AI_FAILED_RESPONSE
+)
+from app.services.job_matching_service import job_matching_service, NUMPY_AVAILABLE
 from app.services.job_search_service import job_search_service
 from app.services.email_service import email_service
-from app.schemas.job_schemas import JobApplicationCreate
+from app.services.skill_index import skill_index
+from app.schemas.job_schemas import JobApplicationCreate, JobRecommendationResponse
+
+if NUMPY_AVAILABLE:
+    import numpy as np  # type: ignore
+    from app.services.batch_job_matcher import CandidateMatcher
+
+
+def _json_value(value: Any, default: Any) -> Any:
+    """Decode a JSON-encoded text column, falling back to ``default``."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return default
+    return value
 
 
 class AutoApplicationCriteria:
@@ -51,6 +76,91 @@ class AutoApplicationCriteria:
         self.salary_max = salary_max
         self.remote_only = remote_only
         self.experience_level_match = experience_level_match
+    
+    @classmethod
+    def from_profile(cls, profile: Profile, **overrides: Any) -> "AutoApplicationCriteria":
+        """
+        Build criteria from a user's profile settings.
+        
+        Location and skill preferences are read from the profile's
+        ``auto_apply_criteria`` JSON; ``excluded_companies`` is stored as a
+        JSON array string. Keyword arguments override the profile values.
+        """
+        extra = _json_value(profile.auto_apply_criteria, {})
+        if not isinstance(extra, dict):
+            extra = {}
+        values = {
+            "min_match_score": profile.min_match_score_threshold,
+            "max_daily_applications": profile.max_daily_auto_applications,
+            "preferred_locations": extra.get("preferred_locations") or [],
+            "required_skills": extra.get("required_skills") or [],
+            "excluded_companies": _json_value(profile.excluded_companies, []),
+            "salary_min": profile.salary_expectations_min,
+            "salary_max": profile.salary_expectations_max,
+            "remote_only": profile.auto_apply_only_remote,
+            "experience_level_match": True,
+        }
+        values.update(overrides)
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class JobCandidateSnapshot:
+    """
+    Immutable set of normalized job candidates shared by many users.
+    
+    Built once per scheduler cycle; the lowercased text used by the
+    per-user filters is precomputed so matching a user only filters and
+    scores. Jobs are shared between users and must not be mutated.
+    """
+    jobs: Tuple[Dict[str, Any], ...]
+    locations: Tuple[str, ...]
+    companies: Tuple[str, ...]
+    texts: Tuple[str, ...]  # title + description + location
+    created_at: datetime
+    
+    @classmethod
+    def from_jobs(cls, jobs: List[Dict[str, Any]]) -> "JobCandidateSnapshot":
+        locations = tuple((job.get("location") or "").lower() for job in jobs)
+        return cls(
+            jobs=tuple(jobs),
+            locations=locations,
+            companies=tuple((job.get("company") or "").lower() for job in jobs),
+            texts=tuple(
+                f"{job.get('title') or ''} {job.get('description') or ''} ".lower() + location
+                for job, location in zip(jobs, locations)
+            ),
+            created_at=datetime.utcnow()
+        )
+    
+    @cached_property
+    def matcher(self) -> "CandidateMatcher":
+        """Per-job features for batch matching (built on first use)."""
+        return CandidateMatcher(self.jobs, self.locations, self.companies, self.texts)
+
+
+@dataclass
+class UserContextCache:
+    """
+    User profiles and CVs loaded within one scope (a request or a user's cycle).
+    
+    Entries (including ``None`` for a missing profile or CV) are shared by
+    every helper in the scope and must not be mutated.
+    """
+    profiles: Dict[int, Optional[Dict[str, Any]]] = field(default_factory=dict)
+    cvs: Dict[int, Optional[Dict[str, Any]]] = field(default_factory=dict)
+
+
+_user_context: ContextVar[Optional[UserContextCache]] = ContextVar("auto_application_user_context", default=None)
+
+
+def _with_user_context(method):
+    """Run a service method inside ``user_context`` (joining an enclosing one)."""
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        with self.user_context():
+            return await method(self, *args, **kwargs)
+    return wrapper
 
 
 class AutoApplicationService:
@@ -61,12 +171,35 @@ class AutoApplicationService:
     
     def __init__(self):
         self.logger = logger
+    
+    @contextmanager
+    def user_context(self) -> Iterator[UserContextCache]:
+        """
+        Scope in which each user's profile and CV are loaded at most once.
+        
+        Nested scopes (and tasks started within the scope) share the
+        outermost cache, which is dropped when that scope exits.
+        """
+        cache = _user_context.get()
+        if cache is not None:
+            yield cache
+            return
         
+        cache = UserContextCache()
+        token = _user_context.set(cache)
+        try:
+            yield cache
+        finally:
+            _user_context.reset(token)
+    
+    @_with_user_context
     async def find_job_matches_for_user(
         self,
         db: AsyncSession,
         user_id: int,
-        criteria: AutoApplicationCriteria
+        criteria: AutoApplicationCriteria,
+        candidates: Optional[JobCandidateSnapshot] = None,
+        recommendations: Optional[List[JobRecommendationResponse]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find job matches for a user based on their profile and criteria.
@@ -75,6 +208,8 @@ class AutoApplicationService:
             db: Database session
             user_id: User ID to find matches for
             criteria: Auto-application criteria
+            candidates: Shared candidate snapshot (fetched from the feed when omitted)
+            recommendations: Matches already scored and filtered by ``match_users``
             
         Returns:
             List of matched jobs with scores and reasons
@@ -86,24 +221,26 @@ class AutoApplicationService:
                 self.logger.warning(f"No profile found for user {user_id}")
                 return []
             
-            # Fetch recent job postings
-            jobs = await self._fetch_fresh_job_postings(db, criteria)
-            if not jobs:
-                self.logger.info("No fresh job postings found")
-                return []
-            
-            # Get AI-powered job recommendations
-            recommendations = await job_matching_service.get_job_recommendations(
-                db=db,
-                user_id=user_id,
-                jobs=jobs,
-                limit=50  # Get more for filtering
-            )
+            prefiltered = recommendations is not None
+            if not prefiltered:
+                # Fetch recent job postings
+                jobs = await self._fetch_fresh_job_postings(db, criteria, candidates)
+                if not jobs:
+                    self.logger.info("No fresh job postings found")
+                    return []
+                
+                # Get AI-powered job recommendations
+                recommendations = await job_matching_service.get_job_recommendations(
+                    db=db,
+                    user_id=user_id,
+                    jobs=jobs,
+                    limit=50  # Get more for filtering
+                )
             
             # Filter recommendations based on criteria
             filtered_matches = []
             for rec in recommendations:
-                if await self._meets_auto_application_criteria(rec, criteria, user_profile):
+                if prefiltered or await self._meets_auto_application_criteria(rec, criteria, user_profile):
                     # Check if already applied
                     if not await self._has_already_applied(db, user_id, rec.job):
                         filtered_matches.append({
@@ -142,47 +279,104 @@ class AutoApplicationService:
         Returns:
             Generated application materials
         """
+        results = await self.generate_ai_applications(db, user_id, [job_data])
+        if isinstance(results[0], Exception):
+            raise results[0]
+        return results[0]
+    
+    @_with_user_context
+    async def generate_ai_applications(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        jobs: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Generate application materials for several jobs for one user.
+        
+        The user's profile and CV are loaded once. Cover letters already
+        generated for the same profile and job content are read from the
+        cache; the rest are generated concurrently (AI requests are limited
+        per provider by ai_service) and cached with the caller's commit.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            jobs: Job postings
+            
+        Returns:
+            Materials per job, in order; a failed job has its exception instead
+        """
         try:
             # Get user's latest CV and profile
             user_profile = await self._get_comprehensive_user_profile(db, user_id)
             cv_data = await self._get_user_cv_data(db, user_id)
             
+            if not user_profile:
+                raise ValueError("No profile found for user")
             if not cv_data:
                 raise ValueError("No CV found for user")
             
-            # Generate customized cover letter using AI
-            cover_letter = await self._generate_ai_cover_letter(
-                user_profile=user_profile,
-                cv_data=cv_data,
-                job_data=job_data
-            )
+            profile_hash = self._cover_letter_profile_hash(user_profile, cv_data)
+            keys = [f"{profile_hash}:{self._job_content_hash(job)}" for job in jobs]
+            cover_letters = await self._get_cached_cover_letters(db, keys)
             
-            # Generate CV customizations
-            cv_customizations = await self._generate_cv_customizations(
-                cv_data=cv_data,
-                job_data=job_data
-            )
-            
-            # Generate application summary
-            application_summary = await self._generate_application_summary(
-                user_profile=user_profile,
-                job_data=job_data,
-                cover_letter=cover_letter
-            )
-            
-            return {
-                "cover_letter": cover_letter,
-                "cv_customizations": cv_customizations,
-                "application_summary": application_summary,
-                "generated_at": datetime.utcnow().isoformat(),
-                "confidence_score": self._calculate_application_confidence(
-                    user_profile, job_data
-                )
-            }
+            # One AI request per distinct missing letter
+            pending = {}
+            for key, job in zip(keys, jobs):
+                if key not in cover_letters and key not in pending:
+                    pending[key] = self._request_ai_cover_letter(user_profile, cv_data, job)
+            generated = dict(zip(pending, await asyncio.gather(*pending.values())))
             
+            new_letters = {key: letter for key, letter in generated.items() if letter}
+            cover_letters.update(new_letters)
+            await self._cache_cover_letters(db, new_letters)
         except Exception as e:
             self.logger.error(f"Error generating AI application: {str(e)}")
             raise
+        
+        results = []
+        for key, job in zip(keys, jobs):
+            try:
+                cover_letter = cover_letters.get(key) or self._get_fallback_cover_letter(user_profile, job)
+                results.append(await self._assemble_application_materials(
+                    user_profile, cv_data, job, cover_letter
+                ))
+            except Exception as e:
+                self.logger.error(f"Error generating AI application: {str(e)}")
+                results.append(e)
+        return results
+    
+    async def _assemble_application_materials(
+        self,
+        user_profile: Dict[str, Any],
+        cv_data: Dict[str, Any],
+        job_data: Dict[str, Any],
+        cover_letter: str
+    ) -> Dict[str, Any]:
+        """Application materials for one job around its cover letter."""
+        # Generate CV customizations
+        cv_customizations = await self._generate_cv_customizations(
+            cv_data=cv_data,
+            job_data=job_data
+        )
+        
+        # Generate application summary
+        application_summary = await self._generate_application_summary(
+            user_profile=user_profile,
+            job_data=job_data,
+            cover_letter=cover_letter
+        )
+        
+        return {
+            "cover_letter": cover_letter,
+            "cv_customizations": cv_customizations,
+            "application_summary": application_summary,
+            "generated_at": datetime.utcnow().isoformat(),
+            "confidence_score": self._calculate_application_confidence(
+                user_profile, job_data
+            )
+        }
     
     async def submit_auto_application(
         self,
@@ -569,7 +763,19 @@ class AutoApplicationService:
         db: AsyncSession,
         user_id: int
     ) -> Optional[Dict[str, Any]]:
-        """Get comprehensive user profile for matching."""
+        """Get comprehensive user profile for matching (memoized within ``user_context``)."""
+        cache = _user_context.get()
+        if cache is None:
+            return await self._load_user_profile(db, user_id)
+        if user_id not in cache.profiles:
+            cache.profiles[user_id] = await self._load_user_profile(db, user_id)
+        return cache.profiles[user_id]
+    
+    async def _load_user_profile(
+        self,
+        db: AsyncSession,
+        user_id: int
+    ) -> Optional[Dict[str, Any]]:
         result = await db.execute(
             select(User)
             .options(selectinload(User.profile).selectinload(Profile.skills))
@@ -596,32 +802,117 @@ class AutoApplicationService:
             "bio": profile.bio
         }
     
+    async def match_users(
+        self,
+        db: AsyncSession,
+        users: List[Tuple[User, AutoApplicationCriteria]],
+        candidates: JobCandidateSnapshot,
+        limit: int = 50
+    ) -> Optional[Dict[int, List[JobRecommendationResponse]]]:
+        """
+        Match a batch of users against a candidate snapshot in one pass.
+        
+        All users are scored against all candidates in a single matrix
+        product; each user's criteria are applied as masks and the top
+        ``limit`` jobs per user are kept.
+        
+        Args:
+            db: Database session
+            users: Users (with profile loaded) and their criteria
+            candidates: Shared candidate snapshot
+            limit: Maximum recommendations per user
+            
+        Returns:
+            Recommendations per user id (users without a profile text are
+            omitted), or None when batch matching is unavailable
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+        if not users or not candidates.jobs:
+            return {}
+        
+        profile_texts = await job_matching_service.get_user_profile_texts(
+            db, [user.id for user, _ in users]
+        )
+        users = [(user, criteria) for user, criteria in users if profile_texts.get(user.id, "").strip()]
+        if not users:
+            return {}
+        
+        jobs = list(candidates.jobs)
+        scores, method = await job_matching_service.score_profiles(
+            [profile_texts[user.id] for user, _ in users],
+            jobs,
+            user_ids=[user.id for user, _ in users]
+        )
+        if scores is None:
+            return None
+        
+        matcher = candidates.matcher
+        masks = np.stack([
+            matcher.mask(criteria, user.profile.years_of_experience if user.profile else None)
+            for user, criteria in users
+        ])
+        min_scores = np.array([criteria.min_match_score for _, criteria in users], dtype=np.float32)
+        top_matches = matcher.top_matches(scores, masks, min_scores, limit)
+        
+        results = {}
+        for (user, _), matches in zip(users, top_matches):
+            profile_text = profile_texts[user.id]
+            results[user.id] = [
+                JobRecommendationResponse(
+                    job=jobs[j],
+                    similarity_score=min(max(score, 0.0), 1.0),
+                    match_reasons=job_matching_service._generate_match_reasons(profile_text, jobs[j], score),
+                    matching_method=method
+                )
+                for j, score in matches
+            ]
+        return results
+    
+    async def build_candidate_snapshot(self) -> JobCandidateSnapshot:
+        """
+        Build the job candidate snapshot for one matching cycle.
+        
+        Jobs come from the shared feed; their skill features and embeddings
+        are indexed here (a no-op for jobs already indexed at ingestion) so
+        per-user matching never encodes job text.
+        """
+        jobs = await job_search_service.fetch_normalized_pm_jobs()
+        skill_index.index_jobs(jobs)
+        await job_matching_service.index_jobs(jobs)
+        return JobCandidateSnapshot.from_jobs(jobs)
+    
     async def _fetch_fresh_job_postings(
         self,
         db: AsyncSession,
-        criteria: AutoApplicationCriteria
+        criteria: AutoApplicationCriteria,
+        candidates: Optional[JobCandidateSnapshot] = None
     ) -> List[Dict[str, Any]]:
-        """Fetch fresh job postings from external sources."""
+        """Filter job candidates by the user's basic criteria."""
         try:
-            # Get fresh jobs from external APIs
-            fresh_jobs = await job_search_service.fetch_all_pm_jobs()
-            normalized_jobs = job_search_service.normalize_job_data(fresh_jobs)
+            if candidates is None:
+                # Normalized jobs from the shared feed
+                candidates = JobCandidateSnapshot.from_jobs(
+                    await job_search_service.fetch_normalized_pm_jobs()
+                )
+            
+            preferred_locations = [loc.lower() for loc in criteria.preferred_locations]
+            excluded_companies = [exc.lower() for exc in criteria.excluded_companies]
             
             # Filter based on basic criteria
             filtered_jobs = []
-            for job in normalized_jobs:
+            for job, job_location, company, job_text in zip(
+                candidates.jobs, candidates.locations, candidates.companies, candidates.texts
+            ):
                 # Location filter
-                if criteria.preferred_locations:
-                    job_location = job.get("location", "").lower()
-                    if not any(loc.lower() in job_location for loc in criteria.preferred_locations):
+                if preferred_locations:
+                    if not any(loc in job_location for loc in preferred_locations):
                         if not (criteria.remote_only and "remote" in job_location):
                             continue
                 
                 # Remote filter
-                if criteria.remote_only:
-                    job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('location', '')}".lower()
-                    if "remote" not in job_text:
-                        continue
+                if criteria.remote_only and "remote" not in job_text:
+                    continue
                 
                 # Salary filter
                 if criteria.salary_min and job.get("salary_min"):
@@ -629,14 +920,14 @@ class AutoApplicationService:
                         continue
                 
                 # Excluded companies
-                if criteria.excluded_companies:
-                    company = job.get("company", "").lower()
-                    if any(exc.lower() in company for exc in criteria.excluded_companies):
-                        continue
+                if excluded_companies and any(exc in company for exc in excluded_companies):
+                    continue
                 
                 filtered_jobs.append(job)
+                if len(filtered_jobs) >= 100:  # Limit for performance
+                    break
             
-            return filtered_jobs[:100]  # Limit for performance
+            return filtered_jobs
             
         except Exception as e:
             self.logger.error(f"Error fetching fresh job postings: {str(e)}")
@@ -657,9 +948,8 @@ class AutoApplicationService:
         
         # Check required skills
         if criteria.required_skills:
-            job_text = f"{job.get('title', '')} {job.get('description', '')}".lower()
-            required_found = sum(1 for skill in criteria.required_skills 
-                               if skill.lower() in job_text)
+            job_features = skill_index.job_features(job)
+            required_found = len(skill_index.matching_skills(criteria.required_skills, job_features))
             if required_found < len(criteria.required_skills) * 0.7:  # 70% of required skills
                 return False
         
@@ -721,7 +1011,7 @@ class AutoApplicationService:
                 score += 0.1
         
         # Experience level match
-        user_exp = user_profile.get("years_of_experience", 0)
+        user_exp = user_profile.get("years_of_experience") or 0
         if 2 <= user_exp <= 8:  # Mid-level gets boost for most jobs
             score += 0.05
         
@@ -776,13 +1066,25 @@ class AutoApplicationService:
         db: AsyncSession,
         user_id: int
     ) -> Optional[Dict[str, Any]]:
-        """Get user's CV data."""
+        """Get user's CV data (memoized within ``user_context``)."""
+        cache = _user_context.get()
+        if cache is None:
+            return await self._load_user_cv_data(db, user_id)
+        if user_id not in cache.cvs:
+            cache.cvs[user_id] = await self._load_user_cv_data(db, user_id)
+        return cache.cvs[user_id]
+    
+    async def _load_user_cv_data(
+        self,
+        db: AsyncSession,
+        user_id: int
+    ) -> Optional[Dict[str, Any]]:
         result = await db.execute(
             select(CV)
             .options(
-                selectinload(CV.experiences),
-                selectinload(CV.education),
-                selectinload(CV.skills)
+                selectinload(CV.work_experiences),
+                selectinload(CV.educations),
+                selectinload(CV.cv_skills)
             )
             .where(and_(CV.user_id == user_id, CV.is_default == True))
         )
@@ -794,7 +1096,7 @@ class AutoApplicationService:
         return {
             "id": cv.id,
             "title": cv.title,
-            "summary": cv.summary,
+            "summary": cv.professional_summary,
             "experiences": [
                 {
                     "job_title": exp.job_title,
@@ -803,18 +1105,18 @@ class AutoApplicationService:
                     "start_date": exp.start_date.isoformat() if exp.start_date else None,
                     "end_date": exp.end_date.isoformat() if exp.end_date else None
                 }
-                for exp in cv.experiences
+                for exp in cv.work_experiences
             ],
             "education": [
                 {
-                    "degree": edu.degree,
+                    "degree": edu.degree_type,
                     "field_of_study": edu.field_of_study,
-                    "institution": edu.institution,
-                    "graduation_date": edu.graduation_date.isoformat() if edu.graduation_date else None
+                    "institution": edu.institution_name,
+                    "graduation_date": edu.end_date.isoformat() if edu.end_date else None
                 }
-                for edu in cv.education
+                for edu in cv.educations
             ],
-            "skills": [skill.skill_name for skill in cv.skills]
+            "skills": [skill.skill_name for skill in cv.cv_skills]
         }
     
     async def _generate_ai_cover_letter(
@@ -824,6 +1126,16 @@ class AutoApplicationService:
         job_data: Dict[str, Any]
     ) -> str:
         """Generate AI-powered cover letter."""
+        cover_letter = await self._request_ai_cover_letter(user_profile, cv_data, job_data)
+        return cover_letter or self._get_fallback_cover_letter(user_profile, job_data)
+    
+    async def _request_ai_cover_letter(
+        self,
+        user_profile: Dict[str, Any],
+        cv_data: Dict[str, Any],
+        job_data: Dict[str, Any]
+    ) -> Optional[str]:
+        """Ask the AI provider for a cover letter; None if no usable letter came back."""
         prompt = f"""
         Generate a professional cover letter for this job application:
         
@@ -860,11 +1172,58 @@ class AutoApplicationService:
                 user_context=user_profile
             )
             
-            return response.get("response", "").strip()
+            cover_letter = (response.get("response") or "").strip()
+            if cover_letter in ("", AI_UNAVAILABLE_RESPONSE, AI_FAILED_RESPONSE):
+                self.logger.warning(f"No AI cover letter for {job_data.get('title')} at {job_data.get('company')}")
+                return None
+            return cover_letter
             
         except Exception as e:
             self.logger.error(f"Error generating AI cover letter: {str(e)}")
-            return self._get_fallback_cover_letter(user_profile, job_data)
+            return None
+    
+    @staticmethod
+    def _cover_letter_profile_hash(user_profile: Dict[str, Any], cv_data: Dict[str, Any]) -> str:
+        """Hash of the profile and CV fields that go into a cover letter prompt."""
+        experiences = cv_data.get("experiences") or [{}]
+        fields = {
+            "name": user_profile.get("name"),
+            "current_job_title": user_profile.get("current_job_title"),
+            "years_of_experience": user_profile.get("years_of_experience"),
+            "skills": (user_profile.get("skills") or [])[:5],
+            "career_goals": user_profile.get("career_goals"),
+            "recent_experience": experiences[0].get("description"),
+        }
+        return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _job_content_hash(job_data: Dict[str, Any]) -> str:
+        """Hash of the job fields that go into a cover letter prompt."""
+        fields = [job_data.get("title"), job_data.get("company"), (job_data.get("description") or "")[:500]]
+        return hashlib.sha1(json.dumps(fields).encode("utf-8")).hexdigest()
+    
+    async def _get_cached_cover_letters(self, db: AsyncSession, keys: List[str]) -> Dict[str, str]:
+        """Previously generated cover letters for the given cache keys."""
+        result = await db.execute(
+            select(GeneratedCoverLetter.cache_key, GeneratedCoverLetter.cover_letter)
+            .where(GeneratedCoverLetter.cache_key.in_(set(keys)))
+        )
+        return dict(result.all())
+    
+    async def _cache_cover_letters(self, db: AsyncSession, cover_letters: Dict[str, str]) -> None:
+        """Store generated cover letters (committed with the caller's transaction)."""
+        if not cover_letters:
+            return
+        try:
+            async with savepoint(db):
+                db.add_all(
+                    GeneratedCoverLetter(cache_key=key, cover_letter=letter)
+                    for key, letter in cover_letters.items()
+                )
+                await db.flush()
+        except IntegrityError:
+            # Cached concurrently by another worker; theirs is as good as ours
+            pass
     
     async def _generate_cv_customizations(
         self,
@@ -872,17 +1231,11 @@ class AutoApplicationService:
         job_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate CV customizations for specific job."""
-        # Extract key requirements from job description
-        job_description = job_data.get("description", "").lower()
         job_title = job_data.get("title", "").lower()
         
         # Suggest skills to highlight
         user_skills = [skill.lower() for skill in cv_data.get("skills", [])]
-        relevant_skills = []
-        
-        for skill in user_skills:
-            if skill in job_description or skill in job_title:
-                relevant_skills.append(skill)
+        relevant_skills = skill_index.matching_skills(user_skills, skill_index.job_features(job_data))
         
         # Suggest experience points to emphasize
         experiences = cv_data.get("experiences", [])
@@ -933,14 +1286,14 @@ class AutoApplicationService:
         confidence = 0.5  # Base confidence
         
         # Experience match
-        user_exp = user_profile.get("years_of_experience", 0)
+        user_exp = user_profile.get("years_of_experience") or 0
         if 2 <= user_exp <= 10:
             confidence += 0.2
         
         # Skills match
-        user_skills = [skill.lower() for skill in user_profile.get("skills", [])]
-        job_text = f"{job_data.get('title', '')} {job_data.get('description', '')}".lower()
-        skill_matches = sum(1 for skill in user_skills if skill in job_text)
+        skill_matches = len(skill_index.matching_skills(
+            user_profile.get("skills", []), skill_index.job_features(job_data)
+        ))
         confidence += min(skill_matches * 0.1, 0.3)
         
         return min(confidence, 1.0)
@@ -0,0 +1,168 @@
+"""
+Cross-user job matching over a shared candidate set.
+
+A page of users is scored against every candidate job in one matrix product
+(see ``JobMatchingService.score_profiles``). Each user's auto-application
+criteria become a boolean mask over the job axis, built from per-job
+features computed once per candidate set, and the per-user top-k is taken
+with ``argpartition`` instead of sorting every row.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.skill_index import skill_index
+
+# Same words AutoApplicationService._meets_auto_application_criteria looks for
+SENIOR_WORDS = ("senior", "lead", "principal")
+JUNIOR_WORDS = ("junior", "entry", "intern")
+
+# Share of a user's required skills a job must mention
+REQUIRED_SKILL_RATIO = 0.7
+
+
+class CandidateMatcher:
+    """Per-job features for one candidate set, plus criteria masks and top-k selection."""
+
+    def __init__(
+        self,
+        jobs: Sequence[Dict[str, Any]],
+        locations: Sequence[str],
+        companies: Sequence[str],
+        texts: Sequence[str],
+    ):
+        self.size = len(jobs)
+        self._locations = locations
+        self._companies = companies
+        descriptions = [(job.get("description") or "").lower() for job in jobs]
+
+        self.remote = np.fromiter(("remote" in text for text in texts), bool, self.size)
+        self.remote_location = np.fromiter(("remote" in loc for loc in locations), bool, self.size)
+        self.senior = np.fromiter(
+            (any(word in d for word in SENIOR_WORDS) for d in descriptions), bool, self.size
+        )
+        self.junior = np.fromiter(
+            (any(word in d for word in JUNIOR_WORDS) for d in descriptions), bool, self.size
+        )
+        # 0 means the job doesn't state a salary (never filtered out)
+        self.salary_min = np.fromiter(
+            (float(job.get("salary_min") or 0) for job in jobs), np.float64, self.size
+        )
+        self._features = [skill_index.job_features(job) for job in jobs]
+
+        # Masks per search term / skill, shared by every user asking for it
+        self._substring_masks: Dict[Tuple[str, str], np.ndarray] = {}
+        self._skill_masks: Dict[str, np.ndarray] = {}
+
+    def _substring_mask(self, field: str, term: str) -> np.ndarray:
+        key = (field, term.lower())
+        mask = self._substring_masks.get(key)
+        if mask is None:
+            values = self._locations if field == "location" else self._companies
+            mask = np.fromiter((key[1] in value for value in values), bool, self.size)
+            self._substring_masks[key] = mask
+        return mask
+
+    def _any_substring(self, field: str, terms: List[str]) -> np.ndarray:
+        mask = np.zeros(self.size, bool)
+        for term in terms:
+            mask |= self._substring_mask(field, term)
+        return mask
+
+    def _skill_mask(self, skill: str) -> np.ndarray:
+        key = skill.lower()
+        mask = self._skill_masks.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (bool(skill_index.matching_skills([skill], features)) for features in self._features),
+                bool,
+                self.size,
+            )
+            self._skill_masks[key] = mask
+        return mask
+
+    def mask(self, criteria: Any, years_of_experience: Optional[int]) -> np.ndarray:
+        """
+        Jobs that pass a user's AutoApplicationCriteria (except the score threshold).
+
+        Mirrors the filters in ``_fetch_fresh_job_postings`` and
+        ``_meets_auto_application_criteria``.
+        """
+        mask = np.ones(self.size, bool)
+
+        if criteria.preferred_locations:
+            located = self._any_substring("location", criteria.preferred_locations)
+            if criteria.remote_only:
+                located |= self.remote_location
+            mask &= located
+
+        if criteria.remote_only:
+            mask &= self.remote
+
+        if criteria.salary_min:
+            mask &= (self.salary_min == 0) | (self.salary_min >= criteria.salary_min)
+
+        if criteria.excluded_companies:
+            mask &= ~self._any_substring("company", criteria.excluded_companies)
+
+        if criteria.required_skills:
+            found = np.zeros(self.size, np.int32)
+            for skill in criteria.required_skills:
+                found += self._skill_mask(skill)
+            mask &= found >= len(criteria.required_skills) * REQUIRED_SKILL_RATIO
+
+        if criteria.experience_level_match:
+            experience = years_of_experience or 0
+            if experience < 2:
+                mask &= ~self.senior
+            elif experience > 8:
+                mask &= ~self.junior
+
+        return mask
+
+    @staticmethod
+    def top_matches(
+        scores: np.ndarray,
+        masks: np.ndarray,
+        min_scores: np.ndarray,
+        limit: int,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Per-user best jobs among those passing the mask and score threshold.
+
+        Args:
+            scores: (users x jobs) similarity matrix; NaN for unscored jobs
+            masks: (users x jobs) criteria masks
+            min_scores: Per-user minimum similarity
+            limit: Maximum matches per user
+
+        Returns:
+            For each user, (job index, score) pairs, best first
+        """
+        users, jobs = scores.shape
+        if users == 0 or jobs == 0 or limit <= 0:
+            return [[] for _ in range(users)]
+
+        # NaN >= threshold is False, so unscored jobs drop out here too
+        with np.errstate(invalid="ignore"):
+            eligible = masks & (scores >= min_scores[:, None])
+        masked = np.where(eligible, scores, -np.inf)
+
+        k = min(limit, jobs)
+        if k < jobs:
+            candidates = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(jobs), (users, jobs))
+        candidate_scores = np.take_along_axis(masked, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        return [
+            [
+                (int(job), float(score))
+                for job, score in zip(row_jobs, row_scores)
+                if score != -np.inf
+            ]
+            for row_jobs, row_scores in zip(candidates, candidate_scores)
+        ]
@@ -6,14 +6,32 @@ and extracts key hiring contact information (CEO, HR, founders).
 import aiohttp
 import asyncio
 import re
+import time
+from dataclasses import replace
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import json
 
+from app.core.config import settings
+from app.core.http_client import RETRY_STATUSES, http_clients
 from app.core.logger import logger
+from app.core.throttle import KeyedSemaphore
 from app.services.ai_service import ai_service, AICoachingType
+from app.services.crawl_cache import CachedPage, CrawlCache
+
+USER_AGENT = 'TURN-Job-Matcher-Bot/1.0'
+
+# Politeness: requests in flight per company domain (the pooled "scanner"
+# client also caps connections overall and per host)
+REQUESTS_PER_DOMAIN = 4
+
+# Companies scanned at once by scan_multiple_companies
+SCAN_CONCURRENCY = 8
+
+# Career-looking homepage links probed when no common pattern exists
+MAX_LINK_PROBES = 10
 
 
 class CompanyWebsiteScanner:
@@ -27,7 +45,11 @@ class CompanyWebsiteScanner:
     
     def __init__(self):
         self.logger = logger
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.cache = CrawlCache(settings.company_scan_cache_dir)
+        self.domain_slots = KeyedSemaphore(REQUESTS_PER_DOMAIN)
+        
+        # Page fetches in progress, shared by concurrent requests for the same URL
+        self._inflight: Dict[str, asyncio.Future] = {}
         
         # Common career page patterns
         self.career_page_patterns = [
@@ -51,16 +73,26 @@ class CompanyWebsiteScanner:
         ]
     
     async def __aenter__(self):
-        """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            headers={'User-Agent': 'TURN-Job-Matcher-Bot/1.0'}
-        )
+        """
+        Async context manager entry.
+        
+        Requests go through the shared pooled "scanner" client (closed at
+        app shutdown), so concurrent ``async with`` blocks are safe.
+        """
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (the pooled session stays open)."""
+        return None
+    
+    @property
+    def http(self):
+        return http_clients.get("scanner")
+    
+    @staticmethod
+    def _domain(url: str) -> str:
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith('www.') else host
     
     async def scan_company_website(
         self,
@@ -84,34 +116,21 @@ class CompanyWebsiteScanner:
             - is_startup: Whether company appears to be startup/SME
             - company_size_estimate: Estimated company size
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={'User-Agent': 'TURN-Job-Matcher-Bot/1.0'}
-            )
-        
         try:
             # Normalize URL
             if not company_url.startswith(('http://', 'https://')):
                 company_url = f'https://{company_url}'
             
-            # 1. Find career page
-            career_page_url = await self._find_career_page(company_url)
-            
-            # 2. Scrape job listings from career page
-            job_listings = []
-            entry_level_jobs = []
-            if career_page_url:
-                jobs = await self._scrape_job_listings(career_page_url, company_name)
-                job_listings = jobs.get('all_jobs', [])
-                entry_level_jobs = jobs.get('entry_level_jobs', [])
-            
-            # 3. Find contact information
-            contacts = await self._find_company_contacts(company_url, company_name)
-            
-            # 4. Determine if startup/SME
-            is_startup, company_size = await self._classify_company_size(
-                company_url, company_name
+            # 1-2. Career page and its job listings, 3. contact information and
+            # 4. startup/SME classification run concurrently (the per-domain
+            # limit still applies to their requests)
+            (career_page_url, jobs), contacts, (is_startup, company_size) = await asyncio.gather(
+                self._find_job_listings(company_url, company_name),
+                self._find_company_contacts(company_url, company_name),
+                self._classify_company_size(company_url, company_name)
             )
+            job_listings = jobs.get('all_jobs', [])
+            entry_level_jobs = jobs.get('entry_level_jobs', [])
             
             return {
                 'company_name': company_name,
@@ -141,46 +160,141 @@ class CompanyWebsiteScanner:
                 'scan_timestamp': datetime.utcnow().isoformat()
             }
     
+    async def _find_job_listings(
+        self,
+        company_url: str,
+        company_name: str
+    ) -> Tuple[Optional[str], Dict[str, List[Dict[str, Any]]]]:
+        """Find the career page and scrape its job listings."""
+        career_page_url = await self._find_career_page(company_url)
+        if not career_page_url:
+            return None, {'all_jobs': [], 'entry_level_jobs': []}
+        return career_page_url, await self._scrape_job_listings(career_page_url, company_name)
+    
     async def _find_career_page(self, base_url: str) -> Optional[str]:
-        """Find the careers/jobs page URL."""
+        """Find the careers/jobs page URL (remembered per domain)."""
+        domain = self._domain(base_url)
+        known, career_page_url = await asyncio.to_thread(self.cache.career_page, domain)
+        if known:
+            return career_page_url
+        
         try:
             # Try common career page patterns
-            for pattern in self.career_page_patterns:
-                test_url = urljoin(base_url, pattern)
-                if await self._url_exists(test_url):
-                    return test_url
-            
-            # Fallback: scrape homepage for career links
-            async with self.session.get(base_url, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
+            career_page_url = await self._first_existing_url([
+                urljoin(base_url, pattern) for pattern in self.career_page_patterns
+            ])
+            
+            html = None
+            if not career_page_url:
+                # Fallback: scrape homepage for career links
+                html = await self._fetch_page(base_url, timeout=10)
+                if html is not None:
                     soup = BeautifulSoup(html, 'html.parser')
                     
                     # Look for links with career-related text
+                    candidates = []
                     for link in soup.find_all('a', href=True):
                         link_text = link.get_text().lower()
                         link_href = link['href'].lower()
                         
                         if any(keyword in link_text or keyword in link_href 
                                for keyword in ['career', 'job', 'hiring', 'join', 'team']):
-                            full_url = urljoin(base_url, link['href'])
-                            if await self._url_exists(full_url):
-                                return full_url
-            
-            return None
+                            candidates.append(urljoin(base_url, link['href']))
+                    
+                    career_page_url = await self._first_existing_url(candidates[:MAX_LINK_PROBES])
             
         except Exception as e:
             self.logger.error(f"Error finding career page for {base_url}: {str(e)}")
             return None
+        
+        # "No career page" is only remembered when the site itself answered
+        if career_page_url or html is not None:
+            await asyncio.to_thread(self.cache.remember_career_page, domain, career_page_url)
+        return career_page_url
+    
+    async def _first_existing_url(self, urls: List[str]) -> Optional[str]:
+        """
+        Probe URLs concurrently and return the first that exists.
+        
+        Outstanding probes are cancelled as soon as one succeeds; among
+        probes finishing together, the earlier URL in ``urls`` wins.
+        """
+        probes = {
+            asyncio.create_task(self._url_exists(url)): url
+            for url in dict.fromkeys(urls)
+        }
+        pending = set(probes)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for probe in probes:
+                    if probe in done and probe.result():
+                        return probes[probe]
+            return None
+        finally:
+            for probe in pending:
+                probe.cancel()
     
     async def _url_exists(self, url: str) -> bool:
         """Check if URL exists and returns 200."""
         try:
-            async with self.session.head(url, timeout=5, allow_redirects=True) as response:
-                return response.status == 200
-        except:
+            async with self.domain_slots.slot(self._domain(url)):
+                async with self.http.head(
+                    url,
+                    headers={'User-Agent': USER_AGENT},
+                    timeout=aiohttp.ClientTimeout(total=5),
+                    allow_redirects=True
+                ) as response:
+                    return response.status == 200
+        except Exception:
             return False
     
+    async def _fetch_page(self, url: str, timeout: float = 10) -> Optional[str]:
+        """
+        GET a page through the crawl cache.
+        
+        Returns the HTML when the page answers 200, otherwise None. Fresh
+        cached pages are served without a request, stale ones are
+        revalidated, and concurrent fetches of one URL share a request.
+        """
+        fetch = self._inflight.get(url)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_page_uncached(url, timeout))
+            self._inflight[url] = fetch
+            fetch.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # A cancelled caller must not cancel the fetch other callers wait on
+        return await asyncio.shield(fetch)
+    
+    async def _fetch_page_uncached(self, url: str, timeout: float) -> Optional[str]:
+        cached = await asyncio.to_thread(self.cache.get_page, url)
+        if cached is not None and cached.fresh:
+            return cached.body if cached.status == 200 else None
+        
+        headers = {'User-Agent': USER_AGENT}
+        if cached is not None:
+            headers.update(cached.validators())
+        
+        async with self.domain_slots.slot(self._domain(url)):
+            async with self.http.get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 304 and cached is not None:
+                    page = replace(cached, fetched_at=time.time())
+                else:
+                    page = CachedPage(
+                        url=url,
+                        status=response.status,
+                        body=await response.text() if response.status == 200 else None,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                        fetched_at=time.time()
+                    )
+        
+        # Transient failures are not cached
+        if page.status != 304 and page.status not in RETRY_STATUSES:
+            await asyncio.to_thread(self.cache.put_page, page)
+        return page.body if page.status == 200 else None
+    
     async def _scrape_job_listings(
         self,
         career_page_url: str,
@@ -191,43 +305,42 @@ class CompanyWebsiteScanner:
         entry_level_jobs = []
         
         try:
-            async with self.session.get(career_page_url, timeout=15) as response:
-                if response.status != 200:
-                    return {'all_jobs': [], 'entry_level_jobs': []}
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Common job listing selectors
-                job_selectors = [
-                    ('div', {'class': re.compile(r'job|position|opening|role|listing')}),
-                    ('li', {'class': re.compile(r'job|position|opening|role')}),
-                    ('article', {'class': re.compile(r'job|position')}),
-                    ('a', {'class': re.compile(r'job|position')})
-                ]
-                
-                job_elements = []
-                for tag, attrs in job_selectors:
-                    found = soup.find_all(tag, attrs)
-                    if found:
-                        job_elements.extend(found)
-                
-                # Extract job information
-                for element in job_elements[:50]:  # Limit to 50 jobs
-                    job_data = self._extract_job_data(element, career_page_url, company_name)
-                    if job_data:
-                        all_jobs.append(job_data)
-                        
-                        # Check if entry-level
-                        if self._is_entry_level_job(job_data):
-                            entry_level_jobs.append(job_data)
-                
-                # If no structured listings found, use AI to parse
-                if not all_jobs:
-                    all_jobs, entry_level_jobs = await self._ai_parse_job_page(
-                        html, company_name
-                    )
-                
+            html = await self._fetch_page(career_page_url, timeout=15)
+            if html is None:
+                return {'all_jobs': [], 'entry_level_jobs': []}
+            
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            # Common job listing selectors
+            job_selectors = [
+                ('div', {'class': re.compile(r'job|position|opening|role|listing')}),
+                ('li', {'class': re.compile(r'job|position|opening|role')}),
+                ('article', {'class': re.compile(r'job|position')}),
+                ('a', {'class': re.compile(r'job|position')})
+            ]
+            
+            job_elements = []
+            for tag, attrs in job_selectors:
+                found = soup.find_all(tag, attrs)
+                if found:
+                    job_elements.extend(found)
+            
+            # Extract job information
+            for element in job_elements[:50]:  # Limit to 50 jobs
+                job_data = self._extract_job_data(element, career_page_url, company_name)
+                if job_data:
+                    all_jobs.append(job_data)
+                    
+                    # Check if entry-level
+                    if self._is_entry_level_job(job_data):
+                        entry_level_jobs.append(job_data)
+            
+            # If no structured listings found, use AI to parse
+            if not all_jobs:
+                all_jobs, entry_level_jobs = await self._ai_parse_job_page(
+                    html, company_name
+                )
+            
             return {
                 'all_jobs': all_jobs,
                 'entry_level_jobs': entry_level_jobs
@@ -441,50 +554,49 @@ class CompanyWebsiteScanner:
         for pattern in about_patterns:
             try:
                 page_url = urljoin(base_url, pattern)
-                async with self.session.get(page_url, timeout=10) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        text = soup.get_text().lower()
-                        
-                        # Look for CEO/Founder mentions with emails
-                        ceo_patterns = [
-                            r'ceo[:\s]+([a-zA-Z\s]+)',
-                            r'chief executive officer[:\s]+([a-zA-Z\s]+)',
-                            r'founder[:\s]+([a-zA-Z\s]+)',
-                            r'co-founder[:\s]+([a-zA-Z\s]+)'
-                        ]
-                        
-                        for pattern_regex in ceo_patterns:
-                            match = re.search(pattern_regex, text, re.IGNORECASE)
-                            if match:
-                                name = match.group(1).strip()
-                                # Try to find associated email
-                                email_match = re.search(
-                                    rf'{re.escape(name)}[\s\S]{{0,100}}([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{{2,}})',
-                                    text
-                                )
-                                if email_match:
-                                    contacts['ceo'] = {
-                                        'name': name,
-                                        'email': email_match.group(1),
-                                        'title': 'CEO/Founder'
-                                    }
-                                    break
-                        
-                        # Look for HR contacts
-                        hr_emails = re.findall(
-                            r'(hr@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}|careers@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}|recruiting@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                            text
-                        )
-                        if hr_emails:
-                            contacts['hr'] = {
-                                'email': hr_emails[0],
-                                'title': 'HR/Recruiting'
-                            }
-                        
-                        if contacts.get('ceo') and contacts.get('hr'):
-                            break
+                html = await self._fetch_page(page_url, timeout=10)
+                if html is not None:
+                    soup = BeautifulSoup(html, 'html.parser')
+                    text = soup.get_text().lower()
+                    
+                    # Look for CEO/Founder mentions with emails
+                    ceo_patterns = [
+                        r'ceo[:\s]+([a-zA-Z\s]+)',
+                        r'chief executive officer[:\s]+([a-zA-Z\s]+)',
+                        r'founder[:\s]+([a-zA-Z\s]+)',
+                        r'co-founder[:\s]+([a-zA-Z\s]+)'
+                    ]
+                    
+                    for pattern_regex in ceo_patterns:
+                        match = re.search(pattern_regex, text, re.IGNORECASE)
+                        if match:
+                            name = match.group(1).strip()
+                            # Try to find associated email
+                            email_match = re.search(
+                                rf'{re.escape(name)}[\s\S]{{0,100}}([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{{2,}})',
+                                text
+                            )
+                            if email_match:
+                                contacts['ceo'] = {
+                                    'name': name,
+                                    'email': email_match.group(1),
+                                    'title': 'CEO/Founder'
+                                }
+                                break
+                    
+                    # Look for HR contacts
+                    hr_emails = re.findall(
+                        r'(hr@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}|careers@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}|recruiting@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+                        text
+                    )
+                    if hr_emails:
+                        contacts['hr'] = {
+                            'email': hr_emails[0],
+                            'title': 'HR/Recruiting'
+                        }
+                    
+                    if contacts.get('ceo') and contacts.get('hr'):
+                        break
                         
             except Exception as e:
                 continue
@@ -500,30 +612,29 @@ class CompanyWebsiteScanner:
         for pattern in contact_patterns:
             try:
                 page_url = urljoin(base_url, pattern)
-                async with self.session.get(page_url, timeout=10) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        text = soup.get_text()
-                        
-                        # Extract all emails
-                        emails = re.findall(
-                            r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-                            text
-                        )
-                        
-                        # Categorize emails
-                        for email in emails:
-                            email_lower = email.lower()
-                            if any(keyword in email_lower for keyword in ['hr', 'careers', 'recruiting', 'jobs']):
-                                contact_info['hr_email'] = email
-                            elif any(keyword in email_lower for keyword in ['ceo', 'founder', 'admin']):
-                                contact_info['ceo_email'] = email
-                            elif 'info' in email_lower or 'contact' in email_lower:
-                                contact_info['general_email'] = email
-                        
-                        if contact_info:
-                            break
+                html = await self._fetch_page(page_url, timeout=10)
+                if html is not None:
+                    soup = BeautifulSoup(html, 'html.parser')
+                    text = soup.get_text()
+                    
+                    # Extract all emails
+                    emails = re.findall(
+                        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+                        text
+                    )
+                    
+                    # Categorize emails
+                    for email in emails:
+                        email_lower = email.lower()
+                        if any(keyword in email_lower for keyword in ['hr', 'careers', 'recruiting', 'jobs']):
+                            contact_info['hr_email'] = email
+                        elif any(keyword in email_lower for keyword in ['ceo', 'founder', 'admin']):
+                            contact_info['ceo_email'] = email
+                        elif 'info' in email_lower or 'contact' in email_lower:
+                            contact_info['general_email'] = email
+                    
+                    if contact_info:
+                        break
                         
             except Exception as e:
                 continue
@@ -569,40 +680,39 @@ class CompanyWebsiteScanner:
         """
         try:
             # Scrape homepage for company size indicators
-            async with self.session.get(company_url, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    text = soup.get_text().lower()
-                    
-                    # Check for startup indicators
-                    startup_score = sum(1 for indicator in self.startup_indicators if indicator in text)
-                    
-                    # Check for team size mentions
-                    team_size_patterns = [
-                        r'(\d+)\s*(?:person|people|employee|team member|staff)',
-                        r'team of\s*(\d+)',
-                        r'(\d+)[\s-]*member team'
-                    ]
-                    
-                    for pattern in team_size_patterns:
-                        match = re.search(pattern, text)
-                        if match:
-                            size = int(match.group(1))
-                            if size < 50:
-                                return True, 'startup'
-                            elif size < 250:
-                                return True, 'small'
-                            elif size < 1000:
-                                return False, 'medium'
-                            else:
-                                return False, 'large'
-                    
-                    # If strong startup indicators, classify as startup
-                    if startup_score >= 3:
-                        return True, 'startup'
-                    elif startup_score >= 1:
-                        return True, 'small'
+            html = await self._fetch_page(company_url, timeout=10)
+            if html is not None:
+                soup = BeautifulSoup(html, 'html.parser')
+                text = soup.get_text().lower()
+                
+                # Check for startup indicators
+                startup_score = sum(1 for indicator in self.startup_indicators if indicator in text)
+                
+                # Check for team size mentions
+                team_size_patterns = [
+                    r'(\d+)\s*(?:person|people|employee|team member|staff)',
+                    r'team of\s*(\d+)',
+                    r'(\d+)[\s-]*member team'
+                ]
+                
+                for pattern in team_size_patterns:
+                    match = re.search(pattern, text)
+                    if match:
+                        size = int(match.group(1))
+                        if size < 50:
+                            return True, 'startup'
+                        elif size < 250:
+                            return True, 'small'
+                        elif size < 1000:
+                            return False, 'medium'
+                        else:
+                            return False, 'large'
+                
+                # If strong startup indicators, classify as startup
+                if startup_score >= 3:
+                    return True, 'startup'
+                elif startup_score >= 1:
+                    return True, 'small'
             
             # Default: assume SME if can't determine
             return True, 'small'
@@ -616,7 +726,7 @@ class CompanyWebsiteScanner:
         companies: List[Dict[str, str]]
     ) -> List[Dict[str, Any]]:
         """
-        Scan multiple company websites in parallel.
+        Scan multiple company websites in parallel (``SCAN_CONCURRENCY`` at a time).
         
         Args:
             companies: List of dicts with 'url' and 'name' keys
@@ -624,12 +734,13 @@ class CompanyWebsiteScanner:
         Returns:
             List of scan results
         """
-        tasks = [
-            self.scan_company_website(company['url'], company['name'])
-            for company in companies
-        ]
+        scan_slots = asyncio.Semaphore(SCAN_CONCURRENCY)
+        
+        async def scan(company: Dict[str, str]) -> Dict[str, Any]:
+            async with scan_slots:
+                return await self.scan_company_website(company['url'], company['name'])
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(*(scan(company) for company in companies), return_exceptions=True)
         
         # Filter out exceptions
         valid_results = []
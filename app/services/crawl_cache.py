@@ -0,0 +1,169 @@
+"""
+HTTP response cache and career page memory for the company website scanner.
+
+Fetched pages are kept in memory (LRU) and, when a directory is configured,
+on disk as one JSON file per URL, so repeated scans across restarts reuse
+them. A page is served as-is while fresh; after that it is revalidated with
+``If-None-Match`` / ``If-Modified-Since`` and a ``304`` keeps the stored
+body. Non-200 answers (e.g. a missing ``/about-us``) are cached too.
+
+Each domain's career page URL (or the fact that none was found) is
+remembered separately, so later scans skip probing for it.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.logger import logger
+
+# Pages are served without a request while fresh, revalidated until max age
+PAGE_FRESH_SECONDS = 60 * 60
+PAGE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# How long a domain's career page (or lack of one) is trusted
+CAREER_PAGE_TTL_SECONDS = 7 * 24 * 60 * 60
+NO_CAREER_PAGE_TTL_SECONDS = 24 * 60 * 60
+
+MEMORY_ENTRIES = 512
+
+
+@dataclass
+class CachedPage:
+    """A stored response and its validators."""
+    url: str
+    status: int
+    body: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < PAGE_FRESH_SECONDS
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this page."""
+        headers = {}
+        if self.status == 200:
+            if self.etag:
+                headers['If-None-Match'] = self.etag
+            if self.last_modified:
+                headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class CrawlCache:
+    """Page cache plus per-domain career page memory; thread-safe for executor use."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._career_pages: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+        self._career_pages_loaded = False
+
+    def _page_path(self, url: str) -> str:
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "pages", name[:2], f"{name}.json")
+
+    def _career_pages_path(self) -> str:
+        return os.path.join(self.directory, "career_pages.json")
+
+    def get_page(self, url: str) -> Optional[CachedPage]:
+        """The stored page for ``url`` (fresh or not), or None."""
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+        if page is None and self.directory:
+            try:
+                with open(self._page_path(url), encoding="utf-8") as f:
+                    page = CachedPage(**json.load(f))
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Unreadable crawl cache entry for {url}: {e}")
+                return None
+            self._remember(page)
+        if page is not None and time.time() - page.fetched_at > PAGE_MAX_AGE_SECONDS:
+            return None
+        return page
+
+    def put_page(self, page: CachedPage) -> None:
+        """Store a fetched (or revalidated) page."""
+        self._remember(page)
+        if not self.directory:
+            return
+        path = self._page_path(page.url)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(page), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write crawl cache entry for {page.url}: {e}")
+
+    def _remember(self, page: CachedPage) -> None:
+        with self._lock:
+            self._pages[page.url] = page
+            self._pages.move_to_end(page.url)
+            while len(self._pages) > MEMORY_ENTRIES:
+                self._pages.popitem(last=False)
+
+    def _load_career_pages(self) -> None:
+        if self._career_pages_loaded:
+            return
+        self._career_pages_loaded = True
+        if not self.directory:
+            return
+        try:
+            with open(self._career_pages_path(), encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load remembered career pages: {e}")
+            return
+        for domain, (url, checked_at) in stored.items():
+            self._career_pages.setdefault(domain, (url, checked_at))
+
+    def career_page(self, domain: str) -> Tuple[bool, Optional[str]]:
+        """
+        What is known about ``domain``'s career page.
+
+        Returns (known, url); ``url`` is None when the domain is known to
+        have no career page.
+        """
+        with self._lock:
+            self._load_career_pages()
+            entry = self._career_pages.get(domain)
+        if entry is None:
+            return False, None
+        url, checked_at = entry
+        ttl = CAREER_PAGE_TTL_SECONDS if url else NO_CAREER_PAGE_TTL_SECONDS
+        if time.time() - checked_at > ttl:
+            return False, None
+        return True, url
+
+    def remember_career_page(self, domain: str, url: Optional[str]) -> None:
+        """Record ``domain``'s career page URL (None if it has none)."""
+        with self._lock:
+            self._load_career_pages()
+            self._career_pages[domain] = (url, time.time())
+            if not self.directory:
+                return
+            # Written under the lock so concurrent updates don't share the temp file
+            path = self._career_pages_path()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(self._career_pages, f)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                logger.warning(f"Could not save remembered career pages: {e}")
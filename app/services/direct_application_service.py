@@ -4,18 +4,28 @@ Sends job applications directly to company decision makers (CEO, HR, Founders)
 with personalized messages optimized for startups and SMEs.
 """
 import asyncio
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
+from urllib.parse import urlparse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.logger import logger
+from app.core.throttle import KeyedSemaphore, TokenBucket
 from app.services.email_service import email_service
-from app.services.ai_service import ai_service, AICoachingType
+from app.services.ai_service import (
+    ai_service, AICoachingType, AI_UNAVAILABLE_RESPONSE, AI_FAILED_RESPONSE
+)
 from app.services.company_scanner_service import company_scanner_service
 from app.database.user_models import User, Profile
 from app.database.job_models import JobApplication, JobListing
 
+# Batch applications: company websites scanned at once, scans per host,
+# and the pace of outgoing direct emails (process-wide)
+BATCH_SCAN_CONCURRENCY = 4
+SCANS_PER_HOST = 1
+DIRECT_EMAILS_PER_SECOND = 0.5
+
 
 class DirectApplicationService:
     """
@@ -25,6 +35,8 @@ class DirectApplicationService:
     
     def __init__(self):
         self.logger = logger
+        self.host_slots = KeyedSemaphore(SCANS_PER_HOST)
+        self.send_bucket = TokenBucket(rate=DIRECT_EMAILS_PER_SECOND, capacity=1)
     
     async def send_direct_application(
         self,
@@ -53,41 +65,84 @@ class DirectApplicationService:
             if not user_profile:
                 raise ValueError("User profile not found")
             
-            # Determine best recipient (CEO > HR > Careers)
-            recipient = self._select_best_recipient(company_contacts, job_data)
-            if not recipient or not recipient.get('email'):
-                return {
-                    'success': False,
-                    'error': 'No valid recipient contact found',
-                    'suggestion': 'Try finding contacts manually or apply through job board'
-                }
-            
-            # Generate personalized pitch using AI
-            personalized_pitch = await self._generate_ceo_pitch(
-                user_profile=user_profile,
-                job_data=job_data,
-                recipient=recipient,
-                user_message=user_message
+            email = await self._prepare_direct_application(
+                user_profile, job_data, company_contacts, user_message
             )
+            if not email.get('success', True):
+                return email
             
-            # Prepare email content
-            email_subject = self._create_subject_line(
-                user_profile, job_data, recipient
-            )
+            return await self._deliver_direct_application(db, user_id, user_profile, job_data, email)
             
-            email_body = await self._create_direct_application_email(
-                user_profile=user_profile,
-                job_data=job_data,
-                recipient=recipient,
-                pitch=personalized_pitch
-            )
+        except Exception as e:
+            self.logger.error(f"Error sending direct application: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'fallback_action': 'Use traditional application method'
+            }
+    
+    async def _prepare_direct_application(
+        self,
+        user_profile: Dict[str, Any],
+        job_data: Dict[str, Any],
+        company_contacts: Dict[str, Any],
+        user_message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Pick the recipient and write the email (AI pitch included).
+        
+        Returns the recipient, subject and body, or a failed result dict
+        (``success: False``) when there is nobody to send to.
+        """
+        # Determine best recipient (CEO > HR > Careers)
+        recipient = self._select_best_recipient(company_contacts, job_data)
+        if not recipient or not recipient.get('email'):
+            return {
+                'success': False,
+                'error': 'No valid recipient contact found',
+                'suggestion': 'Try finding contacts manually or apply through job board'
+            }
+        
+        # Generate personalized pitch using AI
+        personalized_pitch = await self._generate_ceo_pitch(
+            user_profile=user_profile,
+            job_data=job_data,
+            recipient=recipient,
+            user_message=user_message
+        )
+        
+        # Prepare email content
+        email_subject = self._create_subject_line(
+            user_profile, job_data, recipient
+        )
+        
+        email_body = await self._create_direct_application_email(
+            user_profile=user_profile,
+            job_data=job_data,
+            recipient=recipient,
+            pitch=personalized_pitch
+        )
+        
+        return {'recipient': recipient, 'subject': email_subject, 'body': email_body}
+    
+    async def _deliver_direct_application(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        user_profile: Dict[str, Any],
+        job_data: Dict[str, Any],
+        email: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Send a prepared direct application and record it."""
+        try:
+            recipient = email['recipient']
             
             # Send email
             send_result = await self._send_application_email(
                 recipient_email=recipient['email'],
                 recipient_name=recipient.get('name', 'Hiring Manager'),
-                subject=email_subject,
-                body=email_body,
+                subject=email['subject'],
+                body=email['body'],
                 user_email=user_profile['email'],
                 attachments=[]  # Could attach CV here
             )
@@ -165,34 +220,10 @@ class DirectApplicationService:
                     company_name=company_name
                 )
             
-            if not scan_result.get('scan_success'):
-                return {
-                    'success': False,
-                    'error': 'Could not scan company website',
-                    'details': scan_result.get('error'),
-                    'manual_action_required': True
-                }
-            
-            # Step 2: Check if it's a startup/SME (our focus)
-            is_target_company = scan_result.get('is_startup') or scan_result.get('is_sme')
-            if not is_target_company:
-                return {
-                    'success': False,
-                    'warning': 'Company appears to be large enterprise',
-                    'recommendation': 'For large companies, use traditional application process',
-                    'company_size': scan_result.get('company_size_estimate'),
-                    'alternative_action': 'Apply through company career portal'
-                }
-            
-            # Step 3: Extract job data
-            job_data = self._extract_job_from_scan(scan_result, job_title)
-            
-            # Step 4: Get contacts
-            company_contacts = {
-                'ceo': scan_result.get('ceo_contact'),
-                'hr': scan_result.get('hr_contact'),
-                'founders': scan_result.get('founders', [])
-            }
+            # Steps 2-4: Check the company, extract job data and contacts
+            rejection, job_data, company_contacts = self._application_from_scan(scan_result, job_title)
+            if rejection:
+                return rejection
             
             # Step 5: Send direct application
             application_result = await self.send_direct_application(
@@ -204,26 +235,75 @@ class DirectApplicationService:
             )
             
             # Add scan context to result
-            application_result['company_scan'] = {
-                'is_startup': scan_result.get('is_startup'),
-                'company_size': scan_result.get('company_size_estimate'),
-                'entry_level_jobs_found': scan_result.get('entry_level_count'),
-                'career_page_url': scan_result.get('career_page_url')
-            }
+            application_result['company_scan'] = self._scan_context(scan_result)
             
             return application_result
             
         except Exception as e:
-            self.logger.error(f"Error in one-click direct application: {str(e)}")
+            return self._one_click_error(e)
+    
+    def _application_from_scan(
+        self,
+        scan_result: Dict[str, Any],
+        job_title: str
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any], Dict[str, Any]]:
+        """
+        Job data and contacts from a website scan.
+        
+        Returns (rejection, job_data, company_contacts); ``rejection`` is a
+        failed result dict when the scan failed or the company is not a
+        startup/SME.
+        """
+        if not scan_result.get('scan_success'):
             return {
                 'success': False,
-                'error': str(e),
-                'recovery_suggestions': [
-                    'Check if company website is accessible',
-                    'Try applying through LinkedIn or job boards',
-                    'Visit company career page manually'
-                ]
-            }
+                'error': 'Could not scan company website',
+                'details': scan_result.get('error'),
+                'manual_action_required': True
+            }, {}, {}
+        
+        # Check if it's a startup/SME (our focus)
+        is_target_company = scan_result.get('is_startup') or scan_result.get('is_sme')
+        if not is_target_company:
+            return {
+                'success': False,
+                'warning': 'Company appears to be large enterprise',
+                'recommendation': 'For large companies, use traditional application process',
+                'company_size': scan_result.get('company_size_estimate'),
+                'alternative_action': 'Apply through company career portal'
+            }, {}, {}
+        
+        # Extract job data
+        job_data = self._extract_job_from_scan(scan_result, job_title)
+        
+        # Get contacts
+        company_contacts = {
+            'ceo': scan_result.get('ceo_contact'),
+            'hr': scan_result.get('hr_contact'),
+            'founders': scan_result.get('founders', [])
+        }
+        return None, job_data, company_contacts
+    
+    @staticmethod
+    def _scan_context(scan_result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'is_startup': scan_result.get('is_startup'),
+            'company_size': scan_result.get('company_size_estimate'),
+            'entry_level_jobs_found': scan_result.get('entry_level_count'),
+            'career_page_url': scan_result.get('career_page_url')
+        }
+    
+    def _one_click_error(self, e: Exception) -> Dict[str, Any]:
+        self.logger.error(f"Error in one-click direct application: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'recovery_suggestions': [
+                'Check if company website is accessible',
+                'Try applying through LinkedIn or job boards',
+                'Visit company career page manually'
+            ]
+        }
     
     async def batch_apply_to_startups(
         self,
@@ -235,6 +315,12 @@ class DirectApplicationService:
         """
         Apply to multiple startups/SMEs in one go.
         
+        Companies are scanned concurrently (``BATCH_SCAN_CONCURRENCY`` at a
+        time, ``SCANS_PER_HOST`` per host) and pitches are written as soon
+        as each scan finishes, with AI requests bounded by ai_service. Only
+        the email send is paced, by a process-wide token bucket; sends and
+        database writes happen one at a time as applications become ready.
+        
         Args:
             db: Database session
             user_id: User ID
@@ -256,45 +342,104 @@ class DirectApplicationService:
         companies_to_apply = company_list[:max_applications]
         results['total_attempted'] = len(companies_to_apply)
         
-        # Apply to each company
-        for company in companies_to_apply:
-            try:
-                result = await self.find_and_apply_direct(
-                    db=db,
-                    user_id=user_id,
-                    company_url=company['url'],
-                    company_name=company['name'],
-                    job_title=company.get('job_title', 'Project Manager'),
-                    user_message=company.get('message')
-                )
-                
-                if result.get('success'):
-                    results['successful'] += 1
-                else:
-                    results['failed'] += 1
-                    results['errors'].append({
-                        'company': company['name'],
-                        'error': result.get('error')
-                    })
-                
-                results['applications'].append({
-                    'company': company['name'],
-                    'success': result.get('success'),
-                    'details': result
-                })
-                
-                # Respectful delay between applications
-                await asyncio.sleep(2)
-                
-            except Exception as e:
+        outcomes: List[Dict[str, Any]] = [{} for _ in companies_to_apply]
+        user_profile = await self._get_user_profile_data(db, user_id)
+        
+        if not user_profile:
+            outcomes = [
+                {'success': False, 'error': 'User profile not found'} for _ in companies_to_apply
+            ]
+        elif companies_to_apply:
+            scan_slots = asyncio.Semaphore(BATCH_SCAN_CONCURRENCY)
+            
+            async with company_scanner_service as scanner:
+                prepared = [
+                    asyncio.create_task(self._prepare_batch_application(
+                        index, company, user_profile, scanner, scan_slots
+                    ))
+                    for index, company in enumerate(companies_to_apply)
+                ]
+                try:
+                    # Deliver in the order applications become ready
+                    for ready in asyncio.as_completed(prepared):
+                        index, outcome, job_data, email = await ready
+                        if email is not None:
+                            try:
+                                await self.send_bucket.acquire()
+                                scan = outcome
+                                outcome = await self._deliver_direct_application(
+                                    db, user_id, user_profile, job_data, email
+                                )
+                                outcome['company_scan'] = scan
+                            except Exception as e:
+                                outcome = self._one_click_error(e)
+                        outcomes[index] = outcome
+                finally:
+                    for task in prepared:
+                        task.cancel()
+        
+        for company, result in zip(companies_to_apply, outcomes):
+            if result.get('success'):
+                results['successful'] += 1
+            else:
                 results['failed'] += 1
                 results['errors'].append({
                     'company': company['name'],
-                    'error': str(e)
+                    'error': result.get('error')
                 })
+            
+            results['applications'].append({
+                'company': company['name'],
+                'success': result.get('success'),
+                'details': result
+            })
         
         return results
     
+    async def _prepare_batch_application(
+        self,
+        index: int,
+        company: Dict[str, str],
+        user_profile: Dict[str, Any],
+        scanner: Any,
+        scan_slots: asyncio.Semaphore
+    ) -> Tuple[int, Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Scan one company and write its email.
+        
+        Returns (index, outcome, job_data, email). When ``email`` is None the
+        outcome is the final (failed) result; otherwise it is the scan
+        context to attach once the email is sent.
+        """
+        try:
+            company_url = company['url']
+            host = urlparse(company_url if '//' in company_url else f'https://{company_url}').netloc.lower()
+            
+            async with scan_slots:
+                async with self.host_slots.slot(host):
+                    scan_result = await scanner.scan_company_website(
+                        company_url=company_url,
+                        company_name=company['name']
+                    )
+            
+            rejection, job_data, company_contacts = self._application_from_scan(
+                scan_result, company.get('job_title', 'Project Manager')
+            )
+            if rejection:
+                return index, rejection, job_data, None
+            
+            email = await self._prepare_direct_application(
+                user_profile, job_data, company_contacts, company.get('message')
+            )
+            if not email.get('success', True):
+                email['company_scan'] = self._scan_context(scan_result)
+                return index, email, job_data, None
+            
+            return index, self._scan_context(scan_result), job_data, email
+            
+        except Exception as e:
+            return index, self._one_click_error(e), {}, None
+    
     # Private helper methods
     
     async def _get_user_profile_data(
@@ -459,8 +604,10 @@ class DirectApplicationService:
                 user_context=user_profile
             )
             
-            pitch = response.get('response', '').strip()
-            return pitch if pitch else self._get_fallback_pitch(user_profile, job_data, recipient)
+            pitch = (response.get('response') or '').strip()
+            if pitch in ('', AI_UNAVAILABLE_RESPONSE, AI_FAILED_RESPONSE):
+                return self._get_fallback_pitch(user_profile, job_data, recipient)
+            return pitch
             
         except Exception as e:
             self.logger.error(f"Error generating CEO pitch: {str(e)}")
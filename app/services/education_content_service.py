@@ -1,13 +1,17 @@
 """
 External education content providers for real course data.
 """
-import aiohttp
 import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import json
 
 from app.core.config import settings
+from app.core.fanout import fan_out
+from app.core.http_client import http_clients
+
+# Deadline for fetching all education providers, in seconds
+PROVIDER_FETCH_DEADLINE_SECONDS = 15.0
 
 
 class CourseraAPI:
@@ -16,7 +20,7 @@ class CourseraAPI:
     @staticmethod
     async def fetch_pm_courses() -> List[Dict[str, Any]]:
         """Fetch project management courses from Coursera."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("education") as session:
             try:
                 # Coursera public API for project management courses
                 params = {
@@ -42,7 +46,7 @@ class EdXAPI:
     @staticmethod
     async def fetch_pm_courses() -> List[Dict[str, Any]]:
         """Fetch project management courses from edX."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("education") as session:
             try:
                 params = {
                     'search_term': 'project management',
@@ -65,7 +69,7 @@ class FutureLearnAPI:
     @staticmethod
     async def fetch_pm_courses() -> List[Dict[str, Any]]:
         """Fetch project management courses from FutureLearn."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("education") as session:
             try:
                 params = {
                     'q': 'project management',
@@ -88,7 +92,7 @@ class KhanAcademyAPI:
     @staticmethod
     async def fetch_business_content() -> List[Dict[str, Any]]:
         """Fetch business and entrepreneurship content from Khan Academy."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("education") as session:
             try:
                 # Khan Academy topic tree for business content
                 async with session.get(f"{settings.khan_academy_api_url}/topic/business-and-entrepreneurship") as response:
@@ -107,7 +111,7 @@ class YouTubeEduAPI:
     @staticmethod
     async def fetch_pm_videos(api_key: str) -> List[Dict[str, Any]]:
         """Fetch project management educational videos from YouTube."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("education") as session:
             try:
                 # Search for high-quality project management educational content
                 search_queries = [
@@ -172,7 +176,7 @@ class OpenCourseWareAPI:
     @staticmethod
     async def fetch_mit_courses() -> List[Dict[str, Any]]:
         """Fetch MIT project management courses."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("education") as session:
             try:
                 # MIT OCW API
                 params = {
@@ -204,28 +208,29 @@ class EducationalContentService:
         }
     
     async def fetch_all_pm_content(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Fetch project management content from all providers."""
-        content = {}
-        
-        tasks = [
-            self._fetch_coursera_content(),
-            self._fetch_edx_content(),
-            self._fetch_futurelearn_content(),
-            self._fetch_khan_academy_content(),
-            self._fetch_youtube_content(),
-            self._fetch_mit_content()
-        ]
+        """
+        Fetch project management content from all providers.
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Providers are fetched concurrently; one that fails, misses the
+        deadline or has an open circuit contributes an empty list.
+        """
+        results = await fan_out(
+            {
+                'coursera': self._fetch_coursera_content,
+                'edx': self._fetch_edx_content,
+                'futurelearn': self._fetch_futurelearn_content,
+                'khan_academy': self._fetch_khan_academy_content,
+                'youtube': self._fetch_youtube_content,
+                'mit_ocw': self._fetch_mit_content,
+            },
+            deadline=PROVIDER_FETCH_DEADLINE_SECONDS,
+            breaker_prefix="education"
+        )
         
-        content['coursera'] = results[0] if not isinstance(results[0], Exception) else []
-        content['edx'] = results[1] if not isinstance(results[1], Exception) else []
-        content['futurelearn'] = results[2] if not isinstance(results[2], Exception) else []
-        content['khan_academy'] = results[3] if not isinstance(results[3], Exception) else []
-        content['youtube'] = results[4] if not isinstance(results[4], Exception) else []
-        content['mit_ocw'] = results[5] if not isinstance(results[5], Exception) else []
-        
-        return content
+        return {
+            provider: result.value if result.ok else []
+            for provider, result in results.items()
+        }
     
     async def _fetch_coursera_content(self) -> List[Dict[str, Any]]:
         """Fetch Coursera content."""
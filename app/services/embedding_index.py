@@ -0,0 +1,176 @@
+"""
+Vector index for precomputed job embeddings.
+
+Job embeddings are keyed by a hash of the job's matching text, so the same
+posting is encoded once (at feed ingestion) no matter how many users are
+matched against it. Vectors are stored L2-normalised in one contiguous
+float32 matrix, which makes cosine similarity a single matrix-vector dot
+product. The index can be persisted as a ``.npy`` file and is memory-mapped
+on load.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.logger import logger
+
+
+def text_key(text: str) -> str:
+    """Stable cache key for an embedded text."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise each row (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first (all when k is None)."""
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class JobEmbeddingIndex:
+    """
+    Append-only store of normalised job embeddings keyed by text hash.
+
+    Thread-safe: ingestion may add vectors from a worker thread while
+    requests read them.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def missing(self, keys: Iterable[str]) -> List[str]:
+        """Keys that have no stored embedding yet."""
+        return [key for key in keys if key not in self._rows]
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Store (normalised) vectors for ``keys``; existing keys are kept."""
+        vectors = normalize_rows(vectors)
+        with self._lock:
+            new = [(key, vector) for key, vector in zip(keys, vectors) if key not in self._rows]
+            if not new:
+                return
+            if self._size + len(new) > self.max_entries:
+                self._reset_locked()
+            self._reserve_locked(self._size + len(new), vectors.shape[1])
+            for key, vector in new:
+                self._matrix[self._size] = vector
+                self._rows[key] = self._size
+                self._size += 1
+
+    def matrix(self, keys: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Stack the stored embeddings for ``keys``.
+
+        Returns:
+            Tuple of (matrix, positions) where ``positions`` are the indices
+            in ``keys`` that had an embedding, in matrix row order.
+        """
+        with self._lock:
+            positions = [i for i, key in enumerate(keys) if key in self._rows]
+            if not positions or self._matrix is None:
+                return np.empty((0, 0), dtype=np.float32), []
+            rows = [self._rows[keys[i]] for i in positions]
+            return self._matrix[rows], positions
+
+    def _reserve_locked(self, size: int, dim: int) -> None:
+        if self._matrix is not None and self._matrix.shape[0] >= size and self._matrix.shape[1] == dim:
+            return
+        capacity = max(size, 2 * (self._matrix.shape[0] if self._matrix is not None else 512))
+        matrix = np.zeros((capacity, dim), dtype=np.float32)
+        if self._matrix is not None and self._size and self._matrix.shape[1] == dim:
+            matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+    def _reset_locked(self) -> None:
+        # Simple bound on growth: the live corpus is re-encoded on next ingest
+        self._rows.clear()
+        self._matrix = None
+        self._size = 0
+
+    def save(self, directory: str) -> None:
+        """Persist the index as ``job_embeddings.npy`` plus a key file."""
+        with self._lock:
+            if self._matrix is None:
+                return
+            os.makedirs(directory, exist_ok=True)
+            matrix_path = os.path.join(directory, "job_embeddings.npy")
+            keys = sorted(self._rows, key=self._rows.get)
+            np.save(matrix_path + ".tmp.npy", self._matrix[:self._size])
+            os.replace(matrix_path + ".tmp.npy", matrix_path)
+            with open(os.path.join(directory, "job_embeddings.keys.json"), "w") as f:
+                json.dump(keys, f)
+
+    def load(self, directory: str) -> bool:
+        """Load a persisted index (memory-mapped); returns False if absent."""
+        matrix_path = os.path.join(directory, "job_embeddings.npy")
+        keys_path = os.path.join(directory, "job_embeddings.keys.json")
+        if not (os.path.exists(matrix_path) and os.path.exists(keys_path)):
+            return False
+        try:
+            matrix = np.load(matrix_path, mmap_mode="r")
+            with open(keys_path) as f:
+                keys = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load job embedding index: {e}")
+            return False
+        if len(keys) != matrix.shape[0]:
+            return False
+        with self._lock:
+            # Copied on first append; reads are served straight from the map
+            self._matrix = matrix
+            self._rows = {key: i for i, key in enumerate(keys)}
+            self._size = len(keys)
+        return True
+
+
+class ProfileEmbeddingCache:
+    """LRU cache of user-profile embeddings, invalidated when the profile text changes."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, profile_key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != profile_key:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def set(self, user_id: int, profile_key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[user_id] = (profile_key, normalize_rows(vector)[0])
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
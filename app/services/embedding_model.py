@@ -0,0 +1,245 @@
+"""
+Sentence-transformer model provider for job matching.
+
+The model is never loaded at import time. ``EmbeddingModelLoader.start()``
+(called from the app lifespan, or on first use) loads it once in a
+background thread; until it is ready, matching falls back to TF-IDF.
+
+Workers can instead share a single model through a local inference worker
+process (``scripts/embedding_worker.py``) by setting ``EMBEDDING_WORKER_URL``,
+in which case no worker loads the model itself.
+
+``EmbeddingBatcher`` coalesces concurrent encode calls into micro-batches run
+on one dedicated inference thread, so a burst of recommendation requests
+costs one model forward pass instead of one per request.
+"""
+import asyncio
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from app.core.config import settings
+from app.core.http_client import http_clients
+from app.core.logger import logger
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'  # 22MB model
+
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+# Loader states
+MODEL_NOT_LOADED = "not_loaded"
+MODEL_LOADING = "loading"
+MODEL_READY = "ready"
+MODEL_FAILED = "failed"
+MODEL_UNAVAILABLE = "unavailable"
+
+# Micro-batching: wait at most this long for more requests to join a batch
+BATCH_MAX_WAIT_MS = 5
+BATCH_MAX_TEXTS = 64
+
+# Largest request the embedding worker accepts (MAX_TEXTS_PER_REQUEST in
+# scripts/embedding_worker.py); bigger calls are split client-side
+WORKER_MAX_TEXTS = 512
+
+
+class RemoteEmbeddingModel:
+    """Client for the shared embedding worker process (``POST /encode``)."""
+
+    def __init__(self, base_url: str, max_texts: int = WORKER_MAX_TEXTS):
+        self.base_url = base_url.rstrip("/")
+        self.max_texts = max_texts
+
+    async def encode_async(self, texts: List[str]):
+        """Encode ``texts`` in requests of at most ``max_texts`` texts."""
+        import numpy as np  # type: ignore
+
+        chunks = [texts[i:i + self.max_texts] for i in range(0, len(texts), self.max_texts)] or [texts]
+        parts = []
+        async with http_clients.session("embeddings") as session:
+            for chunk in chunks:
+                async with session.post(f"{self.base_url}/encode", json={"texts": chunk}) as response:
+                    response.raise_for_status()
+                    payload = await response.json()
+                parts.append(np.asarray(payload["embeddings"], dtype=np.float32))
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+class EmbeddingModelLoader:
+    """Loads the embedding model once, off the request path."""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME):
+        self.model_name = model_name
+        self.model: Optional[Any] = None
+        self.status = MODEL_NOT_LOADED
+        self.error: Optional[str] = None
+        self.backend = "worker" if settings.embedding_worker_url else "local"
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self) -> None:
+        """Start loading in a background thread (no-op if already started)."""
+        with self._lock:
+            if self.status != MODEL_NOT_LOADED:
+                return
+
+            if settings.embedding_worker_url:
+                self.model = RemoteEmbeddingModel(settings.embedding_worker_url)
+                self.status = MODEL_READY
+                self._ready.set()
+                return
+
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                self.status = MODEL_UNAVAILABLE
+                logger.warning("Sentence Transformers not available. Using basic matching.")
+                return
+
+            self.status = MODEL_LOADING
+        threading.Thread(target=self._load, name="embedding-model-loader", daemon=True).start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the model is ready (for scripts); returns readiness."""
+        return self._ready.wait(timeout)
+
+    def _load(self) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer  # type: ignore
+            self.model = SentenceTransformer(self.model_name)
+        except Exception as e:
+            self.status = MODEL_FAILED
+            self.error = str(e)
+            logger.warning(f"Could not load sentence transformers: {e}")
+            return
+        self.status = MODEL_READY
+        self._ready.set()
+        logger.info(f"Sentence Transformers model {self.model_name} loaded")
+
+
+def _concatenate(parts: List[Any]):
+    import numpy as np  # type: ignore
+
+    return np.concatenate(parts)
+
+
+@dataclass
+class _EncodeRequest:
+    texts: List[str]
+    future: asyncio.Future = field(repr=False)
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching queue in front of an embedding model.
+
+    Requests arriving within ``max_wait_ms`` of the first one (up to
+    ``max_batch_texts`` texts) are encoded together on a single dedicated
+    thread and the rows are fanned back out to each caller. No model call
+    gets more than ``max_batch_texts`` texts; larger batches (or single
+    large requests) are encoded in slices.
+    """
+
+    def __init__(
+        self,
+        get_model: Callable[[], Any],
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        max_batch_texts: int = BATCH_MAX_TEXTS,
+    ):
+        self._get_model = get_model
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_texts = max_batch_texts
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-inference")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+
+    async def encode(self, texts: List[str]):
+        """Encode ``texts``, sharing a model call with concurrent callers."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+        request = _EncodeRequest(list(texts), loop.create_future())
+        self._queue.put_nowait(request)
+        return await request.future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0].texts)
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_texts:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(request)
+                size += len(request.texts)
+            await self._encode_batch(batch)
+
+    async def _encode_batch(self, batch: List[_EncodeRequest]) -> None:
+        # Callers that were cancelled while queued are skipped
+        batch = [request for request in batch if not request.future.done()]
+        if not batch:
+            return
+        texts = [text for request in batch for text in request.texts]
+        try:
+            model = self._get_model()
+            if model is None:
+                raise RuntimeError("Embedding model is not loaded")
+            slices = [
+                await self._encode_slice(model, texts[i:i + self.max_batch_texts])
+                for i in range(0, len(texts), self.max_batch_texts)
+            ] or [await self._encode_slice(model, texts)]
+            vectors = slices[0] if len(slices) == 1 else _concatenate(slices)
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.requests += len(batch)
+        self.texts += len(texts)
+        offset = 0
+        for request in batch:
+            rows = vectors[offset:offset + len(request.texts)]
+            offset += len(request.texts)
+            if not request.future.done():
+                request.future.set_result(rows)
+
+    async def _encode_slice(self, model: Any, texts: List[str]):
+        encode_async = getattr(model, "encode_async", None)
+        if encode_async is not None:
+            return await encode_async(texts)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, model.encode, texts
+        )
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+        }
+
+    async def stop(self) -> None:
+        """Cancel the batching task (app shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -135,9 +135,15 @@ class GamificationService:
         activity_type: str,
         points: Optional[int] = None,
         source_id: Optional[int] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        commit: bool = True
     ) -> Tuple[int, bool]:
-        """Award points to a user and check for level up."""
+        """
+        Award points to a user and check for level up.
+        
+        Pass ``commit=False`` when the caller commits the surrounding
+        transaction itself.
+        """
         try:
             # Get points to award
             points_to_award = points or self.POINT_VALUES.get(activity_type, 0)
@@ -179,7 +185,10 @@ class GamificationService:
             # Check for level up
             level_up = await self._check_level_progression(db, user_id, user_points)
             
-            await db.commit()
+            if commit:
+                await db.commit()
+            else:
+                await db.flush()
             
             return points_to_award, level_up
             
@@ -371,6 +380,8 @@ class GamificationService:
                 )
                 db.add(user_badge)
             
+            badge_award = None
+            
             # Update progress
             if not user_badge.is_completed:
                 user_badge.progress += progress_increment
@@ -381,20 +392,19 @@ class GamificationService:
                     user_badge.is_completed = True
                     user_badge.earned_at = datetime.utcnow()
                     
-                    # Award points
+                    # Award points (same transaction, committed once below)
                     await self.award_points(
                         db, user_id, 'earn_badge',
                         points=badge.points_required,
                         source_id=badge.id,
-                        description=f"Earned badge: {badge.name}"
+                        description=f"Earned badge: {badge.name}",
+                        commit=False
                     )
                     
                     # Update badge statistics
                     badge.total_earned += 1
                     
-                    await db.commit()
-                    
-                    return {
+                    badge_award = {
                         "badge_earned": True,
                         "badge_name": badge.name,
                         "badge_description": badge.description,
@@ -403,7 +413,7 @@ class GamificationService:
                     }
             
             await db.commit()
-            return None
+            return badge_award
             
         except Exception as e:
             await db.rollback()
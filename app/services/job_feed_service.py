@@ -0,0 +1,374 @@
+"""
+Shared job feed: background ingestion of external job sources into a local store.
+
+Each source is refreshed on its own schedule into an in-memory snapshot that
+is mirrored to the ``job_feed_snapshots`` table. Reads are stale-while-
+revalidate: callers always get the current snapshot immediately and a stale
+source is refreshed in the background, so user-facing endpoints never wait on
+third-party APIs.
+
+Jobs are normalized once, when a source is ingested, and stored in
+``ingested_jobs`` keyed by (source, external id). Readers get the normalized
+jobs with duplicates across sources removed by content hash.
+"""
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+
+from app.core.database import AsyncSessionLocal
+from app.core.fanout import circuit_breakers, fan_out
+from app.core.logger import logger
+from app.database.job_models import IngestedJob, JobFeedSnapshot
+
+# Refresh interval per source in seconds; a snapshot older than this is stale
+SOURCE_REFRESH_INTERVALS: Dict[str, int] = {
+    'remoteok': 15 * 60,
+    'remotive': 30 * 60,
+    'github': 6 * 60 * 60,
+    'linkedin': 60 * 60,
+    'indeed': 60 * 60,
+    'crunchbase': 24 * 60 * 60,
+}
+DEFAULT_REFRESH_INTERVAL = 60 * 60
+
+# Back-off before retrying a source whose refresh failed
+FAILED_REFRESH_RETRY_SECONDS = 5 * 60
+
+# Deadline for one source fetch during a refresh, in seconds
+SOURCE_FETCH_DEADLINE_SECONDS = 30.0
+
+# Characters of description text that go into the content hash
+CONTENT_HASH_DESCRIPTION_CHARS = 500
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def job_content_hash(job: Dict[str, Any]) -> str:
+    """
+    Hash of a normalized job's content, stable across sources.
+
+    Markup, punctuation, case and whitespace are ignored so the same posting
+    syndicated to several boards hashes identically.
+    """
+    def canonical(value: Any) -> str:
+        text = _HTML_TAG_RE.sub(" ", str(value or "")).lower()
+        return _NON_WORD_RE.sub(" ", text).strip()
+
+    description = canonical(job.get("description"))[:CONTENT_HASH_DESCRIPTION_CHARS]
+    content = "|".join([canonical(job.get("title")), canonical(job.get("company")), description])
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SourceSnapshot:
+    """Jobs currently held for one source."""
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    normalized: List[Dict[str, Any]] = field(default_factory=list)  # Normalized once at ingestion
+    fetched_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+    def is_stale(self, interval: int) -> bool:
+        if self.fetched_at is None:
+            return True
+        return datetime.now(timezone.utc) - self.fetched_at >= timedelta(seconds=interval)
+
+
+class JobFeedService:
+    """In-memory + DB job store fed by per-source background refresh loops."""
+
+    def __init__(self):
+        self._snapshots: Dict[str, SourceSnapshot] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._loops: List[asyncio.Task] = []
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self.version = 0  # Bumped whenever any source snapshot changes
+        self._merged: List[Dict[str, Any]] = []
+        self._merged_version = -1
+
+    def _source_fetchers(self) -> Dict[str, Callable[[], Awaitable[List[Dict[str, Any]]]]]:
+        # Import here to avoid circular imports
+        from app.services.job_search_service import job_search_service
+        return job_search_service.get_source_fetchers()
+
+    @staticmethod
+    def refresh_interval(source: str) -> int:
+        return SOURCE_REFRESH_INTERVALS.get(source, DEFAULT_REFRESH_INTERVAL)
+
+    async def get_jobs(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get raw jobs per source from the local store.
+
+        Never calls third-party APIs inline: stale or missing sources are
+        revalidated in the background and picked up by later reads.
+
+        Returns:
+            Dict mapping source name to its raw job list
+        """
+        await self._ensure_loaded()
+
+        jobs = {}
+        for source in self._source_fetchers():
+            snapshot = self._snapshots.get(source) or SourceSnapshot()
+            if snapshot.is_stale(self.refresh_interval(source)):
+                self._schedule_refresh(source)
+            jobs[source] = snapshot.jobs
+        return jobs
+
+    async def get_normalized_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Get normalized jobs from all sources, deduplicated by content hash.
+
+        Same stale-while-revalidate behaviour as ``get_jobs``. The merged list
+        is rebuilt only when a source snapshot changed; treat it as read-only.
+        """
+        await self.get_jobs()
+        if self._merged_version != self.version:
+            version = self.version
+            merged, seen = [], set()
+            for source in self._source_fetchers():
+                snapshot = self._snapshots.get(source)
+                for job in (snapshot.normalized if snapshot else []):
+                    content_hash = job.get("content_hash")
+                    if content_hash in seen:
+                        continue
+                    seen.add(content_hash)
+                    merged.append(job)
+            self._merged, self._merged_version = merged, version
+        return self._merged
+
+    def snapshot_info(self) -> Dict[str, Dict[str, Any]]:
+        """Freshness metadata per source (for health and source endpoints)."""
+        return {
+            source: {
+                "job_count": len(snapshot.jobs),
+                "normalized_count": len(snapshot.normalized),
+                "fetched_at": snapshot.fetched_at.isoformat() if snapshot.fetched_at else None,
+                "last_error": snapshot.last_error,
+                "refreshing": source in self._refreshing,
+                "circuit": circuit_breakers.get(f"jobs:{source}").state,
+            }
+            for source, snapshot in self._snapshots.items()
+        }
+
+    async def refresh_source(self, source: str) -> List[Dict[str, Any]]:
+        """
+        Fetch one source live and store the result.
+
+        A failed, timed-out or empty fetch keeps the previous jobs so a flaky
+        provider doesn't wipe the feed. Sources whose circuit breaker is open
+        are not called at all until it cools down.
+        """
+        fetcher = self._source_fetchers().get(source)
+        if fetcher is None:
+            return []
+
+        snapshot = self._snapshots.setdefault(source, SourceSnapshot())
+        results = await fan_out(
+            {source: fetcher},
+            deadline=SOURCE_FETCH_DEADLINE_SECONDS,
+            breaker_prefix="jobs"
+        )
+        result = results[source]
+        if not result.ok:
+            snapshot.last_error = result.error
+            logger.error(f"Job feed refresh failed for {source}: {result.error}")
+            if snapshot.fetched_at is not None:
+                await self._persist(source, snapshot)
+            return snapshot.jobs
+
+        jobs = result.value
+        changed = bool(jobs) or not snapshot.jobs
+        if changed:
+            snapshot.jobs = jobs
+            snapshot.normalized = self._normalize(source, jobs)
+            self.version += 1
+            await self._index_jobs(source, snapshot.normalized)
+        snapshot.fetched_at = datetime.now(timezone.utc)
+        snapshot.last_error = None
+        await self._persist(source, snapshot, jobs_changed=changed)
+        logger.info(f"Job feed refreshed {source}: {len(snapshot.jobs)} jobs")
+        return snapshot.jobs
+
+    def _normalize(self, source: str, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize a source's raw jobs and tag each with its external id and content hash."""
+        # Import here to avoid circular imports
+        from app.services.job_search_service import job_search_service
+
+        normalized, seen = [], set()
+        for job in job_search_service.normalize_job_data({source: jobs}):
+            job["content_hash"] = job_content_hash(job)
+            external_id = str(job.get("id") or job["content_hash"])
+            if external_id in seen:
+                continue
+            seen.add(external_id)
+            job["external_id"] = external_id
+            normalized.append(job)
+        return normalized
+
+    async def _index_jobs(self, source: str, normalized: List[Dict[str, Any]]) -> None:
+        """Precompute skill features and matching embeddings for newly ingested jobs."""
+        if not normalized:
+            return
+        try:
+            # Import here to avoid circular imports
+            from app.services.job_matching_service import job_matching_service
+            from app.services.skill_index import skill_index
+            skill_index.index_jobs(normalized)
+            encoded = await job_matching_service.index_jobs(normalized)
+            if encoded:
+                logger.info(f"Job feed indexed {encoded} new {source} job embeddings")
+        except Exception as e:
+            logger.error(f"Job feed embedding indexing failed for {source}: {e}")
+
+    def _schedule_refresh(self, source: str) -> None:
+        """Start a background refresh unless one is already running."""
+        if source in self._refreshing:
+            return
+        task = asyncio.create_task(self.refresh_source(source))
+        self._refreshing[source] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(source, None))
+
+    async def _ensure_loaded(self) -> None:
+        """Warm the in-memory snapshot from the DB once per process."""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(select(JobFeedSnapshot))
+                    for row in result.scalars().all():
+                        fetched_at = row.fetched_at
+                        if fetched_at and fetched_at.tzinfo is None:
+                            fetched_at = fetched_at.replace(tzinfo=timezone.utc)  # SQLite
+                        self._snapshots[row.source] = SourceSnapshot(
+                            jobs=row.jobs or [],
+                            fetched_at=fetched_at,
+                            last_error=row.last_error,
+                        )
+
+                    result = await db.execute(
+                        select(IngestedJob.source, IngestedJob.data)
+                        .order_by(IngestedJob.first_seen_at, IngestedJob.external_id)
+                    )
+                    for source, data in result.all():
+                        snapshot = self._snapshots.get(source)
+                        if snapshot is not None and data:
+                            snapshot.normalized.append(data)
+
+                # Snapshots stored before ingested_jobs existed are normalized once here
+                for source, snapshot in self._snapshots.items():
+                    if snapshot.jobs and not snapshot.normalized:
+                        snapshot.normalized = self._normalize(source, snapshot.jobs)
+                self.version += 1
+            except Exception as e:
+                logger.error(f"Could not load job feed snapshots: {e}")
+            self._loaded = True
+
+    async def _persist(self, source: str, snapshot: SourceSnapshot, jobs_changed: bool = False) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                row = await db.get(JobFeedSnapshot, source)
+                if row is None:
+                    row = JobFeedSnapshot(source=source)
+                    db.add(row)
+                row.jobs = snapshot.jobs
+                row.job_count = len(snapshot.jobs)
+                row.fetched_at = snapshot.fetched_at
+                row.last_error = snapshot.last_error
+                if jobs_changed:
+                    await self._sync_ingested_jobs(db, source, snapshot)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Could not persist job feed snapshot for {source}: {e}")
+
+    @staticmethod
+    async def _sync_ingested_jobs(db, source: str, snapshot: SourceSnapshot) -> None:
+        """Mirror the source's normalized jobs into ingested_jobs (only changed rows are written)."""
+        now = snapshot.fetched_at
+        result = await db.execute(
+            select(IngestedJob.external_id, IngestedJob.content_hash)
+            .where(IngestedJob.source == source)
+        )
+        existing = dict(result.all())
+        current = {job["external_id"]: job for job in snapshot.normalized}
+
+        removed = [external_id for external_id in existing if external_id not in current]
+        if removed:
+            await db.execute(
+                delete(IngestedJob)
+                .where(IngestedJob.source == source, IngestedJob.external_id.in_(removed))
+            )
+
+        unchanged = []
+        for external_id, job in current.items():
+            if external_id not in existing:
+                db.add(IngestedJob(
+                    source=source,
+                    external_id=external_id,
+                    content_hash=job["content_hash"],
+                    data=job,
+                    first_seen_at=now,
+                    last_seen_at=now,
+                ))
+            elif existing[external_id] != job["content_hash"]:
+                await db.execute(
+                    update(IngestedJob)
+                    .where(IngestedJob.source == source, IngestedJob.external_id == external_id)
+                    .values(content_hash=job["content_hash"], data=job, last_seen_at=now)
+                )
+            else:
+                unchanged.append(external_id)
+
+        if unchanged:
+            await db.execute(
+                update(IngestedJob)
+                .where(IngestedJob.source == source, IngestedJob.external_id.in_(unchanged))
+                .values(last_seen_at=now)
+            )
+
+    async def _source_loop(self, source: str) -> None:
+        interval = self.refresh_interval(source)
+        while True:
+            snapshot = self._snapshots.get(source)
+            if snapshot is None or snapshot.is_stale(interval):
+                await self.refresh_source(source)
+                snapshot = self._snapshots.get(source)
+
+            delay = interval
+            if snapshot and snapshot.last_error:
+                delay = min(interval, FAILED_REFRESH_RETRY_SECONDS)
+            elif snapshot and snapshot.fetched_at:
+                age = (datetime.now(timezone.utc) - snapshot.fetched_at).total_seconds()
+                delay = max(interval - age, 1)
+            await asyncio.sleep(delay)
+
+    async def start(self) -> None:
+        """Start one refresh loop per enabled source (app lifespan)."""
+        if self._loops:
+            return
+        await self._ensure_loaded()
+        for source in self._source_fetchers():
+            self._loops.append(asyncio.create_task(self._source_loop(source)))
+        logger.info(f"Job feed ingestion started for {len(self._loops)} sources")
+
+    async def stop(self) -> None:
+        """Cancel refresh loops and in-flight refreshes."""
+        tasks = self._loops + list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loops = []
+        self._refreshing.clear()
+
+
+# Global instance
+job_feed_service = JobFeedService()
@@ -17,110 +17,171 @@ except ImportError:
     NUMPY_AVAILABLE = False
 
 try:
-    from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
     from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
 
-#embedding libraries
-try:
-    from sentence_transformers import SentenceTransformer  # type: ignore
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-
+from app.core.config import settings
 from app.database.job_models import JobApplication, SavedJob
-from app.database.user_models import User, UserSkill
+from app.database.user_models import User, Profile, UserSkill
 from app.database.cv_models import CV, WorkExperience, Education, CVSkill
 from app.schemas.job_schemas import JobMatchResponse, JobRecommendationResponse
+from app.services.embedding_index import text_key
+from app.services.embedding_model import (
+    EMBEDDING_MODEL_NAME,
+    EmbeddingBatcher,
+    EmbeddingModelLoader,
+)
+
+if NUMPY_AVAILABLE:
+    from app.services.embedding_index import JobEmbeddingIndex, ProfileEmbeddingCache, normalize_rows, top_k
+
+TFIDF_PARAMS = {
+    'max_features': 1000,
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+}
+
+
+class TfidfCorpus:
+    """TF-IDF vectorizer fitted on one job corpus, with the corpus as a CSR matrix."""
+    
+    def __init__(self, signature: str, vectorizer, job_matrix, positions: List[int]):
+        self.signature = signature    # Hash of the job texts the model was fitted on
+        self.vectorizer = vectorizer  # Never refitted; only transform() is called
+        self.job_matrix = job_matrix  # L2-normalised CSR rows, one per non-empty job text
+        self.positions = positions    # Index into the job list for each matrix row
+    
+    @classmethod
+    def fit(cls, signature: str, job_texts: List[str]) -> Optional["TfidfCorpus"]:
+        positions = [i for i, text in enumerate(job_texts) if text.strip()]
+        if not positions:
+            return None
+        vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+        try:
+            job_matrix = vectorizer.fit_transform([job_texts[i] for i in positions]).tocsr()
+        except ValueError:
+            # Empty vocabulary (e.g. only stop words)
+            return None
+        return cls(signature, vectorizer, job_matrix, positions)
+    
+    def score(self, profile_text: str):
+        """Cosine similarity of the profile against every job row (one sparse mat-vec)."""
+        profile_vector = self.vectorizer.transform([profile_text])
+        return (self.job_matrix @ profile_vector.T).toarray().ravel()
+    
+    def score_many(self, profile_texts: List[str]):
+        """(profiles x job rows) cosine similarities in one sparse mat-mat product."""
+        profile_matrix = self.vectorizer.transform(profile_texts)
+        return (profile_matrix @ self.job_matrix.T).toarray()
 
 
 class JobMatchingService:
     """Free job matching service using sentence transformers and scikit-learn."""
     
     def __init__(self):
-        """Initialize job matching service with free embedding models."""
-        self.embedding_model = None
-        self.tfidf_vectorizer = None
-        self.sentence_transformers_loaded = False
-        
-        # Initialize TF-IDF if sklearn available
-        if SKLEARN_AVAILABLE:
-            self.tfidf_vectorizer = TfidfVectorizer(
-                max_features=1000,
-                stop_words='english',
-                ngram_range=(1, 2)
-            )
+        """Initialize job matching service (the embedding model loads lazily)."""
+        self.model_loader = EmbeddingModelLoader()
+        self.batcher = EmbeddingBatcher(lambda: self.embedding_model)
         
-        # Initialize embedding model if available
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
-            try:
-                # Use free, lightweight models
-                self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')  # 22MB model
-                print("Sentence Transformers loaded successfully")
-                self.sentence_transformers_loaded = True
-            except Exception as e:
-                print(f"WARNING: Could not load sentence transformers: {e}")
-                self.embedding_model = None
-                self.sentence_transformers_loaded = False
-        else:
-            print("WARNING: Sentence Transformers not available. Using basic matching.")
-            self.sentence_transformers_loaded = False
+        # TF-IDF model fitted once per job corpus
+        self._tfidf_corpus: Optional[TfidfCorpus] = None
+        self._tfidf_lock = asyncio.Lock()
+        
+        # Precomputed job embeddings and cached user-profile embeddings
+        self.job_index = JobEmbeddingIndex() if NUMPY_AVAILABLE else None
+        self.profile_cache = ProfileEmbeddingCache() if NUMPY_AVAILABLE else None
+        if self.job_index is not None and settings.job_embedding_cache_dir:
+            self.job_index.load(settings.job_embedding_cache_dir)
+    
+    @property
+    def embedding_model(self):
+        """The loaded embedding model, or None while it is (not yet) loading."""
+        return self.model_loader.model if self.model_loader.ready else None
+    
+    @property
+    def sentence_transformers_loaded(self) -> bool:
+        return self.model_loader.ready
+    
+    def start_model_loading(self) -> None:
+        """Load the embedding model in a background thread (app lifespan or first use)."""
+        self.model_loader.start()
     
     async def get_user_profile_text(self, db: AsyncSession, user_id: int) -> str:
         """Generate comprehensive user profile text for matching."""
-        profile_parts = []
+        return (await self.get_user_profile_texts(db, [user_id])).get(user_id, "")
+    
+    async def get_user_profile_texts(self, db: AsyncSession, user_ids: List[int]) -> Dict[int, str]:
+        """
+        Generate profile texts for many users with one query per table.
+        
+        Users that don't exist are left out of the result.
+        """
+        if not user_ids:
+            return {}
         
         # Get user basic info
-        user_result = await db.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one_or_none()
-        if not user:
-            return ""
+        user_result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+        profile_parts: Dict[int, List[str]] = {user_id: [] for user_id in user_result.scalars()}
+        if not profile_parts:
+            return {}
+        ids = list(profile_parts)
         
         # Get user skills
         skills_result = await db.execute(
-            select(UserSkill).where(UserSkill.user_id == user_id)
+            select(Profile.user_id, UserSkill.skill_name)
+            .join(UserSkill, UserSkill.profile_id == Profile.id)
+            .where(Profile.user_id.in_(ids))
+            .order_by(UserSkill.id)
         )
-        skills = skills_result.scalars().all()
-        if skills:
-            skill_names = [skill.skill_name for skill in skills]
-            profile_parts.append(f"Skills: {', '.join(skill_names)}")
+        skill_names: Dict[int, List[str]] = {}
+        for user_id, skill_name in skills_result:
+            skill_names.setdefault(user_id, []).append(skill_name)
+        for user_id, names in skill_names.items():
+            profile_parts[user_id].append(f"Skills: {', '.join(names)}")
         
-        # Get latest CV data
+        # Get default CV data (one per user)
         cv_result = await db.execute(
-            select(CV)
-            .where(and_(CV.user_id == user_id, CV.is_default == True))
-            .limit(1)
+            select(CV.id, CV.user_id, CV.professional_summary)
+            .where(and_(CV.user_id.in_(ids), CV.is_default == True))
+            .order_by(CV.id)
         )
-        cv = cv_result.scalar_one_or_none()
+        cv_users: Dict[int, int] = {}
+        cv_owners = set()
+        for cv_id, user_id, summary in cv_result:
+            if user_id in cv_owners:
+                continue
+            cv_owners.add(user_id)
+            cv_users[cv_id] = user_id
+            if summary:
+                profile_parts[user_id].append(f"Summary: {summary}")
         
-        if cv:
-            if cv.summary:
-                profile_parts.append(f"Summary: {cv.summary}")
-            
+        if cv_users:
             # Get work experience
             exp_result = await db.execute(
-                select(WorkExperience).where(WorkExperience.cv_id == cv.id)
+                select(WorkExperience)
+                .where(WorkExperience.cv_id.in_(list(cv_users)))
+                .order_by(WorkExperience.cv_id, WorkExperience.display_order)
             )
-            experiences = exp_result.scalars().all()
-            
-            for exp in experiences:
+            for exp in exp_result.scalars():
                 exp_text = f"Experience: {exp.job_title} at {exp.company_name}"
                 if exp.description:
                     exp_text += f" - {exp.description}"
-                profile_parts.append(exp_text)
+                profile_parts[cv_users[exp.cv_id]].append(exp_text)
             
             # Get education
             edu_result = await db.execute(
-                select(Education).where(Education.cv_id == cv.id)
+                select(Education)
+                .where(Education.cv_id.in_(list(cv_users)))
+                .order_by(Education.cv_id, Education.display_order)
             )
-            education = edu_result.scalars().all()
-            
-            for edu in education:
-                profile_parts.append(f"Education: {edu.degree} in {edu.field_of_study}")
+            for edu in edu_result.scalars():
+                profile_parts[cv_users[edu.cv_id]].append(
+                    f"Education: {edu.degree_type} in {edu.field_of_study}"
+                )
         
-        return " ".join(profile_parts)
+        return {user_id: " ".join(parts) for user_id, parts in profile_parts.items()}
     
     def get_job_text(self, job: Dict[str, Any]) -> str:
         """Extract relevant text from job posting for matching."""
@@ -149,78 +210,195 @@ class JobMatchingService:
         
         return " ".join(job_parts)
     
+    async def _encode(self, texts: List[str]):
+        """Encode texts through the micro-batching inference queue."""
+        return await self.batcher.encode(texts)
+    
+    async def index_jobs(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Precompute embeddings for jobs not yet in the vector index.
+        
+        Called at feed ingestion so recommendation requests only encode the
+        user profile. Job texts are keyed by content hash, so unchanged jobs
+        are never re-encoded.
+        
+        Returns:
+            Number of newly encoded jobs
+        """
+        if not self.embedding_model or self.job_index is None:
+            return 0
+        
+        texts = {}
+        for job in jobs:
+            job_text = self.get_job_text(job)
+            if job_text.strip():
+                texts[text_key(job_text)] = job_text
+        
+        missing = self.job_index.missing(texts)
+        if not missing:
+            return 0
+        
+        vectors = await self._encode([texts[key] for key in missing])
+        self.job_index.add(missing, vectors)
+        
+        if settings.job_embedding_cache_dir:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self.job_index.save, settings.job_embedding_cache_dir
+            )
+        return len(missing)
+    
+    async def get_profile_embedding(self, user_profile: str, user_id: Optional[int] = None):
+        """Get the normalised profile embedding, cached per user until the profile text changes."""
+        profile_key = text_key(user_profile)
+        if user_id is not None:
+            cached = self.profile_cache.get(user_id, profile_key)
+            if cached is not None:
+                return cached
+        
+        vector = (await self._encode([user_profile]))[0]
+        if user_id is not None:
+            self.profile_cache.set(user_id, profile_key, vector)
+            return self.profile_cache.get(user_id, profile_key)
+        return vector / (np.linalg.norm(vector) or 1.0)
+    
+    async def get_profile_embeddings(
+        self,
+        profile_texts: List[str],
+        user_ids: Optional[List[int]] = None
+    ):
+        """Normalised embeddings for many profiles; uncached ones are encoded in one call."""
+        keys = [text_key(text) for text in profile_texts]
+        vectors = [None] * len(profile_texts)
+        if user_ids is not None:
+            for i, (user_id, key) in enumerate(zip(user_ids, keys)):
+                vectors[i] = self.profile_cache.get(user_id, key)
+        
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = normalize_rows(await self._encode([profile_texts[i] for i in missing]))
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+                if user_ids is not None:
+                    self.profile_cache.set(user_ids[i], keys[i], vector)
+        return np.stack(vectors)
+    
+    async def score_profiles(
+        self,
+        profile_texts: List[str],
+        jobs: List[Dict[str, Any]],
+        user_ids: Optional[List[int]] = None
+    ) -> Tuple[Optional["np.ndarray"], str]:
+        """
+        Score many profiles against the same jobs in one matrix product.
+        
+        Uses embeddings when the model is ready and TF-IDF otherwise.
+        
+        Returns:
+            Tuple of (scores, method): a (profiles x jobs) matrix with NaN for
+            jobs that could not be scored, or None if no method is available
+        """
+        if not NUMPY_AVAILABLE or not profile_texts or not jobs:
+            return None, "TF-IDF"
+        
+        self.start_model_loading()
+        scores = np.full((len(profile_texts), len(jobs)), np.nan, dtype=np.float32)
+        try:
+            if self.embedding_model and self.job_index is not None:
+                await self.index_jobs(jobs)
+                profile_matrix = await self.get_profile_embeddings(profile_texts, user_ids)
+                job_keys = [text_key(self.get_job_text(job)) for job in jobs]
+                job_matrix, positions = self.job_index.matrix(job_keys)
+                if positions:
+                    scores[:, positions] = profile_matrix @ job_matrix.T
+                return scores, "Semantic Embeddings"
+            
+            if SKLEARN_AVAILABLE:
+                corpus = await self._get_tfidf_corpus([self.get_job_text(job) for job in jobs])
+                if corpus is not None:
+                    scores[:, corpus.positions] = await asyncio.get_event_loop().run_in_executor(
+                        None, corpus.score_many, profile_texts
+                    )
+                return scores, "TF-IDF"
+        except Exception as e:
+            print(f"WARNING: Error in batch similarity: {e}")
+        return None, "TF-IDF"
+    
     async def calculate_job_similarity_embeddings(
         self, 
         user_profile: str, 
-        jobs: List[Dict[str, Any]]
+        jobs: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        limit: Optional[int] = None
     ) -> List[Tuple[Dict[str, Any], float]]:
         """Calculate job similarity using sentence transformers (free)."""
-        if not self.embedding_model or not user_profile.strip():
+        if not self.embedding_model or self.job_index is None or not user_profile.strip():
             return []
         
         try:
-            # Prepare texts
-            job_texts = [self.get_job_text(job) for job in jobs]
-            all_texts = [user_profile] + job_texts
-            
-            # Generate embeddings
-            embeddings = await asyncio.get_event_loop().run_in_executor(
-                None, self.embedding_model.encode, all_texts
-            )
-            
-            # Calculate similarities
-            user_embedding = embeddings[0].reshape(1, -1)
-            job_embeddings = embeddings[1:]
-            
-            similarities = cosine_similarity(user_embedding, job_embeddings)[0]
+            # Only jobs missing from the index are encoded (normally none)
+            await self.index_jobs(jobs)
+            user_embedding = await self.get_profile_embedding(user_profile, user_id)
             
-            # Pair jobs with similarity scores
-            job_scores = list(zip(jobs, similarities))
+            job_keys = [text_key(self.get_job_text(job)) for job in jobs]
+            job_matrix, positions = self.job_index.matrix(job_keys)
+            if not positions:
+                return []
             
-            # Sort by similarity (highest first)
-            job_scores.sort(key=lambda x: x[1], reverse=True)
+            # Cosine similarity of normalised vectors is a plain dot product
+            similarities = job_matrix @ user_embedding
             
-            return job_scores
+            # Top-k by similarity (highest first)
+            return [
+                (jobs[positions[i]], float(similarities[i]))
+                for i in top_k(similarities, limit)
+            ]
             
         except Exception as e:
             print(f"WARNING: Error in embedding similarity: {e}")
             return []
     
+    async def _get_tfidf_corpus(self, job_texts: List[str]) -> Optional[TfidfCorpus]:
+        """Get the TF-IDF model for this job corpus, fitting it (off-loop) only when the corpus changed."""
+        signature = text_key("\n".join(text_key(text) for text in job_texts))
+        corpus = self._tfidf_corpus
+        if corpus is not None and corpus.signature == signature:
+            return corpus
+        
+        async with self._tfidf_lock:
+            corpus = self._tfidf_corpus
+            if corpus is None or corpus.signature != signature:
+                corpus = await asyncio.get_event_loop().run_in_executor(
+                    None, TfidfCorpus.fit, signature, job_texts
+                )
+                self._tfidf_corpus = corpus
+            return corpus
+    
     async def calculate_job_similarity_tfidf(
         self, 
         user_profile: str, 
-        jobs: List[Dict[str, Any]]
+        jobs: List[Dict[str, Any]],
+        limit: Optional[int] = None
     ) -> List[Tuple[Dict[str, Any], float]]:
         """Fallback job similarity using TF-IDF (completely free)."""
-        if not user_profile.strip():
+        if not SKLEARN_AVAILABLE or not user_profile.strip():
             return []
         
         try:
-            # Prepare texts
             job_texts = [self.get_job_text(job) for job in jobs]
-            all_texts = [user_profile] + job_texts
-            
-            # Remove empty texts
-            valid_texts = [text for text in all_texts if text.strip()]
-            if len(valid_texts) < 2:
+            corpus = await self._get_tfidf_corpus(job_texts)
+            if corpus is None:
                 return []
             
-            # Calculate TF-IDF vectors
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(valid_texts)
-            
-            # Calculate similarities
-            user_vector = tfidf_matrix[0]
-            job_vectors = tfidf_matrix[1:]
-            
-            similarities = cosine_similarity(user_vector, job_vectors)[0]
-            
-            # Pair jobs with similarity scores
-            job_scores = list(zip(jobs, similarities))
-            
-            # Sort by similarity (highest first)
-            job_scores.sort(key=lambda x: x[1], reverse=True)
+            # Per request: transform one profile and one sparse mat-vec
+            similarities = await asyncio.get_event_loop().run_in_executor(
+                None, corpus.score, user_profile
+            )
             
-            return job_scores
+            # Top-k by similarity (highest first)
+            return [
+                (jobs[corpus.positions[i]], float(similarities[i]))
+                for i in top_k(similarities, limit)
+            ]
             
         except Exception as e:
             print(f"WARNING: Error in TF-IDF similarity: {e}")
@@ -248,12 +426,15 @@ class JobMatchingService:
                 for job in jobs[:limit]
             ]
         
-        # Calculate similarities using best available method
-        if SENTENCE_TRANSFORMERS_AVAILABLE and self.embedding_model:
-            job_scores = await self.calculate_job_similarity_embeddings(user_profile, jobs)
+        # Calculate similarities using best available method (TF-IDF until the model is ready)
+        self.start_model_loading()
+        if self.embedding_model:
+            job_scores = await self.calculate_job_similarity_embeddings(
+                user_profile, jobs, user_id=user_id, limit=limit
+            )
             method = "Semantic Embeddings"
         else:
-            job_scores = await self.calculate_job_similarity_tfidf(user_profile, jobs)
+            job_scores = await self.calculate_job_similarity_tfidf(user_profile, jobs, limit=limit)
             method = "TF-IDF"
         
         # Format recommendations
@@ -372,7 +553,12 @@ class JobMatchingService:
         """Get information about available matching capabilities."""
         return {
             "sentence_transformers_available": self.sentence_transformers_loaded,
-            "embedding_model": "all-MiniLM-L6-v2" if self.embedding_model else None,
+            "embedding_model": EMBEDDING_MODEL_NAME if self.embedding_model else None,
+            "model_ready": self.model_loader.ready,
+            "model_status": self.model_loader.status,
+            "model_backend": self.model_loader.backend,
+            "inference_queue": self.batcher.stats(),
+            "indexed_job_embeddings": len(self.job_index) if self.job_index is not None else 0,
             "fallback_method": "TF-IDF with scikit-learn",
             "features": [
                 "Semantic similarity matching",
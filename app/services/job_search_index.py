@@ -0,0 +1,171 @@
+"""
+Full-text search over job listings.
+
+On PostgreSQL jobs are matched against a weighted ``tsvector`` (title >
+company > description) backed by the ``ix_job_listings_search`` GIN
+expression index and ranked with ``ts_rank_cd``. On SQLite (local runs) an
+external-content FTS5 table kept in sync by triggers is used and ranked with
+``bm25``. Other dialects fall back to ``ILIKE``.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import and_, func, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.logger import logger
+from app.database.job_models import Job
+
+SEARCH_CONFIG = "english"
+
+# Must stay textually identical to the ix_job_listings_search index expression,
+# otherwise PostgreSQL will not use the index.
+JOB_SEARCH_VECTOR_SQL = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(job_listings.title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(job_listings.company_name, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(job_listings.description, '')), 'C'))"
+)
+
+SQLITE_FTS_TABLE = "job_listings_fts"
+
+# FTS5 table mirroring job_listings plus triggers keeping it in sync
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    "title, company_name, description, content='job_listings', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS job_listings_fts_ai AFTER INSERT ON job_listings BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, company_name, description) "
+    "VALUES (new.id, new.title, new.company_name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS job_listings_fts_ad AFTER DELETE ON job_listings BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, company_name, description) "
+    "VALUES ('delete', old.id, old.title, old.company_name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS job_listings_fts_au AFTER UPDATE ON job_listings BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, company_name, description) "
+    "VALUES ('delete', old.id, old.title, old.company_name, old.description); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, company_name, description) "
+    "VALUES (new.id, new.title, new.company_name, new.description); END",
+]
+
+# bm25 column weights (title, company_name, description); lower bm25 = better
+SQLITE_BM25 = f"bm25({SQLITE_FTS_TABLE}, 10.0, 5.0, 1.0)"
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class TextMatch:
+    """Filter and (optional) rank expression for a text query."""
+    condition: ColumnElement
+    rank: Optional[ColumnElement] = None  # Higher is more relevant
+
+
+def _phrases(terms: List[str]) -> List[str]:
+    """Split each term into plain words, dropping query-syntax characters."""
+    phrases = []
+    for term in terms:
+        words = _TERM_RE.findall(term or "")
+        if words:
+            phrases.append(" ".join(words))
+    return phrases
+
+
+class JobSearchIndex:
+    """Builds dialect-specific full-text match expressions for job listings."""
+
+    def __init__(self):
+        self._sqlite_ready = False
+
+    @staticmethod
+    def dialect_name(db: AsyncSession) -> str:
+        return db.get_bind().dialect.name
+
+    async def prepare(self, db: AsyncSession) -> None:
+        """Create the SQLite FTS table on first use (no-op on PostgreSQL)."""
+        if self._sqlite_ready or self.dialect_name(db) != "sqlite":
+            return
+        exists = await db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SQLITE_FTS_TABLE}
+        )
+        if exists.scalar() is None:
+            for statement in SQLITE_FTS_DDL:
+                await db.execute(text(statement))
+            await db.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"))
+            logger.info("Created SQLite FTS5 index for job listings")
+        self._sqlite_ready = True
+
+    def match(
+        self,
+        db: AsyncSession,
+        terms: List[str],
+        match_any: bool = False
+    ) -> Optional[TextMatch]:
+        """
+        Build a full-text match over title, company name and description.
+
+        Args:
+            db: Database session (used to pick the dialect)
+            terms: Words or phrases to match
+            match_any: Match any term instead of all of them
+
+        Returns:
+            TextMatch, or None when the terms contain nothing searchable
+        """
+        phrases = _phrases(terms)
+        if not phrases:
+            return None
+
+        dialect = self.dialect_name(db)
+        if dialect == "postgresql":
+            return self._postgres_match(phrases, match_any)
+        if dialect == "sqlite":
+            return self._sqlite_match(phrases, match_any)
+        return self._ilike_match(phrases, match_any)
+
+    @staticmethod
+    def _postgres_match(phrases: List[str], match_any: bool) -> TextMatch:
+        # websearch_to_tsquery treats quoted text as a phrase and "or" as OR
+        joiner = " or " if match_any else " "
+        query = func.websearch_to_tsquery(
+            literal_column(f"'{SEARCH_CONFIG}'::regconfig"),
+            joiner.join(f'"{phrase}"' for phrase in phrases)
+        )
+        vector = literal_column(JOB_SEARCH_VECTOR_SQL)
+        return TextMatch(
+            condition=vector.op("@@")(query),
+            rank=func.ts_rank_cd(vector, query)
+        )
+
+    @staticmethod
+    def _sqlite_match(phrases: List[str], match_any: bool) -> TextMatch:
+        joiner = " OR " if match_any else " AND "
+        fts_query = joiner.join(f'"{phrase}"' for phrase in phrases)
+        fts_match = literal_column(SQLITE_FTS_TABLE).op("MATCH")(fts_query)
+        rowid = literal_column(f"{SQLITE_FTS_TABLE}.rowid")
+
+        matching_ids = select(rowid).select_from(text(SQLITE_FTS_TABLE)).where(fts_match)
+        rank = (
+            select(-literal_column(SQLITE_BM25))
+            .select_from(text(SQLITE_FTS_TABLE))
+            .where(and_(fts_match, rowid == Job.id))
+            .scalar_subquery()
+        )
+        return TextMatch(condition=Job.id.in_(matching_ids), rank=rank)
+
+    @staticmethod
+    def _ilike_match(phrases: List[str], match_any: bool) -> TextMatch:
+        conditions = [
+            or_(
+                Job.title.ilike(f"%{phrase}%"),
+                Job.description.ilike(f"%{phrase}%"),
+                Job.company_name.ilike(f"%{phrase}%")
+            )
+            for phrase in phrases
+        ]
+        return TextMatch(condition=or_(*conditions) if match_any else and_(*conditions))
+
+
+# Global instance
+job_search_index = JobSearchIndex()
@@ -1,15 +1,18 @@
 """
 Real job search API integration service with smart matching.
 """
-import aiohttp
-import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from datetime import datetime, timedelta
 import json
 import re
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.fanout import fan_out
+from app.core.http_client import http_clients
+
+# Deadline for one live fetch across all job sources, in seconds
+SOURCE_FETCH_DEADLINE_SECONDS = 15.0
 
 
 class RemoteOKAPI:
@@ -18,7 +21,7 @@ class RemoteOKAPI:
     @staticmethod
     async def fetch_pm_jobs() -> List[Dict[str, Any]]:
         """Fetch project management jobs from RemoteOK."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("jobs") as session:
             try:
                 headers = {'User-Agent': 'Turn-Platform-Job-Search/1.0'}
                 async with session.get(settings.remoteok_api_url, headers=headers) as response:
@@ -45,7 +48,7 @@ class RemotiveAPI:
     @staticmethod
     async def fetch_pm_jobs() -> List[Dict[str, Any]]:
         """Fetch project management jobs from Remotive."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("jobs") as session:
             try:
                 params = {
                     'category': 'project-management',
@@ -67,7 +70,7 @@ class GitHubJobsAPI:
     @staticmethod
     async def fetch_pm_jobs() -> List[Dict[str, Any]]:
         """Fetch project management jobs from GitHub's career repositories."""
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("jobs") as session:
             try:
                 # Search for repositories with job postings
                 params = {
@@ -108,7 +111,7 @@ class AngelListAPI:
         """Fetch project management jobs from startups."""
         # Note: AngelList API requires authentication, this is a simplified version
         # In production, you'd need to register for API access
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("jobs") as session:
             try:
                 # This would require proper API key and authentication
                 # URL from settings: settings.angellist_api_url
@@ -128,7 +131,7 @@ class LinkedInJobsAPI:
         if not rapidapi_key:
             return []
         
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("jobs") as session:
             try:
                 headers = {
                     'X-RapidAPI-Key': rapidapi_key,
@@ -165,7 +168,7 @@ class IndeedAPI:
         if not rapidapi_key:
             return []
         
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("jobs") as session:
             try:
                 headers = {
                     'X-RapidAPI-Key': rapidapi_key,
@@ -201,7 +204,7 @@ class CrunchbaseAPI:
         if not api_key:
             return []
         
-        async with aiohttp.ClientSession() as session:
+        async with http_clients.session("jobs") as session:
             try:
                 headers = {
                     'X-cb-user-key': api_key,
@@ -265,55 +268,74 @@ class JobSearchService:
             'crunchbase': CrunchbaseAPI
         }
     
-    async def fetch_all_pm_jobs(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Fetch project management jobs from all sources."""
-        jobs = {}
-        
-        # Free APIs (no key required)
-        free_tasks = [
-            self._fetch_remoteok_jobs(),
-            self._fetch_remotive_jobs(),
-            self._fetch_github_jobs()
-        ]
-        
-        # Paid APIs (require keys)
-        paid_tasks = []
+    def get_source_fetchers(self) -> Dict[str, Callable[[], Awaitable[List[Dict[str, Any]]]]]:
+        """
+        Get live fetchers for every enabled source.
+        
+        Free sources are always enabled; paid sources only when their API
+        key is configured.
+        
+        Returns:
+            Dict mapping source name to a zero-argument coroutine function
+        """
+        fetchers = {
+            'remoteok': self._fetch_remoteok_jobs,
+            'remotive': self._fetch_remotive_jobs,
+            'github': self._fetch_github_jobs,
+        }
         
         linkedin_key = getattr(settings, 'linkedin_rapidapi_key', None)
         if linkedin_key:
-            paid_tasks.append(self._fetch_linkedin_jobs(linkedin_key))
+            fetchers['linkedin'] = lambda: self._fetch_linkedin_jobs(linkedin_key)
         
         indeed_key = getattr(settings, 'indeed_rapidapi_key', None)
         if indeed_key:
-            paid_tasks.append(self._fetch_indeed_jobs(indeed_key))
+            fetchers['indeed'] = lambda: self._fetch_indeed_jobs(indeed_key)
         
         crunchbase_key = getattr(settings, 'crunchbase_api_key', None)
         if crunchbase_key:
-            paid_tasks.append(self._fetch_crunchbase_jobs(crunchbase_key))
-        
-        # Execute all tasks
-        all_tasks = free_tasks + paid_tasks
-        results = await asyncio.gather(*all_tasks, return_exceptions=True)
-        
-        # Process results
-        jobs['remoteok'] = results[0] if len(results) > 0 and not isinstance(results[0], Exception) else []
-        jobs['remotive'] = results[1] if len(results) > 1 and not isinstance(results[1], Exception) else []
-        jobs['github'] = results[2] if len(results) > 2 and not isinstance(results[2], Exception) else []
-        
-        # Add paid API results
-        result_index = 3
-        if linkedin_key and len(results) > result_index:
-            jobs['linkedin'] = results[result_index] if not isinstance(results[result_index], Exception) else []
-            result_index += 1
-        
-        if indeed_key and len(results) > result_index:
-            jobs['indeed'] = results[result_index] if not isinstance(results[result_index], Exception) else []
-            result_index += 1
-        
-        if crunchbase_key and len(results) > result_index:
-            jobs['crunchbase'] = results[result_index] if not isinstance(results[result_index], Exception) else []
+            fetchers['crunchbase'] = lambda: self._fetch_crunchbase_jobs(crunchbase_key)
         
-        return jobs
+        return fetchers
+    
+    async def fetch_all_pm_jobs(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get project management jobs from all sources via the shared job feed.
+        
+        Served from the local job store (stale-while-revalidate); never waits
+        on third-party APIs.
+        """
+        # Import here to avoid circular imports
+        from app.services.job_feed_service import job_feed_service
+        return await job_feed_service.get_jobs()
+    
+    async def fetch_normalized_pm_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Get normalized jobs from the shared job feed.
+        
+        Jobs are normalized once at ingestion and deduplicated across sources
+        by content hash. The list is shared; don't mutate it or its jobs.
+        """
+        # Import here to avoid circular imports
+        from app.services.job_feed_service import job_feed_service
+        return await job_feed_service.get_normalized_jobs()
+    
+    async def fetch_all_pm_jobs_live(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch project management jobs from all sources directly (bypasses the feed).
+        
+        Sources are fetched concurrently; a source that fails, misses the
+        deadline or has an open circuit contributes an empty list.
+        """
+        results = await fan_out(
+            self.get_source_fetchers(),
+            deadline=SOURCE_FETCH_DEADLINE_SECONDS,
+            breaker_prefix="jobs"
+        )
+        return {
+            source: result.value if result.ok else []
+            for source, result in results.items()
+        }
     
     async def _fetch_remoteok_jobs(self) -> List[Dict[str, Any]]:
         """Fetch RemoteOK jobs."""
@@ -509,36 +531,8 @@ class JobSearchService:
             # Import here to avoid circular imports
             from app.services.job_matching_service import job_matching_service
             
-            # Fetch jobs from all free sources
-            all_jobs = []
-            
-            # Get jobs from free APIs
-            remoteok_jobs = await RemoteOKAPI.fetch_pm_jobs()
-            remotive_jobs = await RemotiveAPI.fetch_pm_jobs()
-            github_jobs = await GitHubJobsAPI.fetch_pm_jobs()
-            
-            # Combine and normalize jobs
-            for job in remoteok_jobs:
-                normalized_job = self._normalize_job_data(job, 'remoteok')
-                all_jobs.append(normalized_job)
-            
-            for job in remotive_jobs:
-                normalized_job = self._normalize_job_data(job, 'remotive')
-                all_jobs.append(normalized_job)
-            
-            for job in github_jobs:
-                normalized_job = self._normalize_job_data(job, 'github')
-                all_jobs.append(normalized_job)
-            
-            # Remove duplicates based on job title and company
-            unique_jobs = []
-            seen_jobs = set()
-            
-            for job in all_jobs:
-                job_key = f"{job.get('position', '')}-{job.get('company', '')}".lower()
-                if job_key not in seen_jobs:
-                    seen_jobs.add(job_key)
-                    unique_jobs.append(job)
+            # Normalized, deduplicated jobs from the shared feed (no live third-party calls)
+            unique_jobs = await self.fetch_normalized_pm_jobs()
             
             # Get smart recommendations
             recommendations = await job_matching_service.get_job_recommendations(
@@ -549,13 +543,8 @@ class JobSearchService:
             
         except Exception as e:
             print(f"Error getting personalized recommendations: {e}")
-            # Fallback to regular job search
-            jobs_data = await self.fetch_all_pm_jobs()
-            all_jobs = []
-            for source, jobs in jobs_data.items():
-                for job in jobs[:5]:  # Limit fallback
-                    all_jobs.append(self._normalize_job_data(job, source))
-            return all_jobs[:limit]
+            # Fallback to unranked jobs from the shared feed
+            return (await self.fetch_normalized_pm_jobs())[:limit]
     
     async def save_job_for_user(
         self, 
@@ -4,7 +4,7 @@ Job search and application management service.
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_, or_, func, desc, text
+from sqlalchemy import select, update, and_, func, desc, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
@@ -16,6 +16,8 @@ from app.database.job_models import (
     CompanyProfile
 )
 from app.database.cv_models import CV
+from app.core.utils import normalize_skill_name
+from app.services.job_search_index import job_search_index
 from app.schemas.job_schemas import (
     JobCreate, JobUpdate, JobResponse, JobListResponse,
     JobApplicationCreate, JobApplicationUpdate, JobApplicationResponse,
@@ -108,16 +110,13 @@ class JobService:
         
         conditions = [Job.is_active.is_(True)]
         
-        # Text search
+        # Full-text search (GIN-indexed tsvector on PostgreSQL, FTS5 on SQLite)
+        text_match = None
         if search_params.query:
-            search_term = f"%{search_params.query}%"
-            conditions.append(
-                or_(
-                    Job.title.ilike(search_term),
-                    Job.description.ilike(search_term),
-                    Job.company_name.ilike(search_term)
-                )
-            )
+            await job_search_index.prepare(db)
+            text_match = job_search_index.match(db, search_params.query.split())
+            if text_match is not None:
+                conditions.append(text_match.condition)
         
         # Location filter
         if search_params.location:
@@ -150,12 +149,12 @@ class JobService:
         if getattr(search_params, "is_remote_friendly", None):
             conditions.append(Job.is_remote_friendly.is_(True))
         
-        # Skills
+        # Skills (exact match on the indexed normalized key)
         if search_params.required_skills:
             for skill in search_params.required_skills:
                 conditions.append(
                     Job.skill_requirements.any(
-                        JobSkillRequirement.skill_name.ilike(f"%{skill}%")
+                        JobSkillRequirement.skill_key == normalize_skill_name(skill)
                     )
                 )
         
@@ -182,9 +181,8 @@ class JobService:
             query = query.order_by(desc(Job.salary_max))
         elif sort_by == "posted_date_asc":
             query = query.order_by(Job.posted_at.asc())
-        elif sort_by in {"relevance", "posted_date_desc"}:
-            # TODO: Implement relevance scoring based on user profile
-            query = query.order_by(desc(Job.posted_at))
+        elif sort_by == "relevance" and text_match is not None and text_match.rank is not None:
+            query = query.order_by(desc(text_match.rank), desc(Job.posted_at))
         else:
             query = query.order_by(desc(Job.posted_at))
         
@@ -425,6 +423,8 @@ class JobService:
         Returns:
             Summary of alert processing
         """
+        await job_search_index.prepare(db)
+        
         # Get all active alerts
         result = await db.execute(
             select(JobAlert).where(JobAlert.is_active == True)
@@ -450,22 +450,14 @@ class JobService:
             conditions = []
             
             if alert.keywords:
-                keyword_conditions = []
                 keyword_list = (
                     alert.keywords
                     if isinstance(alert.keywords, list)
                     else [kw.strip() for kw in str(alert.keywords).split(",") if kw.strip()]
                 )
-                for keyword in keyword_list:
-                    keyword_term = f"%{keyword}%"
-                    keyword_conditions.append(
-                        or_(
-                            Job.title.ilike(keyword_term),
-                            Job.description.ilike(keyword_term)
-                        )
-                    )
-                if keyword_conditions:
-                    conditions.append(or_(*keyword_conditions))
+                keyword_match = job_search_index.match(db, keyword_list, match_any=True)
+                if keyword_match is not None:
+                    conditions.append(keyword_match.condition)
             
             if alert.location:
                 location_term = f"%{alert.location}%"
@@ -21,6 +21,7 @@ from app.schemas.platform_schemas import (
     SimulationResponse, LearningPathResponse, PlatformAnalyticsResponse
 )
 from app.core.logger import logger
+from app.core.database import read_session
 
 
 class PlatformService:
@@ -250,9 +251,19 @@ class PlatformService:
         self,
         db: AsyncSession,
         user_id: Optional[int] = None,
-        admin_view: bool = False
+        admin_view: bool = False,
+        readonly: bool = False
     ) -> PlatformAnalyticsResponse:
-        """Get platform-wide analytics and statistics."""
+        """
+        Get platform-wide analytics and statistics.
+        
+        With ``readonly=True`` the queries run on a read-replica session
+        (falling back to the primary) instead of ``db``.
+        """
+        if readonly:
+            async with read_session() as replica_db:
+                return await self.get_platform_analytics(replica_db, user_id, admin_view)
+        
         try:
             if admin_view:
                 # Admin view - platform-wide stats
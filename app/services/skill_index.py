@@ -0,0 +1,167 @@
+"""
+Skill normalization and set-based skill matching.
+
+A canonical skill dictionary (with synonyms) is compiled into a token n-gram
+index. Each job's skills and token set are extracted once, at feed ingestion
+or on first use, and cached; matching a user's skills against a job is then
+a set intersection instead of a substring scan per (skill, job) pair.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+# Canonical skill -> synonyms (matched on token boundaries, case-insensitive)
+SKILL_SYNONYMS: Dict[str, List[str]] = {
+    "project management": ["project manager", "project managing", "pmp", "prince2"],
+    "product management": ["product manager", "product owner", "product ownership"],
+    "program management": ["program manager", "programme management", "programme manager"],
+    "agile": ["agile methodology", "agile methodologies", "agile delivery"],
+    "scrum": ["scrum master", "scrum framework"],
+    "kanban": [],
+    "waterfall": [],
+    "lean": ["lean six sigma", "six sigma"],
+    "stakeholder management": ["stakeholder engagement", "stakeholders", "stakeholder"],
+    "risk management": ["risk assessment", "risk mitigation"],
+    "budgeting": ["budget management", "budget planning", "budgets"],
+    "scheduling": ["project scheduling", "schedule management"],
+    "resource allocation": ["resource planning", "resource management"],
+    "roadmapping": ["roadmap", "roadmaps", "product roadmap"],
+    "strategy": ["strategic planning", "business strategy"],
+    "leadership": ["team leadership", "people management", "team lead"],
+    "communication": ["communication skills", "communications"],
+    "data analysis": ["data analytics", "analytics", "data analyst"],
+    "reporting": ["status reporting", "reports"],
+    "change management": [],
+    "jira": ["atlassian jira"],
+    "confluence": ["atlassian confluence"],
+    "asana": [],
+    "trello": [],
+    "ms project": ["microsoft project"],
+    "excel": ["microsoft excel", "ms excel", "spreadsheets"],
+    "sql": [],
+    "postgresql": ["postgres"],
+    "mysql": [],
+    "python": [],
+    "javascript": ["js", "ecmascript"],
+    "typescript": [],
+    "node.js": ["nodejs"],
+    "react": ["react.js", "reactjs"],
+    "java": [],
+    "c#": ["csharp"],
+    ".net": ["dotnet"],
+    "c++": ["cpp"],
+    "golang": ["go lang"],
+    "aws": ["amazon web services"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "machine learning": ["ml"],
+    "artificial intelligence": ["ai"],
+    "devops": ["ci/cd", "continuous integration", "continuous delivery"],
+    "software development": ["software engineering", "software development lifecycle", "sdlc"],
+    "ux design": ["user experience", "ux"],
+    "ui design": ["user interface design", "ui"],
+}
+
+# Tokens: words plus the symbols that make up skill names (c++, c#, node.js, .net).
+# "/" separates tokens ("Agile/Scrum"; "ci/cd" is the phrase ci cd) and a
+# trailing "." is sentence punctuation, never part of a token.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9][+#]*|\.[a-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase skill-aware tokenization."""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+@dataclass(frozen=True)
+class JobSkillFeatures:
+    """Skills and tokens extracted once per job."""
+    skills: FrozenSet[str]  # Canonical dictionary skills found in the job
+    tokens: FrozenSet[str]  # All tokens, for skills outside the dictionary
+
+
+class SkillIndex:
+    """Compiled synonym dictionary plus a per-job feature cache."""
+
+    def __init__(self, synonyms: Dict[str, List[str]] = SKILL_SYNONYMS, max_cached_jobs: int = 20000):
+        self._phrases: Dict[Tuple[str, ...], str] = {}
+        for canonical, aliases in synonyms.items():
+            for phrase in [canonical, *aliases]:
+                tokens = tuple(tokenize(phrase))
+                if tokens:
+                    self._phrases.setdefault(tokens, canonical)
+        self._max_phrase_len = max((len(tokens) for tokens in self._phrases), default=1)
+        self.max_cached_jobs = max_cached_jobs
+        self._jobs: "OrderedDict[str, JobSkillFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def canonicalize(self, skill: str) -> str:
+        """Map a skill name to its canonical form (normalized name if unknown)."""
+        tokens = tuple(tokenize(skill))
+        return self._phrases.get(tokens, " ".join(tokens))
+
+    def extract(self, text: str) -> JobSkillFeatures:
+        """Extract dictionary skills and the token set from free text."""
+        tokens = tokenize(text)
+        skills = set()
+        for i in range(len(tokens)):
+            for n in range(1, min(self._max_phrase_len, len(tokens) - i) + 1):
+                canonical = self._phrases.get(tuple(tokens[i:i + n]))
+                if canonical:
+                    skills.add(canonical)
+        return JobSkillFeatures(skills=frozenset(skills), tokens=frozenset(tokens))
+
+    def job_features(self, job: Dict[str, Any]) -> JobSkillFeatures:
+        """Cached features for a normalized job (title, description, listed skills)."""
+        listed = job.get("skills_required") or []
+        if isinstance(listed, str):
+            listed = [listed]
+        text = " ".join([job.get("title") or "", job.get("description") or "", *map(str, listed)])
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            features = self._jobs.get(key)
+            if features is not None:
+                self._jobs.move_to_end(key)
+                return features
+
+        features = self.extract(text)
+        with self._lock:
+            self._jobs[key] = features
+            while len(self._jobs) > self.max_cached_jobs:
+                self._jobs.popitem(last=False)
+        return features
+
+    def index_jobs(self, jobs: Iterable[Dict[str, Any]]) -> None:
+        """Warm the feature cache for newly ingested jobs."""
+        for job in jobs:
+            self.job_features(job)
+
+    def matching_skills(self, skills: Iterable[str], features: JobSkillFeatures) -> List[str]:
+        """
+        Skills (as given) that the job asks for.
+
+        Dictionary skills and their synonyms match by set membership; other
+        skills match when all their tokens occur in the job.
+        """
+        matched = []
+        for skill in skills:
+            tokens = tuple(tokenize(skill))
+            if not tokens:
+                continue
+            canonical = self._phrases.get(tokens)
+            if canonical is not None:
+                if canonical in features.skills:
+                    matched.append(skill)
+            elif features.tokens.issuperset(tokens):
+                matched.append(skill)
+        return matched
+
+
+# Global instance
+skill_index = SkillIndex()
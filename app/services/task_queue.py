@@ -0,0 +1,345 @@
+"""
+Durable, database-backed task queue.
+
+Tasks are rows in ``task_queue``. Workers claim due tasks under a lease
+(``SELECT ... FOR UPDATE SKIP LOCKED`` on PostgreSQL; a compare-and-set
+``UPDATE`` per task on SQLite, which serializes writers), run the registered
+handler and mark the task succeeded in the handler's own transaction. Failed
+tasks are retried with exponential backoff until ``max_attempts``; a task
+whose worker died is picked up again once its lease expires. Tasks enqueued
+with an idempotency key are only ever created once.
+
+Run workers with ``python scripts/task_worker.py``.
+"""
+import asyncio
+import os
+import random
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, savepoint
+from app.core.logger import logger
+from app.core.utils import utc_now
+from app.database.task_models import QueuedTask, TaskStatus
+
+TaskHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[None]]
+
+DEFAULT_LEASE_SECONDS = 300
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of attempts."""
+    delay = min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _update():
+    # Bulk statements skip the session sync; claimed tasks are re-read afterwards
+    return update(QueuedTask).execution_options(synchronize_session=False)
+
+
+def _delete():
+    return delete(QueuedTask).execution_options(synchronize_session=False)
+
+
+class TaskQueue:
+    """Enqueue, claim, complete and retry tasks stored in the database."""
+
+    def __init__(self, lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        self.lease_seconds = lease_seconds
+        self.handlers: Dict[str, TaskHandler] = {}
+
+    def register(self, task_type: str, handler: TaskHandler) -> None:
+        """Register the coroutine that runs tasks of ``task_type``."""
+        self.handlers[task_type] = handler
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        task_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        run_at: Optional[datetime] = None,
+        max_attempts: int = 5
+    ) -> QueuedTask:
+        """
+        Add a task (flushed, committed with the caller's transaction).
+
+        If ``idempotency_key`` was used before, the existing task is returned
+        and nothing is enqueued.
+        """
+        if idempotency_key is not None:
+            existing = await self._get_by_key(db, idempotency_key)
+            if existing is not None:
+                return existing
+
+        task = QueuedTask(
+            task_type=task_type,
+            payload=payload or {},
+            idempotency_key=idempotency_key,
+            status=TaskStatus.QUEUED,
+            run_at=run_at or utc_now(),
+            max_attempts=max_attempts
+        )
+        try:
+            async with savepoint(db):
+                db.add(task)
+                await db.flush()
+        except IntegrityError:
+            # Enqueued concurrently by another process
+            existing = await self._get_by_key(db, idempotency_key) if idempotency_key else None
+            if existing is None:
+                raise
+            return existing
+        return task
+
+    @staticmethod
+    async def _get_by_key(db: AsyncSession, idempotency_key: str) -> Optional[QueuedTask]:
+        result = await db.execute(
+            select(QueuedTask).where(QueuedTask.idempotency_key == idempotency_key)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _claimable(now: datetime):
+        return and_(
+            QueuedTask.attempts < QueuedTask.max_attempts,
+            or_(
+                and_(QueuedTask.status == TaskStatus.QUEUED, QueuedTask.run_at <= now),
+                and_(QueuedTask.status == TaskStatus.RUNNING, QueuedTask.lease_expires_at < now)
+            )
+        )
+
+    async def claim(self, db: AsyncSession, worker_id: str, limit: int) -> List[QueuedTask]:
+        """Lease up to ``limit`` due tasks for ``worker_id`` and commit the claim."""
+        now = utc_now()
+        await self._bury_expired(db, now)
+
+        claim_values = {
+            "status": TaskStatus.RUNNING,
+            "locked_by": worker_id,
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            "attempts": QueuedTask.attempts + 1,
+        }
+        candidates = (
+            select(QueuedTask.id)
+            .where(self._claimable(now))
+            .order_by(QueuedTask.run_at, QueuedTask.id)
+            .limit(limit)
+        )
+
+        if db.get_bind().dialect.name == "postgresql":
+            # Rows locked by other workers are skipped rather than waited on
+            ids = list((await db.execute(candidates.with_for_update(skip_locked=True))).scalars())
+            if ids:
+                await db.execute(
+                    _update().where(QueuedTask.id.in_(ids)).values(**claim_values)
+                )
+        else:
+            ids = []
+            for task_id in (await db.execute(candidates)).scalars().all():
+                result = await db.execute(
+                    _update()
+                    .where(and_(QueuedTask.id == task_id, self._claimable(now)))
+                    .values(**claim_values)
+                )
+                if result.rowcount:
+                    ids.append(task_id)
+        await db.commit()
+
+        if not ids:
+            return []
+        result = await db.execute(
+            select(QueuedTask)
+            .where(QueuedTask.id.in_(ids))
+            .order_by(QueuedTask.run_at, QueuedTask.id)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars())
+
+    async def _bury_expired(self, db: AsyncSession, now: datetime) -> None:
+        """Mark tasks whose last allowed attempt lost its lease as dead."""
+        await db.execute(
+            _update()
+            .where(
+                and_(
+                    QueuedTask.status == TaskStatus.RUNNING,
+                    QueuedTask.lease_expires_at < now,
+                    QueuedTask.attempts >= QueuedTask.max_attempts
+                )
+            )
+            .values(status=TaskStatus.DEAD, locked_by=None, last_error="Lease expired on final attempt")
+        )
+
+    async def extend_lease(self, db: AsyncSession, task_id: int, worker_id: str) -> bool:
+        """Push the lease forward while a long task is still running."""
+        result = await db.execute(
+            _update()
+            .where(and_(QueuedTask.id == task_id, QueuedTask.locked_by == worker_id))
+            .values(lease_expires_at=utc_now() + timedelta(seconds=self.lease_seconds))
+        )
+        await db.commit()
+        return bool(result.rowcount)
+
+    async def complete(self, db: AsyncSession, task_id: int, worker_id: str) -> None:
+        """Mark a task succeeded and commit (together with the handler's writes)."""
+        await db.execute(
+            _update()
+            .where(and_(QueuedTask.id == task_id, QueuedTask.locked_by == worker_id))
+            .values(status=TaskStatus.SUCCEEDED, locked_by=None, lease_expires_at=None, completed_at=utc_now())
+        )
+        await db.commit()
+
+    async def fail(self, db: AsyncSession, task: QueuedTask, worker_id: str, error: str) -> None:
+        """Schedule a retry with backoff, or mark the task dead when out of attempts."""
+        if task.attempts >= task.max_attempts:
+            values = {"status": TaskStatus.DEAD}
+        else:
+            values = {
+                "status": TaskStatus.QUEUED,
+                "run_at": utc_now() + timedelta(seconds=retry_delay(task.attempts)),
+            }
+        await db.execute(
+            _update()
+            .where(and_(QueuedTask.id == task.id, QueuedTask.locked_by == worker_id))
+            .values(locked_by=None, lease_expires_at=None, last_error=error[:2000], **values)
+        )
+        await db.commit()
+
+    async def pending_count(self, db: AsyncSession, task_type: Optional[str] = None) -> int:
+        """Queued or running tasks (for backpressure and monitoring)."""
+        query = select(func.count(QueuedTask.id)).where(
+            QueuedTask.status.in_([TaskStatus.QUEUED, TaskStatus.RUNNING])
+        )
+        if task_type is not None:
+            query = query.where(QueuedTask.task_type == task_type)
+        return await db.scalar(query) or 0
+
+    async def stats(self, db: AsyncSession) -> Dict[str, Dict[str, int]]:
+        """Task counts per type and status."""
+        result = await db.execute(
+            select(QueuedTask.task_type, QueuedTask.status, func.count(QueuedTask.id))
+            .group_by(QueuedTask.task_type, QueuedTask.status)
+        )
+        stats: Dict[str, Dict[str, int]] = {}
+        for task_type, status, count in result:
+            stats.setdefault(task_type, {})[status.value] = count
+        return stats
+
+    async def purge(
+        self,
+        db: AsyncSession,
+        older_than: timedelta = timedelta(days=7),
+        dead_older_than: timedelta = timedelta(days=30)
+    ) -> int:
+        """Delete succeeded tasks completed, and dead tasks last updated, before the cut-offs."""
+        now = utc_now()
+        result = await db.execute(
+            _delete().where(
+                or_(
+                    and_(
+                        QueuedTask.status == TaskStatus.SUCCEEDED,
+                        QueuedTask.completed_at < now - older_than
+                    ),
+                    and_(
+                        QueuedTask.status == TaskStatus.DEAD,
+                        QueuedTask.updated_at < now - dead_older_than
+                    )
+                )
+            )
+        )
+        await db.commit()
+        return result.rowcount or 0
+
+
+class TaskWorker:
+    """Claims tasks and runs them concurrently, each in its own session."""
+
+    def __init__(
+        self,
+        queue: "TaskQueue",
+        concurrency: int = 4,
+        poll_interval: float = 2.0,
+        worker_id: Optional[str] = None
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.processed = 0
+        self.failed = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Claim and execute tasks until ``stop`` is set, then drain running tasks."""
+        running: set = set()
+        logger.info(f"Task worker {self.worker_id} started (concurrency {self.concurrency})")
+
+        while not stop.is_set():
+            claimed = []
+            free = self.concurrency - len(running)
+            if free > 0:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        claimed = await self.queue.claim(db, self.worker_id, free)
+                except Exception as e:
+                    logger.error(f"Task worker {self.worker_id} failed to claim tasks: {e}")
+
+            for task in claimed:
+                execution = asyncio.create_task(self.execute(task))
+                running.add(execution)
+                execution.add_done_callback(running.discard)
+
+            if not claimed:
+                # Idle or full: wake on stop, a finished task, or the next poll
+                waiters = [asyncio.create_task(stop.wait()), *running]
+                await asyncio.wait(
+                    waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                waiters[0].cancel()
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        logger.info(f"Task worker {self.worker_id} stopped ({self.processed} done, {self.failed} failed)")
+
+    async def execute(self, task: QueuedTask) -> None:
+        """Run one claimed task; its writes and the completion commit together."""
+        handler = self.queue.handlers.get(task.task_type)
+        renewal = asyncio.create_task(self._renew_lease(task.id))
+        try:
+            async with AsyncSessionLocal() as db:
+                try:
+                    if handler is None:
+                        raise LookupError(f"No handler registered for task type {task.task_type}")
+                    await handler(db, dict(task.payload or {}))
+                    await self.queue.complete(db, task.id, self.worker_id)
+                    self.processed += 1
+                    return
+                except Exception as e:
+                    await db.rollback()
+                    error = f"{type(e).__name__}: {e}"
+            self.failed += 1
+            logger.error(f"Task {task.id} ({task.task_type}) attempt {task.attempts} failed: {error}")
+            async with AsyncSessionLocal() as db:
+                await self.queue.fail(db, task, self.worker_id, error)
+        finally:
+            renewal.cancel()
+
+    async def _renew_lease(self, task_id: int) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.queue.extend_lease(db, task_id, self.worker_id)
+            except Exception as e:
+                logger.warning(f"Could not extend lease for task {task_id}: {e}")
+
+
+# Global instance
+task_queue = TaskQueue()
@@ -0,0 +1,103 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.auto_application_service import (
+    AutoApplicationCriteria, JobCandidateSnapshot, auto_application_service
+)
+from app.services.batch_job_matcher import CandidateMatcher
+
+
+def _snapshot(jobs):
+    return JobCandidateSnapshot.from_jobs(jobs)
+
+
+def test_top_matches_skips_nan_masked_and_low_scores_best_first():
+    scores = np.array([
+        [0.9, np.nan, 0.8, 0.95, 0.5],
+        [0.1, 0.2, 0.3, 0.4, 0.5],
+    ])
+    masks = np.array([
+        [True, True, True, False, True],
+        [True, True, True, True, True],
+    ])
+    min_scores = np.array([0.6, 0.25])
+
+    top = CandidateMatcher.top_matches(scores, masks, min_scores, limit=2)
+
+    assert top[0] == [(0, pytest.approx(0.9)), (2, pytest.approx(0.8))]
+    assert top[1] == [(4, pytest.approx(0.5)), (3, pytest.approx(0.4))]
+
+
+def test_top_matches_handles_limit_above_job_count_and_empty_input():
+    scores = np.array([[0.7, 0.9]])
+    masks = np.ones((1, 2), bool)
+
+    assert CandidateMatcher.top_matches(scores, masks, np.array([0.0]), limit=10) == [
+        [(1, pytest.approx(0.9)), (0, pytest.approx(0.7))]
+    ]
+    assert CandidateMatcher.top_matches(np.zeros((2, 0)), np.zeros((2, 0), bool), np.zeros(2), 5) == [[], []]
+
+
+def test_mask_applies_location_remote_salary_company_and_experience():
+    jobs = [
+        {"title": "Project Manager", "description": "Deliver projects", "location": "Lagos", "company": "Acme", "salary_min": 50000},
+        {"title": "Project Manager", "description": "Remote role", "location": "Remote", "company": "Beta", "salary_min": 0},
+        {"title": "Senior Project Manager", "description": "senior role", "location": "Lagos", "company": "Gamma"},
+        {"title": "Project Manager", "description": "entry level", "location": "Abuja", "company": "Acme Corp", "salary_min": 20000},
+    ]
+    matcher = _snapshot(jobs).matcher
+
+    criteria = AutoApplicationCriteria(preferred_locations=["Lagos"], experience_level_match=False)
+    assert matcher.mask(criteria, 5).tolist() == [True, False, True, False]
+
+    criteria = AutoApplicationCriteria(remote_only=True, experience_level_match=False)
+    assert matcher.mask(criteria, 5).tolist() == [False, True, False, False]
+
+    criteria = AutoApplicationCriteria(salary_min=30000, excluded_companies=["beta"], experience_level_match=False)
+    assert matcher.mask(criteria, 5).tolist() == [True, False, True, False]
+
+    criteria = AutoApplicationCriteria()
+    assert matcher.mask(criteria, 1).tolist() == [True, True, False, True]
+    assert matcher.mask(criteria, None).tolist() == [True, True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_mask_matches_per_user_filters():
+    rng = random.Random(7)
+    locations = ["Lagos", "Remote", "London", "Nairobi (Remote)", ""]
+    companies = ["Acme", "Beta Ltd", "Gamma", "Delta Labs"]
+    words = ["agile", "scrum", "jira", "senior", "junior", "budgeting", "stakeholder", "python", "lead", "intern"]
+    jobs = [
+        {
+            "id": str(i),
+            "title": rng.choice(["Project Manager", "Product Owner", "Scrum Master"]),
+            "description": " ".join(rng.sample(words, 4)),
+            "location": rng.choice(locations),
+            "company": rng.choice(companies),
+            "salary_min": rng.choice([None, 0, 30000, 60000]),
+        }
+        for i in range(60)
+    ]
+    snapshot = _snapshot(jobs)
+    criteria_list = [
+        AutoApplicationCriteria(),
+        AutoApplicationCriteria(preferred_locations=["lagos", "london"], remote_only=True),
+        AutoApplicationCriteria(required_skills=["Agile", "Jira", "Budgeting"], salary_min=40000),
+        AutoApplicationCriteria(excluded_companies=["acme"], experience_level_match=False),
+    ]
+
+    for criteria in criteria_list:
+        for years in (0, 5, 10):
+            filtered = await auto_application_service._fetch_fresh_job_postings(None, criteria, snapshot)
+            expected = []
+            for job in jobs:
+                recommendation = SimpleNamespace(job=job, similarity_score=1.0)
+                passes = any(job is kept for kept in filtered) and await auto_application_service._meets_auto_application_criteria(
+                    recommendation, criteria, {"years_of_experience": years}
+                )
+                expected.append(passes)
+
+            assert snapshot.matcher.mask(criteria, years).tolist() == expected
@@ -0,0 +1,96 @@
+import time
+
+from app.services import crawl_cache
+from app.services.crawl_cache import CachedPage, CrawlCache
+
+
+def _page(url="https://example.com/careers", status=200, fetched_at=None, **kwargs):
+    return CachedPage(
+        url=url,
+        status=status,
+        body=kwargs.get("body", "<html>jobs</html>"),
+        etag=kwargs.get("etag", '"abc"'),
+        last_modified=kwargs.get("last_modified", "Mon, 01 Jan 2024 00:00:00 GMT"),
+        fetched_at=time.time() if fetched_at is None else fetched_at,
+    )
+
+
+def test_page_round_trips_through_disk(tmp_path):
+    CrawlCache(str(tmp_path)).put_page(_page())
+
+    page = CrawlCache(str(tmp_path)).get_page("https://example.com/careers")
+
+    assert page is not None
+    assert page.body == "<html>jobs</html>"
+    assert page.fresh
+
+
+def test_memory_only_cache_and_missing_pages():
+    cache = CrawlCache()
+    cache.put_page(_page())
+
+    assert cache.get_page("https://example.com/careers").status == 200
+    assert cache.get_page("https://example.com/other") is None
+
+
+def test_validators_only_for_successful_pages():
+    assert _page().validators() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert _page(etag=None).validators() == {"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert _page(status=404).validators() == {}
+
+
+def test_stale_and_expired_pages(tmp_path):
+    cache = CrawlCache(str(tmp_path))
+    stale = _page(fetched_at=time.time() - crawl_cache.PAGE_FRESH_SECONDS - 1)
+    expired = _page(url="https://example.com/old", fetched_at=time.time() - crawl_cache.PAGE_MAX_AGE_SECONDS - 1)
+    cache.put_page(stale)
+    cache.put_page(expired)
+
+    assert not cache.get_page(stale.url).fresh
+    assert cache.get_page(expired.url) is None
+
+
+def test_unreadable_disk_entry_is_a_miss(tmp_path):
+    cache = CrawlCache(str(tmp_path))
+    cache.put_page(_page())
+    with open(cache._page_path("https://example.com/careers"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    assert CrawlCache(str(tmp_path)).get_page("https://example.com/careers") is None
+
+
+def test_memory_is_bounded(monkeypatch):
+    monkeypatch.setattr(crawl_cache, "MEMORY_ENTRIES", 2)
+    cache = CrawlCache()
+    for i in range(3):
+        cache.put_page(_page(url=f"https://example.com/{i}"))
+
+    assert cache.get_page("https://example.com/0") is None
+    assert cache.get_page("https://example.com/2") is not None
+
+
+def test_career_pages_are_remembered_across_instances(tmp_path):
+    cache = CrawlCache(str(tmp_path))
+    assert cache.career_page("example.com") == (False, None)
+
+    cache.remember_career_page("example.com", "https://example.com/careers")
+    cache.remember_career_page("nojobs.com", None)
+
+    reloaded = CrawlCache(str(tmp_path))
+    assert reloaded.career_page("example.com") == (True, "https://example.com/careers")
+    assert reloaded.career_page("nojobs.com") == (True, None)
+
+
+def test_career_page_entries_expire(monkeypatch):
+    cache = CrawlCache()
+    cache.remember_career_page("example.com", "https://example.com/careers")
+    cache.remember_career_page("nojobs.com", None)
+
+    later = time.time() + crawl_cache.NO_CAREER_PAGE_TTL_SECONDS + 1
+    monkeypatch.setattr(crawl_cache.time, "time", lambda: later)
+
+    assert cache.career_page("example.com") == (True, "https://example.com/careers")
+    assert cache.career_page("nojobs.com") == (False, None)
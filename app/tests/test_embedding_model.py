@@ -0,0 +1,77 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+
+from app.services import embedding_model
+from app.services.embedding_model import RemoteEmbeddingModel
+
+
+class _FakeResponse:
+    def __init__(self, texts):
+        self._texts = texts
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    def raise_for_status(self):
+        return None
+
+    async def json(self):
+        return {"embeddings": [[float(len(text)), 1.0] for text in self._texts]}
+
+
+class _FakeClients:
+    def __init__(self):
+        self.requests = []
+
+    @asynccontextmanager
+    async def session(self, name="default"):
+        yield self
+
+    def post(self, url, json):
+        self.requests.append(json["texts"])
+        return _FakeResponse(json["texts"])
+
+
+@pytest.mark.asyncio
+async def test_remote_model_splits_requests_at_worker_limit(monkeypatch):
+    clients = _FakeClients()
+    monkeypatch.setattr(embedding_model, "http_clients", clients)
+    texts = ["x" * (i % 7) for i in range(1100)]
+
+    vectors = await RemoteEmbeddingModel("http://worker", max_texts=512).encode_async(texts)
+
+    assert [len(chunk) for chunk in clients.requests] == [512, 512, 76]
+    assert vectors.shape == (1100, 2)
+    assert np.array_equal(vectors[:, 0], [len(text) for text in texts])
+
+
+class _FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(len(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_batcher_never_sends_more_than_max_batch_texts():
+    model = _FakeModel()
+    batcher = embedding_model.EmbeddingBatcher(lambda: model, max_wait_ms=20, max_batch_texts=64)
+    small = ["a" * (i % 5) for i in range(63)]
+    large = ["b" * (i % 9) for i in range(500)]
+    try:
+        small_vectors, large_vectors = await asyncio.gather(batcher.encode(small), batcher.encode(large))
+    finally:
+        await batcher.stop()
+
+    assert max(model.calls) <= 64
+    assert sum(model.calls) == 563
+    assert np.array_equal(small_vectors[:, 0], [len(text) for text in small])
+    assert np.array_equal(large_vectors[:, 0], [len(text) for text in large])
@@ -0,0 +1,29 @@
+from app.services.skill_index import SkillIndex, tokenize
+
+
+def test_tokenize_splits_slashes_and_drops_trailing_dots():
+    assert tokenize("Experience with Agile/Scrum and Jira/Confluence.") == [
+        "experience", "with", "agile", "scrum", "and", "jira", "confluence"
+    ]
+    assert tokenize("C++, C#, Node.js and .NET; CI/CD.") == [
+        "c++", "c#", "node.js", "and", ".net", "ci", "cd"
+    ]
+
+
+def test_matching_skills_with_slash_joined_and_punctuated_text():
+    index = SkillIndex()
+    features = index.extract("Experience with Agile/Scrum and Jira/Confluence. Python, SQL.")
+
+    assert index.matching_skills(["Scrum", "Jira", "agile", "Confluence"], features) == [
+        "Scrum", "Jira", "agile", "Confluence"
+    ]
+    assert index.matching_skills(["python", "sql"], features) == ["python", "sql"]
+    assert "devops" in index.extract("Own our CI/CD pipelines").skills
+
+
+def test_related_technologies_are_not_synonyms():
+    index = SkillIndex()
+
+    assert index.matching_skills(["PostgreSQL"], index.extract("MySQL and SQL Server")) == []
+    assert index.matching_skills(["C#"], index.extract("Experience with .NET")) == []
+    assert index.matching_skills(["Postgres"], index.extract("PostgreSQL 15")) == ["Postgres"]
@@ -0,0 +1,161 @@
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import MetaData, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+
+from app.core.utils import utc_now
+from app.database import task_models
+from app.database.task_models import TaskStatus
+from app.services import task_queue
+from app.services.task_queue import TaskQueue
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class QueuedTask(_Base):
+    """The task table mapped on its own, so the app's other mappers are never configured."""
+
+    __table__ = task_models.QueuedTask.__table__.to_metadata(MetaData())
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    monkeypatch.setattr(task_queue, "QueuedTask", QueuedTask)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(QueuedTask.__table__.create)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def _expire_lease(db, task_id):
+    await db.execute(
+        update(QueuedTask)
+        .where(QueuedTask.id == task_id)
+        .values(lease_expires_at=utc_now() - timedelta(seconds=1))
+    )
+    await db.commit()
+
+
+async def _make_due(db, task_id):
+    await db.execute(
+        update(QueuedTask)
+        .where(QueuedTask.id == task_id)
+        .values(run_at=utc_now() - timedelta(seconds=1))
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_with_idempotency_key_creates_one_task(db):
+    queue = TaskQueue()
+    first = await queue.enqueue(db, "scan_user", {"user_id": "u1"}, idempotency_key="scan:u1")
+    second = await queue.enqueue(db, "scan_user", {"user_id": "u1"}, idempotency_key="scan:u1")
+    await db.commit()
+
+    assert first.id == second.id
+    assert await queue.pending_count(db) == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_due_tasks_once(db):
+    queue = TaskQueue()
+    for i in range(3):
+        await queue.enqueue(db, "scan_user", {"n": i})
+    await queue.enqueue(db, "scan_user", {"n": 3}, run_at=utc_now() + timedelta(hours=1))
+    await db.commit()
+
+    claimed = await queue.claim(db, "worker-a", limit=2)
+    assert [task.payload["n"] for task in claimed] == [0, 1]
+    assert all(task.status == TaskStatus.RUNNING and task.locked_by == "worker-a" for task in claimed)
+    assert all(task.attempts == 1 for task in claimed)
+
+    rest = await queue.claim(db, "worker-b", limit=10)
+    assert [task.payload["n"] for task in rest] == [2]
+    assert await queue.claim(db, "worker-c", limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed_and_stale_worker_cannot_complete(db):
+    queue = TaskQueue()
+    await queue.enqueue(db, "scan_user")
+    await db.commit()
+
+    (task,) = await queue.claim(db, "worker-a", limit=1)
+    assert await queue.claim(db, "worker-b", limit=1) == []
+
+    await _expire_lease(db, task.id)
+    (reclaimed,) = await queue.claim(db, "worker-b", limit=1)
+    assert reclaimed.id == task.id
+    assert reclaimed.locked_by == "worker-b"
+    assert reclaimed.attempts == 2
+
+    await queue.complete(db, task.id, "worker-a")
+    assert await queue.stats(db) == {"scan_user": {"running": 1}}
+    await queue.complete(db, task.id, "worker-b")
+    assert await queue.stats(db) == {"scan_user": {"succeeded": 1}}
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_then_go_dead(db):
+    queue = TaskQueue()
+    await queue.enqueue(db, "scan_user", max_attempts=2)
+    await db.commit()
+
+    (task,) = await queue.claim(db, "worker-a", limit=1)
+    await queue.fail(db, task, "worker-a", "boom")
+    await db.refresh(task)
+    assert task.status == TaskStatus.QUEUED
+    assert task.last_error == "boom"
+    assert await queue.claim(db, "worker-a", limit=1) == []
+
+    await _make_due(db, task.id)
+    (task,) = await queue.claim(db, "worker-a", limit=1)
+    assert task.attempts == 2
+    await queue.fail(db, task, "worker-a", "boom again")
+    await db.refresh(task)
+    assert task.status == TaskStatus.DEAD
+
+    await _make_due(db, task.id)
+    assert await queue.claim(db, "worker-a", limit=1) == []
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_on_final_attempt_goes_dead(db):
+    queue = TaskQueue()
+    await queue.enqueue(db, "scan_user", max_attempts=1)
+    await db.commit()
+
+    (task,) = await queue.claim(db, "worker-a", limit=1)
+    await _expire_lease(db, task.id)
+
+    assert await queue.claim(db, "worker-b", limit=1) == []
+    await db.refresh(task)
+    assert task.status == TaskStatus.DEAD
+
+
+@pytest.mark.asyncio
+async def test_purge_removes_old_finished_tasks(db):
+    queue = TaskQueue()
+    await queue.enqueue(db, "scan_user", {"n": 0})
+    await queue.enqueue(db, "scan_user", {"n": 1})
+    await db.commit()
+
+    old, recent = await queue.claim(db, "worker-a", limit=2)
+    await queue.complete(db, old.id, "worker-a")
+    await queue.complete(db, recent.id, "worker-a")
+    await db.execute(
+        update(QueuedTask)
+        .where(QueuedTask.id == old.id)
+        .values(completed_at=utc_now() - timedelta(days=8))
+    )
+    await db.commit()
+
+    assert await queue.purge(db) == 1
+    assert await queue.stats(db) == {"scan_user": {"succeeded": 1}}
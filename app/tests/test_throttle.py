@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.throttle import KeyedSemaphore, TokenBucket
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+
+    await bucket.acquire()
+    await bucket.acquire()
+    assert time.monotonic() - started < 0.04
+
+    for _ in range(3):
+        await bucket.acquire()
+    # Three tokens past the burst at 20/s take about 150 ms
+    assert time.monotonic() - started >= 0.14
+
+
+@pytest.mark.asyncio
+async def test_keyed_semaphore_limits_each_key_separately():
+    slots = KeyedSemaphore(limit=2)
+    running = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+
+    async def hold(key):
+        async with slots.slot(key):
+            running[key] += 1
+            peak[key] = max(peak[key], running[key])
+            await asyncio.sleep(0.01)
+            running[key] -= 1
+
+    await asyncio.gather(*(hold(key) for key in "aaaaabbb"))
+
+    assert peak == {"a": 2, "b": 2}
+    assert slots._slots == {}
+
+
+@pytest.mark.asyncio
+async def test_keyed_semaphore_releases_slot_on_error():
+    slots = KeyedSemaphore(limit=1)
+
+    with pytest.raises(RuntimeError):
+        async with slots.slot("host"):
+            raise RuntimeError("boom")
+
+    assert slots._slots == {}
+    async with slots.slot("host"):
+        assert slots._slots["host"][1] == 1
@@ -0,0 +1,78 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import String, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.core.database import UnitOfWorkSession, complete_unit_of_work
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Item(_Base):
+    __tablename__ = "uow_items"
+
+    name: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    # A file database, so other connections only see committed data
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(_Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=UnitOfWorkSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _stored(session_factory):
+    async with session_factory() as db:
+        return sorted((await db.scalars(select(_Item.name))).all())
+
+
+@pytest.mark.asyncio
+async def test_rollback_discards_only_writes_since_last_commit(session_factory):
+    async with session_factory() as db:
+        db.info["unit_of_work"] = True
+        db.add(_Item(name="a"))
+        await db.commit()
+        db.add(_Item(name="b"))
+        await db.flush()
+        await db.rollback()
+        db.add(_Item(name="c"))
+        await db.commit()
+        await complete_unit_of_work(db)
+
+    assert await _stored(session_factory) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_earlier_service_commits(session_factory):
+    async with session_factory() as db:
+        db.info["unit_of_work"] = True
+        db.add(_Item(name="a"))
+        await db.commit()
+        db.add(_Item(name="a"))
+        with pytest.raises(IntegrityError):
+            await db.commit()
+        await db.rollback()
+        db.add(_Item(name="c"))
+        await db.commit()
+        await complete_unit_of_work(db)
+
+    assert await _stored(session_factory) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_stored_until_the_unit_completes(session_factory):
+    async with session_factory() as db:
+        db.info["unit_of_work"] = True
+        db.add(_Item(name="a"))
+        await db.commit()
+        assert await _stored(session_factory) == []
+        await complete_unit_of_work(db)
+
+    assert await _stored(session_factory) == ["a"]
@@ -14,6 +14,7 @@ from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
 from app.routes import routers
 from app.core.rate_limiter import limiter, rate_limit_handler
+from app.core.auth_context import AuthContextMiddleware
 
 
 @asynccontextmanager
@@ -112,6 +113,9 @@ app.openapi = custom_openapi
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
 
+# Auth context middleware (decodes bearer token once for limiter and dependencies)
+app.add_middleware(AuthContextMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
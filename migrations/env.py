@@ -1,7 +1,7 @@
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
 from alembic import context
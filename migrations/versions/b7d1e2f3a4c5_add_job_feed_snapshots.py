@@ -0,0 +1,34 @@
+"""Add job feed snapshots
+
+Revision ID: b7d1e2f3a4c5
+Revises: a24ca9246672
+Create Date: 2026-10-19 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1e2f3a4c5'
+down_revision: Union[str, None] = 'a24ca9246672'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_feed_snapshots',
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('jobs', sa.JSON(), nullable=True),
+    sa.Column('job_count', sa.Integer(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('source', name=op.f('pk_job_feed_snapshots'))
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_feed_snapshots')
@@ -0,0 +1,101 @@
+"""Add job full-text search index and normalized skill keys
+
+Revision ID: c3e8f1a2b6d9
+Revises: b7d1e2f3a4c5
+Create Date: 2026-10-19 11:02:17.884310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.utils import normalize_skill_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8f1a2b6d9'
+down_revision: Union[str, None] = 'b7d1e2f3a4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SKILL_KEY_BATCH_SIZE = 1000
+
+# Must match JOB_SEARCH_VECTOR_SQL in app/services/job_search_index.py
+JOB_SEARCH_VECTOR_SQL = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(job_listings.title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(job_listings.company_name, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(job_listings.description, '')), 'C'))"
+)
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_listings_fts USING fts5("
+    "title, company_name, description, content='job_listings', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS job_listings_fts_ai AFTER INSERT ON job_listings BEGIN "
+    "INSERT INTO job_listings_fts(rowid, title, company_name, description) "
+    "VALUES (new.id, new.title, new.company_name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS job_listings_fts_ad AFTER DELETE ON job_listings BEGIN "
+    "INSERT INTO job_listings_fts(job_listings_fts, rowid, title, company_name, description) "
+    "VALUES ('delete', old.id, old.title, old.company_name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS job_listings_fts_au AFTER UPDATE ON job_listings BEGIN "
+    "INSERT INTO job_listings_fts(job_listings_fts, rowid, title, company_name, description) "
+    "VALUES ('delete', old.id, old.title, old.company_name, old.description); "
+    "INSERT INTO job_listings_fts(rowid, title, company_name, description) "
+    "VALUES (new.id, new.title, new.company_name, new.description); END",
+    "INSERT INTO job_listings_fts(job_listings_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    op.add_column('job_skill_requirements', sa.Column('skill_key', sa.String(length=100), nullable=True))
+    backfill_skill_keys()
+    op.create_index(op.f('ix_job_skill_requirements_skill_key'), 'job_skill_requirements', ['skill_key'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(f"CREATE INDEX ix_job_listings_search ON job_listings USING gin ({JOB_SEARCH_VECTOR_SQL})")
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+
+def backfill_skill_keys() -> None:
+    """Fill skill_key with the same normalization the model and search lookups use."""
+    bind = op.get_bind()
+    requirements = sa.table(
+        'job_skill_requirements',
+        sa.column('id', sa.Integer),
+        sa.column('skill_name', sa.String),
+        sa.column('skill_key', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(requirements.c.id, requirements.c.skill_name)
+            .where(requirements.c.id > last_id)
+            .order_by(requirements.c.id)
+            .limit(SKILL_KEY_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            requirements.update()
+            .where(requirements.c.id == sa.bindparam('row_id'))
+            .values(skill_key=sa.bindparam('key')),
+            [{'row_id': row.id, 'key': normalize_skill_name(row.skill_name)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_job_listings_search")
+    elif dialect == 'sqlite':
+        for trigger in ('job_listings_fts_ai', 'job_listings_fts_ad', 'job_listings_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS job_listings_fts")
+
+    op.drop_index(op.f('ix_job_skill_requirements_skill_key'), table_name='job_skill_requirements')
+    op.drop_column('job_skill_requirements', 'skill_key')
@@ -0,0 +1,36 @@
+"""Add ingested jobs
+
+Revision ID: d91a4c7e2f80
+Revises: c3e8f1a2b6d9
+Create Date: 2026-10-19 13:40:52.117204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91a4c7e2f80'
+down_revision: Union[str, None] = 'c3e8f1a2b6d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ingested_jobs',
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('external_id', sa.String(length=200), nullable=False),
+    sa.Column('content_hash', sa.String(length=40), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('first_seen_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('source', 'external_id', name=op.f('pk_ingested_jobs'))
+    )
+    op.create_index(op.f('ix_ingested_jobs_content_hash'), 'ingested_jobs', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ingested_jobs_content_hash'), table_name='ingested_jobs')
+    op.drop_table('ingested_jobs')
@@ -0,0 +1,55 @@
+"""Add task queue
+
+Revision ID: e4b7c2a9d1f3
+Revises: d91a4c7e2f80
+Create Date: 2026-10-19 15:12:08.431577
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7c2a9d1f3'
+down_revision: Union[str, None] = 'd91a4c7e2f80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_queue',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_type', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('idempotency_key', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'DEAD', name='taskstatus'), nullable=False),
+    sa.Column('run_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_by', sa.String(length=100), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_task_queue')),
+    sa.UniqueConstraint('idempotency_key', name=op.f('uq_task_queue_idempotency_key'))
+    )
+    op.create_index('idx_task_queue_claim', 'task_queue', ['status', 'run_at'], unique=False)
+    op.create_index('idx_task_queue_lease', 'task_queue', ['status', 'lease_expires_at'], unique=False)
+    op.create_index('idx_task_queue_type_status', 'task_queue', ['task_type', 'status'], unique=False)
+    op.create_index(op.f('ix_task_queue_id'), 'task_queue', ['id'], unique=False)
+    op.create_index(op.f('ix_task_queue_status'), 'task_queue', ['status'], unique=False)
+    op.create_index(op.f('ix_task_queue_task_type'), 'task_queue', ['task_type'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_queue_task_type'), table_name='task_queue')
+    op.drop_index(op.f('ix_task_queue_status'), table_name='task_queue')
+    op.drop_index(op.f('ix_task_queue_id'), table_name='task_queue')
+    op.drop_index('idx_task_queue_type_status', table_name='task_queue')
+    op.drop_index('idx_task_queue_lease', table_name='task_queue')
+    op.drop_index('idx_task_queue_claim', table_name='task_queue')
+    op.drop_table('task_queue')
@@ -0,0 +1,33 @@
+"""Add generated cover letters
+
+Revision ID: f2a6d8c4e1b7
+Revises: e4b7c2a9d1f3
+Create Date: 2026-10-19 16:27:45.902318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6d8c4e1b7'
+down_revision: Union[str, None] = 'e4b7c2a9d1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('generated_cover_letters',
+    sa.Column('cache_key', sa.String(length=81), nullable=False),
+    sa.Column('cover_letter', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key', name=op.f('pk_generated_cover_letters'))
+    )
+    op.create_index(op.f('ix_generated_cover_letters_created_at'), 'generated_cover_letters', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_generated_cover_letters_created_at'), table_name='generated_cover_letters')
+    op.drop_table('generated_cover_letters')
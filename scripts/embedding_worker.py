@@ -0,0 +1,67 @@
+"""Local inference worker that serves sentence-transformer embeddings.
+
+Loads the embedding model once and lets every API worker share it instead of
+each worker holding its own copy. Run with::
+
+    python scripts/embedding_worker.py --host 127.0.0.1 --port 8765
+
+and point the API at it with ``EMBEDDING_WORKER_URL=http://127.0.0.1:8765``.
+
+Endpoints:
+- ``POST /encode`` with ``{"texts": [...]}`` returns ``{"embeddings": [[...], ...]}``
+- ``GET /health`` returns the model name and readiness
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+MAX_TEXTS_PER_REQUEST = 512
+
+
+def build_app(model_name: str, threads: int) -> web.Application:
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    model = SentenceTransformer(model_name)
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="encode")
+
+    async def encode(request: web.Request) -> web.Response:
+        payload = await request.json()
+        texts = payload.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise web.HTTPBadRequest(text="'texts' must be a list of strings")
+        if len(texts) > MAX_TEXTS_PER_REQUEST:
+            raise web.HTTPRequestEntityTooLarge(
+                max_size=MAX_TEXTS_PER_REQUEST, actual_size=len(texts)
+            )
+        embeddings = await asyncio.get_running_loop().run_in_executor(executor, model.encode, texts)
+        return web.json_response({"embeddings": embeddings.tolist()})
+
+    async def health(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "model": model_name})
+
+    async def shutdown_executor(app: web.Application) -> None:
+        executor.shutdown(wait=False)
+
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app.router.add_post("/encode", encode)
+    app.router.add_get("/health", health)
+    app.on_cleanup.append(shutdown_executor)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared embedding inference worker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--threads", type=int, default=1, help="Concurrent encode threads")
+    args = parser.parse_args()
+
+    web.run_app(build_app(args.model, args.threads), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
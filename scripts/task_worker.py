@@ -0,0 +1,76 @@
+"""Durable task queue worker for auto-application work.
+
+Claims ``scan_user``, ``generate_application`` and ``send_notification``
+tasks from the ``task_queue`` table and runs them. Scale by starting more
+workers (on any host); each task runs on one worker at a time. Run with::
+
+    python scripts/task_worker.py --concurrency 8
+
+Unless ``--no-enqueue`` is given, the worker also enqueues a job matching
+cycle every ``--cycle-interval`` seconds and purges old finished tasks.
+Enqueueing is idempotent per user and half-day, so every worker may do this.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import AsyncSessionLocal, async_engine  # noqa: E402
+from app.core.logger import logger  # noqa: E402
+from app.services.auto_application_scheduler import auto_application_scheduler  # noqa: E402
+from app.services.task_queue import TaskWorker, task_queue  # noqa: E402
+
+
+async def enqueue_cycles(interval: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            await auto_application_scheduler.enqueue_job_matching_cycle(task_queue)
+            await auto_application_scheduler.cleanup_expired_applications()
+            async with AsyncSessionLocal() as db:
+                purged = await task_queue.purge(db)
+            if purged:
+                logger.info(f"Purged {purged} finished tasks")
+        except Exception as e:
+            logger.error(f"Error enqueueing job matching cycle: {e}")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(args: argparse.Namespace) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    auto_application_scheduler.register_tasks(task_queue)
+    task_queue.lease_seconds = args.lease
+    worker = TaskWorker(task_queue, concurrency=args.concurrency, poll_interval=args.poll_interval)
+
+    jobs = [worker.run(stop)]
+    if not args.no_enqueue:
+        jobs.append(enqueue_cycles(args.cycle_interval, stop))
+    try:
+        await asyncio.gather(*jobs)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Auto-application task queue worker")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tasks run at once")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between polls when idle")
+    parser.add_argument("--lease", type=int, default=300, help="Task lease in seconds (renewed while running)")
+    parser.add_argument("--cycle-interval", type=float, default=3600, help="Seconds between job matching cycles")
+    parser.add_argument("--no-enqueue", action="store_true", help="Only run tasks; don't enqueue cycles")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()